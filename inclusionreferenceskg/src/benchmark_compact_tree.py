@@ -0,0 +1,47 @@
+import gc
+import tracemalloc
+
+from document_parsing.node.compact_tree import CompactTree
+from document_parsing.node.node_traversal import pre_order, same_structure
+from util.parser_util import gdpr_dependency_root
+
+
+def _retained(build):
+    """
+    Measures the memory that is still allocated after build returns, i.e. the size of the object it returns.
+    """
+    gc.collect()
+    tracemalloc.start()
+    obj = build()
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return obj, size
+
+
+def benchmark_compact_tree():
+    """
+    Compares the memory used by the object tree of the GDPR and its dependencies to that of a CompactTree.
+    """
+
+    root, tree_size = _retained(lambda: gdpr_dependency_root(workers=1)[1])
+    node_count = sum(1 for _ in pre_order(root))
+
+    print(f"Bundled corpus: {len(root.children)} documents, {node_count} nodes")
+    print(f"  {'Node objects':<28} {tree_size / 1024:10.1f} KiB {tree_size / node_count:8.1f} B/node")
+
+    content_size = len(CompactTree(root).content)
+    print(f"  {'(content, UTF-8)':<28} {content_size / 1024:10.1f} KiB")
+
+    for keep_ids in (True, False):
+        # The tree is built from a fresh object tree that is dropped again so that nothing is shared with root.
+        compact, compact_size = _retained(lambda: CompactTree(gdpr_dependency_root(workers=1)[1], keep_ids=keep_ids))
+        assert same_structure(compact.root, root), "The compact tree differs from the object tree."
+
+        name = f"CompactTree(keep_ids={keep_ids})"
+        print(f"  {name:<28} {compact_size / 1024:10.1f} KiB {compact_size / node_count:8.1f} B/node"
+              f" ({1 - compact_size / tree_size:.0%} less)")
+
+
+if __name__ == "__main__":
+    benchmark_compact_tree()
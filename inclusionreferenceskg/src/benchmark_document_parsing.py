@@ -0,0 +1,157 @@
+import timeit
+import typing
+
+from document_parsing.block_classifier import CompiledBlockClassifier, SequentialBlockClassifier
+from document_parsing.document_tree_parser import DocumentTreeParser
+from document_parsing.node.document import Document
+from document_parsing.node.node import Node
+from document_parsing.node.node_traversal import same_structure
+from document_parsing.node.paragraph import Paragraph
+from document_parsing.preprocessing.preprocessing_pipeline import PreprocessingPipeline
+
+
+def benchmark_block_classifier(file_name: str = "gdpr.txt", number: int = 20):
+    """
+    Compares the CompiledBlockClassifier against the SequentialBlockClassifier, which tries every node pattern in
+    order, on a document in ./resources/eu_documents.
+
+    :param file_name: The document to parse.
+    :param number: How often each measurement is repeated.
+    """
+
+    with open(f"./resources/eu_documents/{file_name}", encoding="utf-8") as f:
+        text = f.read()
+
+    sequential_parser = DocumentTreeParser(block_classifier=SequentialBlockClassifier)
+    compiled_parser = DocumentTreeParser(block_classifier=CompiledBlockClassifier)
+
+    assert same_structure(sequential_parser.parse_document("Benchmark", text),
+                          compiled_parser.parse_document("Benchmark", text)), \
+        "The classifiers produced different trees."
+
+    blocks = DocumentTreeParser._blockize(text)
+    for preprocessor in sequential_parser.preprocessors:
+        blocks = preprocessor.process(blocks)
+    blocks = list(blocks)
+
+    print(f"Classifying {len(blocks)} blocks of '{file_name}' ({number} runs)")
+
+    # Classification alone. A paragraph as the parent lets subparagraphs be created.
+    parent = Paragraph(number=1)
+    for classifier in (SequentialBlockClassifier(sequential_parser.node_patterns),
+                       CompiledBlockClassifier(compiled_parser.node_patterns)):
+        duration = timeit.timeit(lambda: [classifier.classify(block, parent) for block in blocks], number=number)
+        print(f"  {classifier.__class__.__name__:<28} classify: {duration / number * 1000:8.2f} ms")
+
+    for parser in (sequential_parser, compiled_parser):
+        duration = timeit.timeit(lambda: parser.parse_document("Benchmark", text), number=number)
+        print(f"  {parser.block_classifier.__name__:<28} parse:    {duration / number * 1000:8.2f} ms")
+
+
+def benchmark_preprocessing(file_name: str = "gdpr.txt", number: int = 50):
+    """
+    Compares applying the default preprocessors one after another, each creating a list of all blocks, to the single
+    pass of a PreprocessingPipeline.
+
+    :param file_name: The document to preprocess.
+    :param number: How often each measurement is repeated.
+    """
+
+    with open(f"./resources/eu_documents/{file_name}", encoding="utf-8") as f:
+        blocks = DocumentTreeParser._blockize(f.read())
+
+    preprocessors = DocumentTreeParser().preprocessors
+    pipeline = PreprocessingPipeline(preprocessors)
+
+    def sequential():
+        processed = blocks
+        for preprocessor in preprocessors:
+            processed = preprocessor.process(processed)
+        return list(processed)
+
+    assert sequential() == pipeline.process(blocks), "The pipeline differs from applying the preprocessors in turn."
+
+    print(f"Preprocessing {len(blocks)} blocks of '{file_name}' ({number} runs)")
+    for name, run in (("sequential", sequential), ("pipeline", lambda: pipeline.process(blocks))):
+        duration = timeit.timeit(run, number=number)
+        print(f"  {name:<28} {duration / number * 1000:8.2f} ms")
+
+
+class _ConcatenatingParser(DocumentTreeParser):
+    """
+    Builds the tree like DocumentTreeParser did before content fragments were introduced: Raw blocks are appended to
+    the content of the active node one at a time.
+    """
+
+    def _build_tree(self, title: str, blocks: typing.Iterable[str], *_, **__) -> Document:
+        regulation = Document(title=title)
+        node_stack: typing.List[Node] = [regulation]
+        classifier = self._get_classifier()
+
+        for block in blocks:
+            consumed = False
+            index, new_node = classifier.classify(block, node_stack[-1])
+            while index is not None:
+                node_pattern = classifier.node_patterns[index]
+                while node_stack[-1].depth >= node_pattern.depth:
+                    node_stack[-1].finalize()
+                    node_stack.pop()
+
+                new_node.parent = node_stack[-1]
+                node_stack[-1].children.append(new_node)
+                node_stack.append(new_node)
+                if node_pattern.consumes:
+                    consumed = True
+                    break
+
+                index, new_node = classifier.classify(block, node_stack[-1], index + 1)
+
+            if not consumed:
+                node_stack[-1].content += "\n\n" + block
+
+        for node in node_stack:
+            node.finalize()
+
+        return regulation
+
+
+def long_articles_document(articles: int, blocks_per_article: int) -> str:
+    """
+    Creates a document of articles that consist of nothing but raw blocks, like long recitals or annexes.
+    """
+    block = "Member States shall ensure that the processing of personal data is lawful and transparent. " * 4
+    parts = []
+    for number in range(1, articles + 1):
+        parts += [f"Article {number}", f"Title of article {number}"] + [block] * blocks_per_article
+
+    return "\n\n".join(parts)
+
+
+def benchmark_long_articles(blocks_per_article: typing.Iterable[int] = (1000, 5000, 10000), number: int = 3):
+    """
+    Compares collecting the content of nodes as fragments against appending each raw block to the content on
+    documents with very long unstructured articles.
+
+    :param blocks_per_article: The number of raw blocks per article of the synthetic documents.
+    :param number: How often each measurement is repeated.
+    """
+
+    for count in blocks_per_article:
+        text = long_articles_document(3, count)
+        concatenating_parser, parser = _ConcatenatingParser(), DocumentTreeParser()
+
+        assert same_structure(concatenating_parser.parse_document("Benchmark", text),
+                              parser.parse_document("Benchmark", text)), "The parsers produced different trees."
+
+        print(f"3 articles of {count} raw blocks, {len(text) // 1024} KiB ({number} runs)")
+        concatenating = timeit.timeit(lambda: concatenating_parser.parse_document("Benchmark", text),
+                                      number=number) / number
+        fragments = timeit.timeit(lambda: parser.parse_document("Benchmark", text), number=number) / number
+        print(f"  concatenating: {concatenating * 1000:8.2f} ms   fragments: {fragments * 1000:8.2f} ms   "
+              f"({concatenating / fragments:.1f}x)")
+
+
+if __name__ == "__main__":
+    benchmark_block_classifier()
+    benchmark_preprocessing()
+    benchmark_long_articles()
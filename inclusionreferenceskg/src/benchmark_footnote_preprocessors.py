@@ -0,0 +1,104 @@
+import random
+import re
+import timeit
+import typing
+
+from document_parsing.preprocessing.footnote_append_preprocessor import FootnoteAppendPreprocessor
+from document_parsing.preprocessing.footnote_delete_preprocessor import FootnoteDeletePreprocessor
+
+
+def _legacy_append(blocks: typing.List[str]):
+    """
+    The previous, quadratic implementation of FootnoteAppendPreprocessor.process.
+    """
+    visited = []
+    footnote_start_pattern = re.compile(r"\(([1-9][0-9]*)\)")
+
+    for block in blocks:
+        match = footnote_start_pattern.match(block)
+        if match:
+            footnote_reference_pattern = r"(?<!and|..,) \(" + match.group(1) + r"\)"
+            for i, visited_block in enumerate(visited):
+                if re.search(footnote_reference_pattern, visited_block):
+                    visited[i] += " " + block
+                    break
+            else:
+                visited.insert(0, block)
+        else:
+            visited.insert(0, block)
+
+    return reversed(visited)
+
+
+def _legacy_delete(blocks: typing.List[str]):
+    """
+    The previous, quadratic implementation of FootnoteDeletePreprocessor.process.
+    """
+    visited = []
+    footnote_start_pattern = re.compile(r"\(([1-9][0-9]*)\)")
+
+    for block in blocks:
+        match = footnote_start_pattern.match(block)
+        if match:
+            footnote_reference_pattern = r"(?<!and|..,) \(" + match.group(1) + r"\)"
+            for visited_block in visited:
+                if re.search(footnote_reference_pattern, visited_block):
+                    break
+            else:
+                visited.insert(0, block)
+        else:
+            visited.insert(0, block)
+
+    return reversed(visited)
+
+
+def synthetic_document(footnotes: int, seed: int = 0) -> typing.List[str]:
+    """
+    Creates the blocks of a document in which every few blocks refer to footnotes that follow them. Some references
+    look like paragraph references (", (1)", "and (2)") and some footnotes refer to other footnotes or to nothing.
+    """
+    rnd = random.Random(seed)
+    blocks = []
+    for number in range(1, footnotes + 1):
+        for _ in range(rnd.randint(1, 4)):
+            words = ["Member States shall ensure that the processing is lawful"] * rnd.randint(1, 6)
+            if rnd.random() < 0.3:
+                words.append(f"in accordance with Article {rnd.randint(1, 99)}, ({rnd.randint(1, 9)})")
+            if rnd.random() < 0.2:
+                words.append(f"and ({rnd.randint(1, number)})")
+            blocks.append(" ".join(words))
+
+        if rnd.random() < 0.9:
+            blocks[-rnd.randint(1, min(3, len(blocks)))] += f" ({number})"
+        footnote = f"({number}) Directive {rnd.randint(1990, 2020)}/{rnd.randint(1, 99)}/EC (OJ L {number}, p. 1)."
+        if rnd.random() < 0.1:
+            footnote += f" See also ({rnd.randint(1, footnotes)})"
+        blocks.append(footnote)
+
+    return blocks
+
+
+def benchmark_footnote_preprocessors(footnote_counts: typing.Iterable[int] = (500, 2000, 5000), number: int = 1):
+    """
+    Compares the single pass footnote preprocessors against the previous implementations on synthetic documents.
+
+    :param footnote_counts: The number of footnotes of the synthetic documents.
+    :param number: How often each measurement is repeated.
+    """
+
+    for footnotes in footnote_counts:
+        blocks = synthetic_document(footnotes)
+        print(f"{footnotes} footnotes, {len(blocks)} blocks ({number} runs)")
+
+        for name, legacy, current in (("append", _legacy_append, FootnoteAppendPreprocessor.process),
+                                      ("delete", _legacy_delete, FootnoteDeletePreprocessor.process)):
+            assert list(legacy(blocks)) == list(current(blocks)), f"The {name} preprocessors disagree."
+
+            legacy_duration = timeit.timeit(lambda: list(legacy(blocks)), number=number) / number
+            current_duration = timeit.timeit(lambda: list(current(blocks)), number=number) / number
+            print(f"  {name:<8} previous: {legacy_duration * 1000:10.2f} ms   single pass: "
+                  f"{current_duration * 1000:8.2f} ms   ({legacy_duration / current_duration:.0f}x)")
+
+
+if __name__ == "__main__":
+    benchmark_footnote_preprocessors()
@@ -0,0 +1,76 @@
+import timeit
+import typing
+
+from document_parsing.document_tree_parser import DocumentTreeParser
+from document_parsing.node.node import Node
+from document_parsing.node.node_index import NodeIndex
+from document_parsing.node.resolution_cache import ResolutionCache
+from document_parsing.node.node_traversal import pre_order
+from document_parsing.node.tree_intervals import TreeIntervals
+from reference_detection.gold_standard_reference_detector import GoldStandardReferenceDetector
+from reference_resolution.reference_resolver import ReferenceResolver
+from util.parser_util import gdpr_dependency_root
+
+
+def gdpr_reference_qualifiers(gdpr: Node) -> typing.List[typing.List[Node]]:
+    """
+    Resolves the qualifiers of all gold standard references of the GDPR, as done in evaluate_reference_resolver.
+    """
+    resolver = ReferenceResolver()
+    reference_detector = GoldStandardReferenceDetector("./resources/evaluation_data/gdpr_references.csv")
+
+    qualifiers = []
+    intervals = TreeIntervals.containing(gdpr)
+    for node in pre_order(gdpr):
+        for reference in resolver.resolve_single(node, reference_detector.detect(node.content), intervals):
+            qualifiers.extend(reference.reference_qualifier)
+
+    return qualifiers
+
+
+def benchmark_node_index(number: int = 5):
+    """
+    Compares resolving every reference of the GDPR against the full dependency root with Node.resolve_loose and with a
+    NodeIndex.
+
+    :param number: How often each measurement is repeated.
+    """
+
+    gdpr, document_root = gdpr_dependency_root(DocumentTreeParser())
+    qualifiers = gdpr_reference_qualifiers(gdpr)
+
+    build_duration = timeit.timeit(lambda: NodeIndex(document_root), number=number) / number
+    index = NodeIndex(document_root)
+
+    assert all(index.resolve_loose(q) == document_root.resolve_loose(q) for q in qualifiers), \
+        "The index resolved a qualifier differently."
+
+    print(f"Resolving {len(qualifiers)} qualifiers against {len(index)} nodes ({number} runs)")
+    tree_duration = timeit.timeit(lambda: [document_root.resolve_loose(q) for q in qualifiers], number=number) / number
+    index_duration = timeit.timeit(lambda: [index.resolve_loose(q) for q in qualifiers], number=number) / number
+    print(f"  resolve_loose: {tree_duration * 1000:8.2f} ms")
+    for name, run in (("limit=2", lambda: [document_root.resolve_loose(q, limit=2) for q in qualifiers]),
+                      ("resolve_first", lambda: [document_root.resolve_first(q) for q in qualifiers])):
+        print(f"    {name + ':':<13}{timeit.timeit(run, number=number) / number * 1000:8.2f} ms")
+    print(f"  NodeIndex:     {index_duration * 1000:8.2f} ms   ({tree_duration / index_duration:.0f}x, "
+          f"building the index: {build_duration * 1000:.2f} ms)")
+    limited_duration = timeit.timeit(lambda: [index.resolve_loose(q, limit=2) for q in qualifiers],
+                                     number=number) / number
+    print(f"    limit=2:     {limited_duration * 1000:8.2f} ms")
+
+    def cached():
+        cache = ResolutionCache(document_root)
+        for q in qualifiers:
+            cache.resolve(q)
+        return cache
+
+    stats = cached().stats
+    cold_duration = timeit.timeit(cached, number=number) / number
+    cache = cached()
+    warm_duration = timeit.timeit(lambda: [cache.resolve(q) for q in qualifiers], number=number) / number
+    print(f"  ResolutionCache: {cold_duration * 1000:6.2f} ms including the index ({stats.hits} hits, "
+          f"{stats.misses} misses), {warm_duration * 1000:.2f} ms once filled")
+
+
+if __name__ == "__main__":
+    benchmark_node_index()
@@ -0,0 +1,145 @@
+import csv
+import glob
+import os
+import tempfile
+import timeit
+import typing
+
+from document_parsing.document_tree_parser import DocumentTreeParser
+from document_parsing.node.node import Node
+from document_parsing.node.node_traversal import pre_order
+from document_parsing.preprocessing.footnote_delete_preprocessor import FootnoteDeletePreprocessor
+from document_parsing.preprocessing.header_preprocessor import HeaderPreprocessor
+from reference_detection.gold_standard_reference_detector import GoldStandardReferenceDetector
+from reference_detection.reference_detector import ReferenceDetector
+from reference_detection.regex_reference_detector import RegexReferenceDetector
+from reference_detection.scanning_reference_detector import ScanningReferenceDetector
+
+
+def _corpus_text() -> str:
+    texts = []
+    for path in sorted(glob.glob("./resources/eu_documents/*.txt")):
+        with open(path, encoding="utf-8") as f:
+            texts.append(f.read())
+    return "\n\n".join(texts)
+
+
+def adversarial_text(treaties: int) -> str:
+    """
+    Creates a text in which every "the treaty" is followed by the same long chain of lower case words. The regular
+    expression walks the rest of the chain looking for a capitalized word at every one of them.
+    """
+    return "the treaty on the functioning of " * treaties + "the union."
+
+
+def _name(detector: ReferenceDetector) -> str:
+    if isinstance(detector, RegexReferenceDetector) and not detector.prefilter:
+        return f"{detector.__class__.__name__} (no prefilter)"
+    return detector.__class__.__name__
+
+
+def _same_references(detectors: typing.List[ReferenceDetector], text: str):
+    results = [[(r.start, r.text_content) for r in d.detect(text)] for d in detectors]
+    assert all(r == results[0] for r in results), "The detectors found different references."
+
+
+def benchmark_throughput(number: int = 3):
+    """
+    Measures the throughput of the reference detectors on the bundled corpus.
+    """
+    text = _corpus_text()
+    size = len(text.encode("utf-8")) / 1e6
+    detectors = [RegexReferenceDetector(prefilter=False), RegexReferenceDetector(), ScanningReferenceDetector()]
+    _same_references(detectors, text)
+
+    print(f"Bundled corpus: {size:.2f} MB")
+    for detector in detectors:
+        t = min(timeit.repeat(lambda: detector.detect(text), number=1, repeat=number))
+        print(f"  {_name(detector):<40} {t * 1000:10.1f} ms {size / t:8.2f} MB/s")
+
+
+def benchmark_adversarial(number: int = 3):
+    """
+    Compares the detectors on adversarial_text of growing length.
+    """
+    detectors = [RegexReferenceDetector(prefilter=False), RegexReferenceDetector(), ScanningReferenceDetector()]
+
+    print("Adversarial input (repeated 'the treaty' without a capitalized word)")
+    for treaties in (250, 500, 1000, 2000):
+        text = adversarial_text(treaties)
+        _same_references(detectors, text)
+        times = [min(timeit.repeat(lambda: d.detect(text), number=1, repeat=number)) for d in detectors]
+        print(f"  {len(text):>8} chars " + " ".join(f"{_name(d)} {t * 1000:9.1f} ms"
+                                                 for d, t in zip(detectors, times)))
+
+
+def benchmark_parallel(number: int = 3, copies: int = 8):
+    """
+    Measures ReferenceDetector.detect_parallel on the bundled corpus, repeated to make the pool worthwhile.
+    """
+    text = "\n\n".join([_corpus_text()] * copies)
+    size = len(text.encode("utf-8")) / 1e6
+    detector = RegexReferenceDetector()
+
+    print(f"Parallel detection ({size:.2f} MB, {os.cpu_count()} CPUs)")
+    t = min(timeit.repeat(lambda: detector.detect(text), number=1, repeat=number))
+    print(f"  detect                   {t * 1000:10.1f} ms {size / t:8.2f} MB/s")
+    for workers in (1, 2, 4):
+        t = min(timeit.repeat(lambda: detector.detect_parallel(text, workers), number=1, repeat=number))
+        print(f"  detect_parallel({workers} workers) {t * 1000:8.1f} ms {size / t:8.2f} MB/s")
+
+
+def _gdpr_nodes() -> typing.List[Node]:
+    parser = DocumentTreeParser(preprocessors=[HeaderPreprocessor, FootnoteDeletePreprocessor])
+    return list(pre_order(parser.parse_from_eu_doc_file("GDPR", "gdpr.txt")))
+
+
+def benchmark_gold_standard(number: int = 3, copies: int = 16):
+    """
+    Replays the gold standard references of the GDPR, repeated to make a large gold set, greedily and by position.
+    """
+    nodes = _gdpr_nodes() * copies
+    contents = [node.content for node in nodes]
+    text = "\n".join(contents)
+
+    with open("./resources/evaluation_data/gdpr_references.csv", encoding="utf-8") as f:
+        rows = list(csv.reader(f, delimiter=";"))
+    length = len("\n".join(contents[:len(contents) // copies])) + 1
+
+    with tempfile.TemporaryDirectory() as directory:
+        file = os.path.join(directory, "references.csv")
+        with open(file, "w", encoding="utf-8", newline="") as f:
+            writer = csv.writer(f, delimiter=";", lineterminator="\n")
+            writer.writerow(rows[0])
+            for copy in range(copies):
+                writer.writerows([reference, int(start) + copy * length] for reference, start in rows[1:])
+
+        def positioned_nodes(detector: GoldStandardReferenceDetector):
+            offset = 0
+            for content in contents:
+                detector.detect(content, offset)
+                offset += len(content) + 1
+
+        def greedy_nodes(detector: GoldStandardReferenceDetector):
+            for content in contents:
+                detector.detect(content)
+
+        positioned = GoldStandardReferenceDetector(file)
+        print(f"Gold standard replay ({len(rows[1:]) * copies} references)")
+        measurements = [
+            ("greedy, whole text *", lambda: GoldStandardReferenceDetector(file).detect(text)),
+            ("greedy, per node *", lambda: greedy_nodes(GoldStandardReferenceDetector(file))),
+            ("positioned, whole text", lambda: positioned.detect(text, 0)),
+            ("positioned, per node", lambda: positioned_nodes(positioned)),
+        ]
+        for name, f in measurements:
+            t = min(timeit.repeat(f, number=1, repeat=number))
+            print(f"  {name:<24} {t * 1000:10.1f} ms")
+        print("  * including loading the file, as greedy detectors are single-use")
+
+
+if __name__ == "__main__":
+    benchmark_throughput()
+    benchmark_adversarial()
+    benchmark_parallel()
+    benchmark_gold_standard()
@@ -0,0 +1,36 @@
+import os
+import tempfile
+import timeit
+
+from document_parsing.node.node_traversal import pre_order, same_structure
+from document_parsing.node.tree_file import load_tree, save_tree
+from util.parser_util import gdpr_dependency_root
+
+
+def benchmark_tree_file(number: int = 5):
+    """
+    Compares parsing the GDPR and its dependencies to loading them from a file written by save_tree.
+    """
+
+    root = gdpr_dependency_root(workers=1)[1]
+    node_count = sum(1 for _ in pre_order(root))
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "gdpr_dependencies.tree")
+        save_tree(root, path)
+        assert same_structure(load_tree(path).root, root), "The loaded tree differs from the parsed tree."
+
+        print(f"Bundled corpus: {len(root.children)} documents, {node_count} nodes, "
+              f"{os.path.getsize(path) / 1024:.1f} KiB on disk")
+
+        parse = min(timeit.repeat(lambda: gdpr_dependency_root(workers=1), number=1, repeat=number))
+        print(f"  {'parse':<24} {parse * 1000:10.2f} ms")
+
+        for name, load in [("load_tree", lambda: load_tree(path)),
+                           ("load_tree + to_node", lambda: load_tree(path).root.to_node())]:
+            t = min(timeit.repeat(load, number=1, repeat=number))
+            print(f"  {name:<24} {t * 1000:10.2f} ms ({t / parse:.1%} of parse)")
+
+
+if __name__ == "__main__":
+    benchmark_tree_file()
@@ -0,0 +1,243 @@
+import re
+import typing
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Sequence, Set, Tuple, Type, Union
+
+from document_parsing.node.node import Node
+
+try:
+    # Python 3.11+
+    from re import _parser as sre_parse
+except ImportError:  # pragma: no cover
+    import sre_parse
+
+
+class BlockClassifier(ABC):
+    """
+    Decides which of the node patterns of a DocumentTreeParser accept a block of text.
+    """
+
+    def __init__(self, node_patterns: Sequence[Type[Node]]):
+        """
+        :param node_patterns: The nodes that may be created, in the order they are tried.
+        """
+        self.node_patterns: Tuple[Type[Node], ...] = tuple(node_patterns)
+
+    @abstractmethod
+    def classify(self, block: str, parent: Node, start: int = 0) -> Tuple[Optional[int], Optional[Node]]:
+        """
+        Finds the first node pattern (at or after index start) that accepts the block.
+
+        :param block: The block to be classified.
+        :param parent: The currently active parent, as passed to Node.accept_block.
+        :param start: The index in node_patterns from which to start searching. Used to continue after a node
+                      pattern that does not consume the block.
+        :return: The index of the accepting node pattern and the node it created or (None, None) if no node
+                 pattern accepts the block.
+        """
+        raise NotImplementedError()
+
+
+class SequentialBlockClassifier(BlockClassifier):
+    """
+    Asks every node pattern in order. This is the reference behaviour against which other classifiers are measured.
+    """
+
+    def classify(self, block: str, parent: Node, start: int = 0) -> Tuple[Optional[int], Optional[Node]]:
+        for i in range(start, len(self.node_patterns)):
+            matched, new_node = self.node_patterns[i].accept_block(block, parent)
+            if matched:
+                return i, new_node
+
+        return None, None
+
+
+# A plan is a sequence of steps. A step is either a compiled alternation of several node patterns together with the
+# node pattern index belonging to each named group or the index of a node pattern that must be asked directly.
+_Step = Union[Tuple[re.Pattern, Dict[str, int]], int]
+
+
+class CompiledBlockClassifier(BlockClassifier):
+    """
+    Classifies a block with (usually) a single regex match.
+
+    All node patterns that provide a Node.block_pattern are combined into one alternation with a named group per node
+    pattern. As re tries the alternatives from left to right, the first named group that matched is the first node
+    pattern that would have accepted the block, which preserves the order of node_patterns. Additionally,
+    the possible first characters of each pattern are determined so that a block is only tested against the patterns
+    that may start with its first character.
+
+    Node patterns without a block pattern (e.g. Subparagraph, which depends on the parent) are asked through
+    Node.accept_block at their position in the order.
+    """
+
+    def __init__(self, node_patterns: Sequence[Type[Node]]):
+        super().__init__(node_patterns)
+
+        self._patterns: List[Optional[re.Pattern]] = [self._usable_pattern(np) for np in self.node_patterns]
+
+        # Dispatch table: Maps the first character of a block to the node pattern indices that may accept it.
+        # Only ASCII characters are dispatched on, all others use every node pattern.
+        self._all_candidates = tuple(range(len(self.node_patterns)))
+        first_chars = [self._first_chars(p) if p is not None else None for p in self._patterns]
+        self._dispatch: Dict[str, Tuple[int, ...]] = {
+            chr(c): tuple(i for i, fc in enumerate(first_chars)
+                          if self._patterns[i] is None or fc is None or chr(c) in fc)
+            for c in range(128)
+        }
+
+        self._plans: Dict[Tuple[Optional[str], int], List[_Step]] = dict()
+        self._alternations: Dict[Tuple[int, ...], Tuple[re.Pattern, Dict[str, int]]] = dict()
+
+    def classify(self, block: str, parent: Node, start: int = 0) -> Tuple[Optional[int], Optional[Node]]:
+        first_char = block[:1]
+        if first_char not in self._dispatch:
+            first_char = None
+
+        plan = self._plans.get((first_char, start))
+        if plan is None:
+            candidates = self._dispatch[first_char] if first_char is not None else self._all_candidates
+            plan = self._plans[(first_char, start)] = self._build_plan(candidates, start)
+
+        for step in plan:
+            if isinstance(step, int):
+                matched, new_node = self.node_patterns[step].accept_block(block, parent)
+                if matched:
+                    return step, new_node
+                continue
+
+            alternation, group_to_index = step
+            match = alternation.match(block)
+            if match:
+                index = group_to_index[match.lastgroup]
+                matched, new_node = self.node_patterns[index].accept_block(block, parent)
+                if matched:
+                    return index, new_node
+
+                # The node pattern is stricter than its block pattern. Continue with the following node patterns.
+                return self.classify(block, parent, index + 1)
+
+        return None, None
+
+    def _build_plan(self, candidates: Tuple[int, ...], start: int) -> List[_Step]:
+        """
+        Groups consecutive candidates with a block pattern into a single alternation.
+        """
+        plan: List[_Step] = []
+        run: List[int] = []
+
+        for i in candidates:
+            if i < start:
+                continue
+
+            if self._patterns[i] is None:
+                self._close_run(plan, run)
+                run = []
+                plan.append(i)
+            else:
+                run.append(i)
+
+        self._close_run(plan, run)
+
+        return plan
+
+    def _close_run(self, plan: List[_Step], run: List[int]):
+        if len(run) == 1:
+            # A single node pattern is cheaper to ask directly than to match twice.
+            plan.append(run[0])
+        elif run:
+            plan.append(self._alternation(tuple(run)))
+
+    def _alternation(self, indices: Tuple[int, ...]) -> Tuple[re.Pattern, Dict[str, int]]:
+        if indices not in self._alternations:
+            groups = {f"_{i}": i for i in indices}
+            alternation = "|".join(
+                f"(?P<_{i}>{self._scoped(self._patterns[i])})" for i in indices)
+            self._alternations[indices] = re.compile(alternation), groups
+
+        return self._alternations[indices]
+
+    @staticmethod
+    def _scoped(pattern: re.Pattern) -> str:
+        """
+        Wraps the pattern's source so that its flags only apply to it.
+        """
+        on = "".join(f for f, flag in (("i", re.I), ("m", re.M), ("s", re.S), ("x", re.X)) if pattern.flags & flag)
+        off = "".join(f for f, flag in (("i", re.I), ("m", re.M), ("s", re.S), ("x", re.X)) if
+                      not pattern.flags & flag)
+        if pattern.flags & re.A:
+            on = "a" + on
+
+        return f"(?{on}-{off}:{pattern.pattern})" if off else f"(?{on}:{pattern.pattern})"
+
+    @staticmethod
+    def _usable_pattern(node_pattern: Type[Node]) -> Optional[re.Pattern]:
+        """
+        Returns the block pattern of the node pattern if it can be part of an alternation.
+        """
+        pattern = node_pattern.block_pattern()
+        if pattern is None or not isinstance(pattern.pattern, str) or pattern.groupindex:
+            # Named groups would clash with those of the alternation.
+            return None
+
+        try:
+            re.compile(f"(?P<_0>{CompiledBlockClassifier._scoped(pattern)})")
+        except re.error:
+            # E.g. global inline flags, which may not be part of an alternation.
+            return None
+
+        return pattern
+
+    @staticmethod
+    def _first_chars(pattern: re.Pattern) -> Optional[Set[str]]:
+        """
+        Determines the set of characters a match of the pattern may start with.
+
+        :return: The set of characters or None if any character is possible or the set could not be determined.
+        """
+        return CompiledBlockClassifier._first_chars_of(sre_parse.parse(pattern.pattern, pattern.flags).data,
+                                                       bool(pattern.flags & re.I))
+
+    @staticmethod
+    def _first_chars_of(items: typing.Iterable, ignore_case: bool) -> Optional[Set[str]]:
+        for op, av in items:
+            if op is sre_parse.AT:
+                # Anchors do not consume characters.
+                continue
+
+            if op is sre_parse.LITERAL:
+                chars = {chr(av)}
+            elif op is sre_parse.IN:
+                chars = set()
+                for in_op, in_av in av:
+                    if in_op is sre_parse.LITERAL:
+                        chars.add(chr(in_av))
+                    elif in_op is sre_parse.RANGE and in_av[1] - in_av[0] <= 256:
+                        chars.update(chr(c) for c in range(in_av[0], in_av[1] + 1))
+                    else:
+                        # Negations, categories, large ranges
+                        return None
+            elif op is sre_parse.SUBPATTERN:
+                _, add_flags, del_flags, sub_pattern = av
+                sub_ignore_case = (ignore_case or bool(add_flags & re.I)) and not del_flags & re.I
+                return CompiledBlockClassifier._first_chars_of(sub_pattern.data, sub_ignore_case)
+            elif op is sre_parse.BRANCH:
+                chars = set()
+                for alternative in av[1]:
+                    alternative_chars = CompiledBlockClassifier._first_chars_of(alternative.data, ignore_case)
+                    if alternative_chars is None:
+                        return None
+                    chars.update(alternative_chars)
+                return chars
+            elif op in (sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT) and av[0] > 0:
+                return CompiledBlockClassifier._first_chars_of(av[2].data, ignore_case)
+            else:
+                # Optional items and everything else could let any character start the match.
+                return None
+
+            if ignore_case:
+                chars.update({c.lower() for c in chars} | {c.upper() for c in chars})
+            return chars
+
+        # An empty pattern matches anything.
+        return None
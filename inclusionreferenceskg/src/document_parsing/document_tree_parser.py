@@ -1,6 +1,8 @@
 import typing
+from difflib import SequenceMatcher
 from typing import List, Optional, Type
 
+from document_parsing.block_classifier import BlockClassifier, CompiledBlockClassifier
 from document_parsing.node.article import Article
 from document_parsing.node.chapter import Chapter
 from document_parsing.node.document import Document
@@ -11,6 +13,8 @@ from document_parsing.node.section import Section
 from document_parsing.node.subparagraph import Paragraph
 from document_parsing.node.subparagraph import Subparagraph
 from document_parsing.node.title import Title
+from document_parsing.parse_cache import ParseCache
+from document_parsing.parse_trace import BlockTrace, ParseTrace, ReparseResult, TraceStep, block_digest
 from document_parsing.preprocessing.block_preprocessor import \
     BlockPreprocessor
 from document_parsing.preprocessing.footnote_append_preprocessor import \
@@ -18,6 +22,8 @@ from document_parsing.preprocessing.footnote_append_preprocessor import \
 from document_parsing.preprocessing.header_preprocessor import \
     HeaderPreprocessor
 from document_parsing.preprocessing.initial_space_preprocessor import InitialSpacePreprocessor
+from document_parsing.preprocessing.preprocessing_pipeline import PreprocessingPipeline
+from document_parsing.source_text import SourceText
 
 
 class DocumentTreeParser:
@@ -25,13 +31,23 @@ class DocumentTreeParser:
     Main class for parsing an EU regulation in text form to a tree on which operations can be easily made.
     """
 
-    def __init__(self, node_patterns=None, preprocessors: Optional[List[Type[BlockPreprocessor]]] = None):
+    def __init__(self, node_patterns=None, preprocessors: Optional[List[Type[BlockPreprocessor]]] = None,
+                 block_classifier: Optional[Type[BlockClassifier]] = None, cache: Optional[ParseCache] = None,
+                 keep_trace: bool = False, store_content: bool = False):
         """
         Creates a DocumentTreeParser.
 
         :param node_patterns: The nodes that may be created in the tree. The order of this list is importance if any of
                               the used nodes use the Node.consumes flag.
         :param preprocessors: A list of preprocessors to first be applied to the raw text. This is order dependant.
+                              They are run in a single pass by a PreprocessingPipeline.
+        :param block_classifier: The strategy used to find the node patterns accepting a block. Defaults to the
+                                 CompiledBlockClassifier.
+        :param cache: If given, parsed documents are stored in and loaded from this cache.
+        :param keep_trace: If True, parsed documents keep a ParseTrace that lets reparse update them incrementally.
+                           Documents loaded from the cache do not have one.
+        :param store_content: If True, the content of parsed documents is moved to a memory-mapped SourceText instead of
+                              being kept as one string per node.
         """
         if node_patterns is None:
             node_patterns = [Chapter, Title, Article, Paragraph, Section, Point, Indent, Subparagraph]
@@ -41,6 +57,13 @@ class DocumentTreeParser:
             preprocessors = [HeaderPreprocessor, InitialSpacePreprocessor, FootnoteAppendPreprocessor]
         self.preprocessors = preprocessors
 
+        self.block_classifier = block_classifier or CompiledBlockClassifier
+        self._classifier: Optional[BlockClassifier] = None
+
+        self.cache = cache
+        self.keep_trace = keep_trace
+        self.store_content = store_content
+
     def parse_document(self, title: str, text: str) -> Document:
         """
         Creates a document tree from the source text of a regulation.
@@ -50,36 +73,239 @@ class DocumentTreeParser:
         :return: The regulation root node of the parsed document.
         """
 
-        regulation = Document(title=title)
+        if self.cache is not None:
+            key = self.cache_key(text)
+            document = self.cache.get(key, title)
+            if document is None:
+                document = self._parse_text(title, text)
+                self.cache.put(key, document)
+        else:
+            document = self._parse_text(title, text)
+
+        if self.store_content:
+            SourceText.store(document)
+        return document
+
+    def cache_key(self, text: str) -> str:
+        """
+        :param text: The source text of a regulation.
+        :return: The key under which the document parsed from the text is cached with the current configuration.
+        """
+        return ParseCache.key(text, self.node_patterns, self.preprocessors)
+
+    def _parse_text(self, title: str, text: str) -> Document:
+        blocks = PreprocessingPipeline(self.preprocessors).run(DocumentTreeParser._blockize(text))
+
+        return self._build_tree(title, blocks)
+
+    def parse_stream(self, title: str, fileobj: typing.TextIO, chunk_size: int = 1 << 16) -> Document:
+        """
+        Creates a document tree from a regulation that is read from a file object in chunks.
+
+        Blocks are split off as the text arrives and are passed through the preprocessors' streaming stages into the
+        tree. Apart from the tree itself, memory usage therefore does not depend on the size of the document.
+        The resulting tree is equal to that of parse_document as long as every footnote follows its reference within
+        the preprocessor's stream_lookback blocks, which holds for the bundled documents. Otherwise, a warning is
+        logged.
+
+        :param title: The title of the regulation.
+        :param fileobj: The text file to read from.
+        :param chunk_size: The number of characters read at once.
+        :return: The regulation root node of the parsed document.
+        """
+
+        blocks = PreprocessingPipeline(self.preprocessors, streaming=True).run(
+            DocumentTreeParser._blockize_stream(fileobj, chunk_size))
+
+        document = self._build_tree(title, blocks)
+        if self.store_content:
+            SourceText.store(document)
+        return document
+
+    def reparse(self, document: Document, text: str) -> ReparseResult:
+        """
+        Updates a document tree in place after its source text was amended.
+
+        The blocks of the new text are compared with those the document was parsed from. Unchanged blocks that are read
+        in the same context as before are not classified again; instead, the nodes they created are reused. Unchanged
+        blocks read in another context are classified, but still reuse their nodes if they create the same types of
+        nodes. Reused nodes keep their identity and ids, so anything attached to unchanged parts of the document stays
+        valid. Only documents parsed with keep_trace (or updated by reparse before) carry the necessary trace; any
+        other document, or one parsed with different node patterns or preprocessors, is parsed again in full, reusing
+        only the document node itself. Either way, the resulting tree equals that of parse_document.
+
+        :param document: The document to update.
+        :param text: The amended source text.
+        :return: The updated document together with the nodes that changed or were removed.
+        """
+        blocks = PreprocessingPipeline(self.preprocessors).process(DocumentTreeParser._blockize(text))
+        digests = [block_digest(block) for block in blocks]
+
+        replay: typing.Dict[int, BlockTrace] = dict()
+        trace: typing.Optional[ParseTrace] = document.parse_trace
+        if trace is not None and trace.configuration == self._configuration():
+            matcher = SequenceMatcher(None, [b.digest for b in trace.blocks], digests, autojunk=False)
+            for old_start, new_start, size in matcher.get_matching_blocks():
+                for k in range(size):
+                    replay[new_start + k] = trace.blocks[old_start + k]
+
+        # (node, parent, number, title, content, children) of every node before the update.
+        before: typing.Dict[Node, tuple] = dict()
+        for node in DocumentTreeParser._pre_order(document):
+            before[node] = (node, node.parent, node.number, node.title, node.content, tuple(node.children))
+
+        result = ReparseResult(document)
+        self._build_tree(document.title, blocks, document=document, keep_trace=True, replay=replay, result=result)
+        document.touch()
+
+        present = set(DocumentTreeParser._pre_order(document))
+        # Pre order, remembering whether an ancestor has already been reported as changed.
+        dfs_stack = [(document, False)]
+        while dfs_stack:
+            node, reported = dfs_stack.pop()
+            if not reported:
+                old = before.get(node)
+                # A node also changed if children it kept were reordered or moved elsewhere. New children are reported
+                # on their own.
+                if old is None or old[2:5] != (node.number, node.title, node.content) or \
+                        [c for c in old[5] if c in present] != [c for c in node.children if c in before]:
+                    result.changed.append(node)
+                    reported = True
+            dfs_stack.extend((child, reported) for child in reversed(node.children))
+
+        for node, parent, *_ in before.values():
+            if node not in present and (parent is None or parent in present):
+                result.removed.append(node)
+
+        return result
+
+    def _configuration(self) -> str:
+        """
+        :return: Identifies the node patterns and preprocessors of the parser.
+        """
+        return self.cache_key("")
+
+    def _build_tree(self, title: str, blocks: typing.Iterable[str], document: Optional[Document] = None,
+                    keep_trace: Optional[bool] = None, replay: Optional[typing.Dict[int, BlockTrace]] = None,
+                    result: Optional[ReparseResult] = None) -> Document:
+        """
+        Creates the document tree from preprocessed blocks.
+
+        :param title: The title of the regulation.
+        :param blocks: The blocks of the regulation. These are consumed one by one.
+        :param document: If given, the tree is built below this document instead of a new one.
+        :param keep_trace: Whether to record a ParseTrace on the document. Defaults to the keep_trace of the parser.
+        :param replay: Maps the index of a block to the trace of an equal block. If the block is read in the same
+                       context, the traced nodes are reused instead of classifying the block.
+        :param result: Counts the classified and replayed blocks if given.
+        :return: The regulation root node of the parsed document.
+        """
+        if document is None:
+            regulation = Document(title=title)
+        else:
+            regulation = document
+            regulation.children = []
+            regulation.content = ""
         node_stack: typing.List[Node] = [regulation]
+        # The content of every node on the stack as a list of fragments, which are only joined when the node is
+        # finalized. Appending to the content itself would copy it for every block.
+        fragments: typing.List[typing.List[str]] = [[regulation.content]]
 
-        blocks = DocumentTreeParser._blockize(text)
-        for preprocessor in self.preprocessors:
-            blocks = preprocessor.process(blocks)
-
-        for block in blocks:
-            for node_pattern in self.node_patterns:
-                matched, new_node = node_pattern.accept_block(block, node_stack[-1])
-                if matched:
-                    # end all nodes with higher depth
-                    while node_stack[-1].depth >= node_pattern.depth:
-                        node_stack[-1].finalize()
-                        node_stack.pop()
-
-                    new_node.parent = node_stack[-1]
-                    node_stack[-1].children.append(new_node)
-                    node_stack.append(new_node)
+        if keep_trace is None:
+            keep_trace = self.keep_trace
+        trace = ParseTrace(self._configuration()) if keep_trace else None
+        regulation.parse_trace = trace
+
+        classifier = self._get_classifier()
+
+        for i, block in enumerate(blocks):
+            context = node_stack[-1].__class__
+            steps: typing.List[TraceStep] = []
+
+            traced = replay.get(i) if replay else None
+            if traced is not None and traced.context is context:
+                for step in traced.steps:
+                    node = step.node
+                    node.children = []
+                    node.number = step.number
+                    node.title = step.title
+                    node.content = block if step.content is None else step.content
+                    self._attach(node_stack, fragments, node)
+                    steps.append(step)
+                consumed = bool(steps) and steps[-1].node.consumes
+                if result is not None:
+                    result.replayed_blocks += 1
+            else:
+                consumed = False
+                index, new_node = classifier.classify(block, node_stack[-1])
+                while index is not None:
+                    node_pattern = classifier.node_patterns[index]
+
+                    if traced is not None and len(steps) < len(traced.steps) and \
+                            traced.steps[len(steps)].node.__class__ is new_node.__class__:
+                        # The block was read in another context but creates the same kind of node, which is reused.
+                        node = traced.steps[len(steps)].node
+                        node.children = []
+                        node.number, node.title, node.content = new_node.number, new_node.title, new_node.content
+                        new_node = node
+
+                    if trace is not None:
+                        steps.append(TraceStep(new_node, new_node.number, new_node.title,
+                                               None if new_node.content is block else new_node.content))
+                    self._attach(node_stack, fragments, new_node)
                     if node_pattern.consumes:
+                        consumed = True
                         break
-            else:
+
+                    # The block may still be accepted by one of the following node patterns.
+                    index, new_node = classifier.classify(block, node_stack[-1], index + 1)
+                if result is not None:
+                    result.classified_blocks += 1
+
+            if trace is not None:
+                trace.blocks.append(BlockTrace(block_digest(block), context, tuple(steps)))
+
+            if not consumed:
                 # Raw content
-                node_stack[-1].content += "\n\n" + block
+                fragments[-1].append("\n\n")
+                fragments[-1].append(block)
 
+        for node, parts in zip(node_stack, fragments):
+            DocumentTreeParser._join_content(node, parts)
         for node in node_stack:
             node.finalize()
 
         return regulation
 
+    @staticmethod
+    def _attach(node_stack: typing.List[Node], fragments: typing.List[typing.List[str]], node: Node):
+        """
+        Adds a node as the last child of the innermost node on the stack that is not deeper than it.
+        """
+        # end all nodes with higher depth
+        while node_stack[-1].depth >= node.depth:
+            DocumentTreeParser._join_content(node_stack[-1], fragments.pop())
+            node_stack.pop().finalize()
+
+        node.parent = node_stack[-1]
+        node_stack[-1].children.append(node)
+        node_stack.append(node)
+        fragments.append([node.content])
+
+    @staticmethod
+    def _join_content(node: Node, parts: typing.List[str]):
+        if len(parts) > 1:
+            node.content = "".join(parts)
+
+    @staticmethod
+    def _pre_order(root: Node) -> typing.Iterator[Node]:
+        # node_traversal is not used as it would import spacy into the parser.
+        dfs_stack = [root]
+        while dfs_stack:
+            node = dfs_stack.pop()
+            yield node
+            dfs_stack.extend(reversed(node.children))
+
     def parse_from_eu_doc_file(self, title, file_name) -> Document:
         """
         Shorthand for opening a file in "./resources/eu_documents" and parsing it
@@ -90,6 +316,22 @@ class DocumentTreeParser:
         with open(f"./resources/eu_documents/{file_name}", encoding="utf-8") as f:
             return self.parse_document(title, f.read())
 
+    def __getstate__(self):
+        # The classifier is rebuilt on demand, e.g. after the parser was sent to another process.
+        state = self.__dict__.copy()
+        state["_classifier"] = None
+        return state
+
+    def _get_classifier(self) -> BlockClassifier:
+        """
+        Returns the block classifier for the current node patterns. It is only rebuilt if the configuration changed.
+        """
+        if self._classifier is None or self._classifier.node_patterns != tuple(self.node_patterns) or \
+                self._classifier.__class__ != self.block_classifier:
+            self._classifier = self.block_classifier(self.node_patterns)
+
+        return self._classifier
+
     @staticmethod
     def _blockize(text) -> typing.List[str]:
         """
@@ -98,4 +340,41 @@ class DocumentTreeParser:
         :param text: The text to be parsed.
         :return: A list of text blocks.
         """
-        return [block.strip().replace("\n", " ").replace("­", "") for block in text.split("\n\n") if block.strip()]
+        return [DocumentTreeParser._normalize_block(block) for block in text.split("\n\n") if block.strip()]
+
+    @staticmethod
+    def _blockize_stream(fileobj: typing.TextIO, chunk_size: int = 1 << 16) -> typing.Iterator[str]:
+        """
+        Lazily splits the text read from a file object into paragraphs. Yields the same blocks as _blockize.
+
+        :param fileobj: The text file to read from.
+        :param chunk_size: The number of characters read at once.
+        :return: An iterator over the text blocks.
+        """
+        # Parts of the block that has not been terminated by a blank line yet.
+        pending: typing.List[str] = []
+
+        while chunk := fileobj.read(chunk_size):
+            if pending and pending[-1].endswith("\n") and chunk.startswith("\n"):
+                # The separator is split between two chunks.
+                pending[-1] = pending[-1][:-1]
+                pieces = ["".join(pending)] + chunk[1:].split("\n\n")
+            else:
+                pieces = chunk.split("\n\n")
+                pending.append(pieces[0])
+                if len(pieces) == 1:
+                    continue
+                pieces[0] = "".join(pending)
+
+            pending = [pieces.pop()]
+            for block in pieces:
+                if block.strip():
+                    yield DocumentTreeParser._normalize_block(block)
+
+        block = "".join(pending)
+        if block.strip():
+            yield DocumentTreeParser._normalize_block(block)
+
+    @staticmethod
+    def _normalize_block(block: str) -> str:
+        return block.strip().replace("\n", " ").replace("­", "")
@@ -20,6 +20,10 @@ class Article(Node):
         paragraph = Article(number=number)
         return True, paragraph
 
+    @classmethod
+    def block_pattern(cls) -> typing.Optional[re.Pattern]:
+        return Article._pattern
+
     def finalize(self):
         split_content = [l.strip() for l in self.content.split("\n") if l.strip()]
         if split_content:
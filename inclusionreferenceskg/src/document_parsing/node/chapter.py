@@ -27,6 +27,10 @@ class Chapter(Node):
         paragraph = Chapter(number=number)
         return True, paragraph
 
+    @classmethod
+    def block_pattern(cls) -> typing.Optional[re.Pattern]:
+        return Chapter._pattern
+
     def finalize(self):
         if self.content.strip():
             split_content = [l.strip() for l in self.content.split("\n") if l.strip()]
@@ -0,0 +1,225 @@
+import uuid
+from array import array
+from typing import Dict, FrozenSet, List, Optional, Tuple, Type, Union
+
+from document_parsing.node.node import Node
+
+# Stands in for a number of None in the numbers array.
+_NO_NUMBER = -(2 ** 63)
+
+
+class CompactTree:
+    """
+    Frozen, array-backed store of a finished document tree.
+
+    Nodes are identified by their index in pre order. Per node, the type code, number, parent, first child and next
+    sibling are kept in parallel arrays and the contents of all nodes are concatenated into a single UTF-8 buffer that
+    is sliced using content_offsets. (A str would use up to four bytes per character as soon as a single character of
+    the corpus requires it.) Compared to a tree of Node objects, this avoids an object, a children list, a dict
+    and (optionally) an id string per node.
+
+    The tree is accessed through CompactNode views, which may be used in place of Nodes for reading, e.g. with
+    Node.resolve_loose, node_traversal.pre_order or Node.immutable_view.
+    """
+
+    def __init__(self, root: Node, keep_ids: bool = True):
+        """
+        Copies a tree. The tree must not be modified afterwards.
+
+        :param root: The root of the tree.
+        :param keep_ids: If True, the ids of the nodes are kept. Otherwise, ids are derived from the position of the
+                         nodes.
+        """
+        self.type_codes = array("B")
+        self.parents = array("i")
+        self.first_children = array("i")
+        self.next_siblings = array("i")
+        self.content_offsets = array("q", [0])
+
+        numbers: List[Optional[int]] = []
+        contents: List[bytes] = []
+        ids: List[str] = []
+        self.titles: Dict[int, str] = dict()
+        none_contents = set()
+
+        type_indices: Dict[Type[Node], int] = dict()
+        offset = 0
+
+        # Pre order, remembering the index of the parent and the previous sibling of each node.
+        dfs_stack = [(root, -1)]
+        last_child: Dict[int, int] = dict()
+        while dfs_stack:
+            node, parent = dfs_stack.pop()
+            index = len(self.parents)
+
+            # Lazily loaded nodes are stored as the eager type they stand in for, which can be created from the fields.
+            node_type = getattr(node.__class__, "eager_type", node.__class__)
+            self.type_codes.append(type_indices.setdefault(node_type, len(type_indices)))
+            self.parents.append(parent)
+            self.first_children.append(-1)
+            self.next_siblings.append(-1)
+
+            if parent >= 0:
+                if parent in last_child:
+                    self.next_siblings[last_child[parent]] = index
+                else:
+                    self.first_children[parent] = index
+                last_child[parent] = index
+
+            numbers.append(node.number)
+            if node.title is not None:
+                self.titles[index] = node.title
+            if node.content is None:
+                none_contents.add(index)
+            else:
+                encoded = node.content.encode("utf-8")
+                contents.append(encoded)
+                offset += len(encoded)
+            self.content_offsets.append(offset)
+            if keep_ids:
+                ids.append(node.id)
+
+            dfs_stack.extend((child, index) for child in reversed(node.children))
+
+        self.types: List[Type[Node]] = list(type_indices)
+        if len(self.types) > 256:
+            raise ValueError("A compact tree supports at most 256 node types.")
+
+        self.numbers: Union[array, List[Optional[int]]]
+        if all(n is None or (isinstance(n, int) and n != _NO_NUMBER) for n in numbers):
+            self.numbers = array("q", (_NO_NUMBER if n is None else n for n in numbers))
+        else:
+            self.numbers = numbers
+
+        self.content = b"".join(contents)
+        self.none_contents: FrozenSet[int] = frozenset(none_contents)
+        # Ids created by Node are uuid4 strings, which are stored as their 16 bytes.
+        self.ids: Union[bytes, List[str], None] = None
+        if keep_ids:
+            try:
+                packed = b"".join(uuid.UUID(i).bytes for i in ids)
+                self.ids = packed if all(str(uuid.UUID(bytes=packed[k * 16:k * 16 + 16])) == i
+                                         for k, i in enumerate(ids)) else ids
+            except (ValueError, TypeError, AttributeError):
+                self.ids = ids
+        self.id_prefix = str(uuid.uuid4()) + "/"
+
+    def __len__(self):
+        return len(self.parents)
+
+    @property
+    def root(self) -> "CompactNode":
+        return CompactNode(self, 0)
+
+    def view(self, index: int) -> "CompactNode":
+        """
+        :param index: The index of a node in pre order.
+        :return: The view of the node.
+        """
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        return CompactNode(self, index)
+
+
+class CompactNode:
+    """
+    Read-only view of a node in a CompactTree. It mimics a Node: Its __class__ is the type of the node it represents
+    and it provides the attributes and the reading methods of a Node.
+    """
+
+    __slots__ = ("tree", "index")
+
+    def __init__(self, tree: CompactTree, index: int):
+        self.tree = tree
+        self.index = index
+
+    @property
+    def __class__(self):
+        # Lets type comparisons in Node._pattern_match and isinstance treat the view like the node it represents.
+        return self.tree.types[self.tree.type_codes[self.index]]
+
+    @property
+    def depth(self) -> int:
+        return self.__class__.depth
+
+    @property
+    def ignore_when_forming_full_qualifier(self) -> bool:
+        return self.__class__.ignore_when_forming_full_qualifier
+
+    @property
+    def number(self) -> Optional[int]:
+        number = self.tree.numbers[self.index]
+        return None if number == _NO_NUMBER else number
+
+    @property
+    def title(self) -> Optional[str]:
+        return self.tree.titles.get(self.index)
+
+    @property
+    def content(self) -> Optional[str]:
+        if self.index in self.tree.none_contents:
+            return None
+        start, end = self.tree.content_offsets[self.index], self.tree.content_offsets[self.index + 1]
+        # The content is a memoryview for trees loaded by load_tree.
+        return str(self.tree.content[start:end], "utf-8")
+
+    @property
+    def id(self) -> str:
+        ids = self.tree.ids
+        if ids is None:
+            return self.tree.id_prefix + str(self.index)
+        if isinstance(ids, (bytes, memoryview)):
+            # Formats like str(uuid.UUID(bytes=...)), which is considerably slower.
+            h = ids[self.index * 16:self.index * 16 + 16].hex()
+            return f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}"
+        return ids[self.index]
+
+    @property
+    def parent(self) -> Optional["CompactNode"]:
+        parent = self.tree.parents[self.index]
+        return CompactNode(self.tree, parent) if parent >= 0 else None
+
+    @property
+    def children(self) -> List["CompactNode"]:
+        children = []
+        child = self.tree.first_children[self.index]
+        while child >= 0:
+            children.append(CompactNode(self.tree, child))
+            child = self.tree.next_siblings[child]
+        return children
+
+    def to_node(self) -> Node:
+        """
+        Creates a tree of Node objects from the subtree of this view. The root of the created tree has no parent.
+
+        :return: The node corresponding to this view.
+        """
+        root = None
+        dfs_stack: List[Tuple["CompactNode", Optional[Node]]] = [(self, None)]
+        while dfs_stack:
+            view, parent = dfs_stack.pop()
+            node = view.__class__(number=view.number, content=view.content, title=view.title, parent=parent,
+                                  id=view.id)
+            if parent is None:
+                root = node
+            else:
+                parent.children.append(node)
+            dfs_stack.extend((child, node) for child in reversed(view.children))
+        return root
+
+    def _pattern_match(self, pat: Node) -> bool:
+        return self.__class__._pattern_match(self, pat)
+
+    resolve_loose = Node.resolve_loose
+    resolve_iter = Node.resolve_iter
+    resolve_first = Node.resolve_first
+    immutable_view = Node.immutable_view
+
+    def __eq__(self, other):
+        return isinstance(other, CompactNode) and other.tree is self.tree and other.index == self.index
+
+    def __hash__(self):
+        return hash((id(self.tree), self.index))
+
+    def __repr__(self):
+        return f"CompactNode({self.__class__.__name__}, number={self.number}, index={self.index})"
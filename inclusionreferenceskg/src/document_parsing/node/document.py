@@ -1,7 +1,11 @@
 import typing
 
+from document_parsing.node.document_title import titles_match
 from document_parsing.node.node import Node
 
+if typing.TYPE_CHECKING:
+    from document_parsing.parse_trace import ParseTrace
+
 
 class Document(Node):
     """
@@ -9,6 +13,9 @@ class Document(Node):
     As there is no distinction between these documents when resolving references, one class suffices.
     """
     depth = 0
+    # Set by DocumentTreeParser if the document was parsed with keep_trace. Not a dataclass field, so it does not take
+    # part in comparisons.
+    parse_trace: typing.Optional["ParseTrace"] = None
 
     @classmethod
     def accept_block(cls, *_) -> typing.Tuple[bool, typing.Optional["Document"]]:
@@ -16,13 +23,13 @@ class Document(Node):
 
     def _pattern_match(self, pat: "Node"):
         wildcard = -1
-        type_match = pat is None or pat.__class__ == self.__class__
+        # Subclasses, e.g. LazyDocument, match document patterns.
+        type_match = pat is None or isinstance(self, pat.__class__)
         number_match = pat is None or pat.number == self.number or pat.number == wildcard
 
-        # We are more lenient when matching the title of a regulation. Normalization of the title may also be
-        # feasible.
+        # We are more lenient when matching the title of a regulation, see titles_match.
         title_match = pat is None or pat.title == self.title or pat.title is None or pat.title == wildcard or \
-                      pat.title.lower() in self.title.lower() or self.title.lower() in pat.title.lower()
+                      titles_match(pat.title, self.title)
 
         return type_match and number_match and title_match
 
@@ -0,0 +1,137 @@
+import re
+from collections import defaultdict
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Optional, Sequence, Set
+
+from document_parsing.node.node import Node
+
+
+class DocumentKey(NamedTuple):
+    """
+    The canonical form of the numbering of an EU legal act, e.g. ("directive", 1995, 46, "EC") for Directive 95/46/EC
+    and ("regulation", 2001, 45, "EC") for Regulation (EC) No 45/2001.
+    """
+    type: str
+    year: int
+    number: int
+    # None if the title does not name the institution.
+    institution: Optional[str] = None
+
+    def matches(self, other: "DocumentKey") -> bool:
+        return self[:3] == other[:3] and (self.institution is None or other.institution is None or
+                                          self.institution == other.institution)
+
+
+# Older acts are numbered "No number/year", e.g. Regulation (EEC) No 339/93. Acts without "No" are numbered
+# "year/number", e.g. Directive 95/46/EC or Directive (EU) 2015/1535.
+_numbering = re.compile(r"\b(regulation|directive|decision)s?\s+(?:\((\w{2,8})\)\s+)?(no\.?\s+)?"
+                        r"([1-9][0-9]*)/([1-9][0-9]*)(?:/(\w{2,8}))?", re.I)
+
+
+@lru_cache(maxsize=4096)
+def document_key(title: str) -> Optional[DocumentKey]:
+    """
+    Canonicalizes the numbering of an EU legal act in a title or a reference.
+
+    :param title: E.g. "Council Directive 95/46/EC" or "Regulation (EC) No 45/2001 of the European Parliament".
+    :return: The key of the first act named or None if there is none.
+    """
+    match = _numbering.search(title)
+    if not match:
+        return None
+
+    act_type, institution, number_first, first, second, suffix = match.groups()
+    if number_first:
+        number, year = int(first), int(second)
+    else:
+        year, number = int(first), int(second)
+    if year < 100:
+        year += 1900 if year >= 50 else 2000
+
+    institution = institution or suffix
+    return DocumentKey(act_type.lower(), year, number, institution.upper() if institution else None)
+
+
+def titles_match(pattern_title: str, title: str) -> bool:
+    """
+    Decides if the title of a pattern refers to a document. Titles match if one contains the other, ignoring case, or
+    if they name the same act, see document_key.
+    """
+    a, b = pattern_title.lower(), title.lower()
+    if a in b or b in a:
+        return True
+
+    key, other = document_key(pattern_title), document_key(title)
+    return key is not None and other is not None and key.matches(other)
+
+
+def _trigrams(text: str) -> Set[str]:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class DocumentTitleIndex:
+    """
+    Finds the documents whose title matches the title of a pattern as in titles_match without comparing every title.
+
+    Documents naming an act are looked up by their DocumentKey. Titles containing one another are found through the
+    trigrams of the lower case titles: A title only contains another if it contains all of its trigrams.
+    """
+
+    def __init__(self, documents: Sequence[Node]):
+        """
+        :param documents: The documents to index.
+        """
+        self.documents = list(documents)
+        self._titles = [d.title.lower() if isinstance(d.title, str) else None for d in self.documents]
+        self._by_key: Dict[tuple, List[int]] = defaultdict(list)
+        self._by_trigram: Dict[str, Set[int]] = defaultdict(set)
+        self._trigram_counts: List[int] = []
+        # Titles too short to have a trigram are contained in a title whenever they are a substring of it.
+        self._short: List[int] = []
+
+        for i, title in enumerate(self._titles):
+            grams = _trigrams(title) if title is not None else set()
+            self._trigram_counts.append(len(grams))
+            if title is None:
+                continue
+
+            key = document_key(self.documents[i].title)
+            if key is not None:
+                self._by_key[key[:3]].append(i)
+            for gram in grams:
+                self._by_trigram[gram].add(i)
+            if not grams:
+                self._short.append(i)
+
+    def lookup(self, title: str) -> List[Node]:
+        """
+        :param title: The title of a pattern.
+        :return: The matching documents in the order they were given.
+        """
+        lower = title.lower()
+        found: Set[int] = set()
+
+        key = document_key(title)
+        if key is not None:
+            found.update(i for i in self._by_key.get(key[:3], [])
+                         if key.matches(document_key(self.documents[i].title)))
+
+        grams = _trigrams(lower)
+        # Documents whose title contains the pattern's title.
+        if grams:
+            postings = sorted((self._by_trigram.get(gram, set()) for gram in grams), key=len)
+            candidates = set(postings[0]).intersection(*postings[1:])
+        else:
+            candidates = {i for i, t in enumerate(self._titles) if t is not None}
+        found.update(i for i in candidates if lower in self._titles[i])
+
+        # Documents whose title is contained in the pattern's title.
+        counts: Dict[int, int] = defaultdict(int)
+        for gram in grams:
+            for i in self._by_trigram.get(gram, ()):
+                counts[i] += 1
+        found.update(i for i, count in counts.items()
+                     if count == self._trigram_counts[i] and self._titles[i] in lower)
+        found.update(i for i in self._short if self._titles[i] in lower)
+
+        return [self.documents[i] for i in sorted(found)]
@@ -20,10 +20,12 @@ class Indent(Node):
 
         return True, Indent(content=block)
 
+    @classmethod
+    def block_pattern(cls) -> Optional[re.Pattern]:
+        return Indent._pattern
+
     def finalize(self):
-        for i, sibling in enumerate(self.parent.children, 1):
-            if self.id == sibling.id:
-                self.number = i
-                break
-        else:
+        try:
+            self.number = self.parent.children.index(self) + 1
+        except ValueError:
             logging.warning(f"Could not find self in children of parent. For indent {self.immutable_view()}.")
@@ -0,0 +1,117 @@
+import os
+from typing import ClassVar, List, Optional, Sequence, Tuple, Type
+
+from document_parsing.document_tree_parser import DocumentTreeParser
+from document_parsing.node.document import Document
+from document_parsing.node.document_title import DocumentTitleIndex
+from document_parsing.node.node import Node
+from document_parsing.node.root import Root
+
+
+class LazyDocument(Document):
+    """
+    A document that is only parsed once its children or its content are accessed. Its title is known beforehand, so
+    patterns are matched against it without parsing.
+    """
+
+    # The type of the document once it is loaded, e.g. in a CompactTree.
+    eager_type: ClassVar[Type[Node]] = Document
+
+    # Set until the document is loaded.
+    path: Optional[str] = None
+    parser: Optional[DocumentTreeParser] = None
+
+    def __init__(self, title: str, path: str, parser: DocumentTreeParser):
+        """
+        :param title: The title of the document.
+        :param path: The path of the source text.
+        :param parser: The parser used to parse it.
+        """
+        super().__init__(title=title)
+        self.path = path
+        self.parser = parser
+
+    @property
+    def is_loaded(self) -> bool:
+        return self.path is None
+
+    @property
+    def children(self) -> List[Node]:
+        self.load()
+        return self._children
+
+    @children.setter
+    def children(self, children: List[Node]):
+        self._children = children
+
+    @property
+    def content(self) -> Optional[str]:
+        self.load()
+        return self._content
+
+    @content.setter
+    def content(self, content: Optional[str]):
+        self._content = content
+
+    def loaded_children(self) -> List[Node]:
+        return self._children
+
+    def load(self):
+        """
+        Parses the document unless this has already been done. Marks the tree as changed.
+        """
+        if self.path is None:
+            return
+
+        with open(self.path, encoding="utf-8") as f:
+            document = self.parser.parse_document(self.title, f.read())
+        self.path = self.parser = None
+
+        self._children = document.children
+        for child in self._children:
+            child.parent = self
+        self._content = document.content
+        self.number = document.number
+        self.touch()
+
+
+class LazyRoot(Root):
+    """
+    Root of a corpus whose documents are parsed when they are first reached, e.g. by resolve_loose or a traversal.
+
+    The titles of the documents are taken from the manifest, so only documents whose title matches a pattern are
+    parsed by resolve_loose. Patterns without a document, e.g. [Article(number=5)], and traversals still parse every
+    document.
+    """
+
+    eager_type: ClassVar[Type[Node]] = Root
+
+    def __init__(self, manifest: Sequence[Tuple[str, str]], parser: DocumentTreeParser = None,
+                 directory: str = "./resources/eu_documents"):
+        """
+        :param manifest: (title, file name) pairs of the documents. The documents are children of the root in this
+                         order.
+        :param parser: The parser to be used. If None, a default DocumentTreeParser is created.
+        :param directory: The directory the file names are relative to.
+        """
+        super().__init__()
+        self._title_index: Optional[DocumentTitleIndex] = None
+        parser = parser or DocumentTreeParser()
+        for title, file_name in manifest:
+            document = LazyDocument(title, os.path.join(directory, file_name), parser)
+            document.parent = self
+            self.children.append(document)
+
+    def documents(self, title: str) -> List[LazyDocument]:
+        """
+        Finds documents by their title without parsing them.
+
+        :param title: The title, which is matched as in resolve_loose, see titles_match.
+        :return: The matching documents.
+        """
+        if self._title_index is None or self._title_index.documents != self.children:
+            self._title_index = DocumentTitleIndex(self.children)
+        return self._title_index.lookup(title)
+
+    def loaded_documents(self) -> List[LazyDocument]:
+        return [document for document in self.children if document.is_loaded]
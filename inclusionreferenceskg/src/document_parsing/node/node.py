@@ -1,12 +1,31 @@
 import dataclasses
+import itertools
+import re
 import uuid
 import warnings
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
-from typing import ClassVar, Optional, List, Tuple, Type
+from typing import ClassVar, Iterator, Optional, List, Tuple, Type
 
 
-@dataclass
+class _StoredContent:
+    """
+    Class attribute behind Node.content. As it only defines __get__, content set on a node is an ordinary instance
+    attribute and is read without any overhead. Only nodes whose content was moved to a SourceText, which removes the
+    instance attribute, read it from their span here.
+    """
+
+    def __get__(self, node: Optional["Node"], owner=None) -> Optional[str]:
+        if node is None:
+            # The default of the dataclass field.
+            return ""
+        span = node.__dict__.get("_source_span")
+        return "" if span is None else span.text()
+
+
+# Nodes are compared and hashed by identity. Generated comparisons would walk whole subtrees and follow the parent back
+# up. Use same_structure in node_traversal to compare trees and _pattern_match to match patterns.
+@dataclass(eq=False)
 class Node(ABC):
     """
     Abstract base class for classes that represent parts of EU regulations,
@@ -23,11 +42,14 @@ class Node(ABC):
 
     children: List["Node"] = dataclasses.field(default_factory=list)
     number: Optional[int] = None
-    content: Optional[str] = ""
+    content: Optional[str] = _StoredContent()
     title: Optional[str] = None
     parent: Optional["Node"] = None
     id: str = dataclasses.field(default_factory=lambda: str(uuid.uuid4()))
 
+    # Counts the changes to the structure of the tree. Only kept on the root of a tree, see touch.
+    _structure_version: int = dataclasses.field(default=0, init=False, repr=False, compare=False)
+
     @classmethod
     @abstractmethod
     def accept_block(cls: Type["Node"], block: str, parent: "Node") -> Tuple[bool, Optional["Node"]]:
@@ -42,6 +64,15 @@ class Node(ABC):
         """
         raise NotImplementedError()
 
+    @classmethod
+    def block_pattern(cls) -> Optional[re.Pattern]:
+        """
+        Returns the pattern a block must match (from its start) for accept_block to accept it. Only nodes whose
+        acceptance depends on nothing but this pattern should return one, all other nodes return None and are always
+        asked through accept_block. Used by the CompiledBlockClassifier to test many node types in a single match.
+        """
+        return None
+
     @abstractmethod
     def finalize(self):
         """
@@ -49,6 +80,43 @@ class Node(ABC):
         """
         raise NotImplementedError()
 
+    def add_child(self, child: "Node"):
+        """
+        Appends a child and marks the tree as changed.
+        """
+        child.parent = self
+        self.children.append(child)
+        self.touch()
+
+    def loaded_children(self) -> List["Node"]:
+        """
+        Returns the children that are available without loading anything. Only differs from children for nodes that
+        create their subtree on demand, see LazyDocument.
+        """
+        return self.children
+
+    def touch(self):
+        """
+        Marks the tree this node belongs to as changed, which invalidates everything derived from its structure, e.g.
+        a NodeIndex or a ResolutionCache. Must be called after changing the children, number or title of a node
+        directly.
+        """
+        root = self._root()
+        root._structure_version = root._structure_version + 1
+
+    @property
+    def structure_version(self) -> int:
+        """
+        The number of times the tree this node belongs to has been changed.
+        """
+        return self._root()._structure_version
+
+    def _root(self) -> "Node":
+        node = self
+        while node.parent is not None:
+            node = node.parent
+        return node
+
     def resolve(self, pattern: List[Optional["Node"]], curr_depth=0) -> List["Node"]:
         """
         Finds nodes that are at the end of the path described by the pattern parameter relative to this node.
@@ -90,28 +158,51 @@ class Node(ABC):
         title_match = pat is None or pat.title == self.title or pat.title is None or pat.title == wildcard
         return type_match and number_match and title_match
 
-    def resolve_loose(self, pattern: List[Optional["Node"]], pattern_depth=0) -> List["Node"]:
+    def resolve_loose(self, pattern: List[Optional["Node"]], pattern_depth=0, limit: Optional[int] = None) \
+            -> List["Node"]:
         """
         Finds all children that have the pattern along their path to this node, ignoring additional nodes between
         nodes and before the first node but not after the last node of the pattern.
 
         Note: This implementation breaks if the pattern contains multiple of the same type of node.
-        """
-        if pattern_depth == len(pattern) - 1 and self._pattern_match(pattern[pattern_depth]):
-            return [self]
-
-        matches = []
 
-        advance = 1 if self._pattern_match(pattern[pattern_depth]) else 0
+        :param pattern: The pattern to be matched.
+        :param pattern_depth: The element of the pattern this node is matched against.
+        :param limit: If given, the search stops after this many matches, e.g. 2 to tell whether a pattern is
+                      ambiguous.
+        :return: The matches in pre order.
+        """
+        return list(itertools.islice(self.resolve_iter(pattern, pattern_depth), limit))
 
-        for child in self.children:
-            # Prune searches. Assumes that the node depth is adhered to.
-            if child.depth > pattern[pattern_depth + advance].depth:
+    def resolve_iter(self, pattern: List[Optional["Node"]], pattern_depth=0) -> Iterator["Node"]:
+        """
+        Lazily yields the matches of resolve_loose in the same order.
+        """
+        last = len(pattern) - 1
+        dfs_stack = [(self, pattern_depth)]
+        while dfs_stack:
+            node, depth = dfs_stack.pop()
+            match = node._pattern_match(pattern[depth])
+            if depth == last and match:
+                yield node
                 continue
 
-            matches.extend(child.resolve_loose(pattern, pattern_depth=pattern_depth + advance))
+            if match:
+                depth += 1
 
-        return matches
+            # Prune searches. Assumes that the node depth is adhered to, i.e., children are deeper than their parent.
+            # If no child can pass, the children are not looked at, so e.g. a LazyDocument that does not match is not
+            # loaded.
+            pat = pattern[depth]
+            if pat is not None and pat.depth > node.depth and node.children:
+                max_depth = pat.depth
+                dfs_stack.extend((child, depth) for child in reversed(node.children) if child.depth <= max_depth)
+
+    def resolve_first(self, pattern: List[Optional["Node"]]) -> Optional["Node"]:
+        """
+        :return: The first match of resolve_loose or None if there is none. The search stops at the first match.
+        """
+        return next(self.resolve_iter(pattern), None)
 
     def immutable_view(self) -> "ImmutableNodeView":
         return ImmutableNodeView(
@@ -0,0 +1,177 @@
+import itertools
+from bisect import bisect_left
+from collections import defaultdict
+from collections.abc import Hashable
+from typing import Dict, Iterator, List, Optional, Tuple, Type
+
+from document_parsing.node.document import Document
+from document_parsing.node.document_title import DocumentTitleIndex
+from document_parsing.node.node import Node
+from document_parsing.node.tree_intervals import TreeIntervals
+
+
+class NodeIndex(TreeIntervals):
+    """
+    Inverted index over a tree for resolving reference qualifiers without walking the whole tree.
+
+    On top of the intervals of TreeIntervals, by which ancestry is decided by comparing positions, nodes are listed by
+    (type, number) and by (type, lower case title). resolve_loose looks up the candidates for every element of a
+    pattern, keeps those below a candidate of the previous element and finally checks the remaining ones against
+    Node.resolve_loose's rules along their path. The tree must not be changed while the index is in use, see
+    Node.touch. Subtrees created on demand are loaded, as resolution needs all nodes.
+    """
+
+    _last: Optional["NodeIndex"] = None
+
+    def __init__(self, root: Node):
+        """
+        :param root: The root of the tree to index.
+        """
+        super().__init__(root, load=True)
+        self._by_type: Dict[Type[Node], List[int]] = defaultdict(list)
+        self._by_number: Dict[Tuple[Type[Node], Optional[int]], List[int]] = defaultdict(list)
+        self._by_title: Dict[Tuple[Type[Node], str], List[int]] = defaultdict(list)
+        # The documents matching (type, number, title) of a pattern element.
+        self._documents: Dict[Tuple[Type[Node], Optional[int], Optional[str]], List[int]] = dict()
+        self._title_index: Optional[DocumentTitleIndex] = None
+
+        for position, node in enumerate(self.nodes):
+            # Subclasses of Document, e.g. LazyDocument, are matched by document patterns, see Document._pattern_match.
+            node_type = Document if isinstance(node, Document) else node.__class__
+            self._by_type[node_type].append(position)
+            self._by_number[node_type, node.number].append(position)
+            if isinstance(node.title, str):
+                self._by_title[node_type, NodeIndex.normalize_title(node.title)].append(position)
+
+    @classmethod
+    def of(cls, root: Node) -> "NodeIndex":
+        """
+        Returns an index of the tree, reusing the one created last if it is for the same root and the tree has not
+        been changed since.
+
+        :param root: The root of the tree.
+        :return: The index.
+        """
+        if cls._last is None or cls._last.root is not root or cls._last.is_stale():
+            cls._last = cls(root)
+        return cls._last
+
+    @staticmethod
+    def normalize_title(title: str) -> str:
+        return " ".join(title.lower().split())
+
+    def candidates(self, pat: Optional[Node]) -> Optional[List[int]]:
+        """
+        :param pat: An element of a pattern.
+        :return: The positions of all nodes that may match the element, in pre order, or None if any node may.
+        """
+        if pat is None:
+            return None
+
+        if isinstance(pat, Document) and isinstance(pat.number, Hashable) and isinstance(pat.title, Hashable):
+            # Documents are looked up by title once per title. Their titles are matched leniently, see titles_match.
+            key = (pat.__class__, pat.number, pat.title)
+            if key not in self._documents:
+                positions = self._by_type.get(Document, [])
+                if isinstance(pat.title, str):
+                    if self._title_index is None:
+                        self._title_index = DocumentTitleIndex([self.nodes[p] for p in positions])
+                    positions = sorted(self.position(d) for d in self._title_index.lookup(pat.title))
+                self._documents[key] = [p for p in positions if self.nodes[p]._pattern_match(pat)]
+            return self._documents[key]
+
+        wildcard = -1
+        if pat.number != wildcard:
+            return self._by_number.get((pat.__class__, pat.number), [])
+        if isinstance(pat.title, str):
+            return self._by_title.get((pat.__class__, NodeIndex.normalize_title(pat.title)), [])
+        return self._by_type.get(pat.__class__, [])
+
+    def resolve_loose(self, pattern: List[Optional[Node]], start: Optional[Node] = None,
+                      limit: Optional[int] = None) -> List[Node]:
+        """
+        Returns the same nodes as start.resolve_loose(pattern).
+
+        :param pattern: The pattern to be matched.
+        :param start: The node to resolve from. Defaults to the root of the index.
+        :param limit: If given, the search stops after this many matches.
+        :return: A list of potential matches in pre order.
+        """
+        return list(itertools.islice(self.resolve_iter(pattern, start), limit))
+
+    def resolve_first(self, pattern: List[Optional[Node]], start: Optional[Node] = None) -> Optional[Node]:
+        """
+        :return: The first match of resolve_loose or None if there is none.
+        """
+        return next(self.resolve_iter(pattern, start), None)
+
+    def resolve_iter(self, pattern: List[Optional[Node]], start: Optional[Node] = None) -> Iterator[Node]:
+        """
+        Lazily yields the matches of resolve_loose in the same order. Candidates are only checked along their path
+        once they are reached.
+        """
+        start_position = 0 if start is None else self.position(start)
+
+        # Positions of the nodes that may match the first k elements of the pattern along their path.
+        current = [(start_position, self.ends[start_position])]
+        for k, pat in enumerate(pattern):
+            candidates = self.candidates(pat)
+            if candidates is None:
+                # Not restricted by this element.
+                continue
+
+            selected = []
+            for begin, end in current:
+                # The first element may match the start node itself, later ones only nodes below the previous match.
+                first = bisect_left(candidates, begin if k == 0 else begin + 1)
+                last = bisect_left(candidates, end)
+                selected.extend(candidates[first:last])
+
+            current = []
+            for position in sorted(set(selected)):
+                if current and position < current[-1][1]:
+                    # Within the subtree of a previous candidate.
+                    continue
+                current.append((position, self.ends[position]))
+            if k < len(pattern) - 1:
+                continue
+
+            matches: Dict[Tuple[int, int], bool] = dict()
+            for p in sorted(set(selected)):
+                if self._resolves_to(pattern, start_position, p, matches):
+                    yield self.nodes[p]
+            return
+
+        yield from self.nodes[start_position].resolve_iter(pattern)
+
+    def _resolves_to(self, pattern: List[Optional[Node]], start: int, position: int,
+                     matches: Dict[Tuple[int, int], bool]) -> bool:
+        """
+        Follows the rules of Node.resolve_loose along the path from start to position. Paths of candidates share
+        ancestors, so whether the node at a position matches an element of the pattern is remembered in matches.
+        """
+        path = [position]
+        while path[-1] != start:
+            path.append(self.parents[path[-1]])
+            if path[-1] < 0:
+                return False
+        path.reverse()
+
+        last = len(pattern) - 1
+        pattern_depth = 0
+        for i, p in enumerate(path):
+            node = self.nodes[p]
+            if i > 0 and node.depth > pattern[pattern_depth].depth:
+                # Pruned
+                return False
+
+            match = matches.get((p, pattern_depth))
+            if match is None:
+                match = matches[p, pattern_depth] = node._pattern_match(pattern[pattern_depth])
+            if pattern_depth == last and match:
+                # resolve_loose does not descend below a match.
+                return p == position
+            if match:
+                pattern_depth += 1
+
+        return False
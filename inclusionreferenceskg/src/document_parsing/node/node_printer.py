@@ -8,7 +8,7 @@ def print_nodes(start: Node, indent: int = 3, content_preview_length: int = 20,
                 output: typing.Callable[[str, ], typing.Any] = print):
     """Prints the node and its children in pre-order."""
 
-    for curr in pre_order(start):
+    for curr in pre_order(start, cached=True):
         if not curr.content:
             curr_content_out = ""
         elif len(curr.content) <= content_preview_length:
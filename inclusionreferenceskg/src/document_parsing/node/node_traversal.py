@@ -1,18 +1,69 @@
-from typing import Tuple, Generator
+from collections import deque
+from itertools import zip_longest
+from typing import Callable, Dict, Generator, Iterator, List, Tuple
 
 from spacy.tokens import Doc, Span, Token
 
 from document_parsing.node.node import Node
 
 
-def pre_order(root: Node):
+def pre_order(root: Node, cached: bool = False) -> Iterator[Node]:
     """
     Iterates through each node reachable from the root node in pre order.
     No checks for infinite recursion are made.
 
     :param root: The node to start at.
+    :param cached: If True, the order is kept on the root node and reused until the tree is changed with
+                   Node.add_child or Node.touch. Changes made to the children lists directly are not noticed, so this is
+                   meant for finished trees. Otherwise, the tree is walked lazily and may be changed while iterating.
     """
+    return iter(_cached_order(root, "pre", _pre_order)) if cached else _pre_order(root)
 
+
+def post_order(root: Node, cached: bool = False) -> Iterator[Node]:
+    """
+    Iterates through each node reachable from the root node in post order, i.e. children before their parent.
+
+    :param root: The node to start at.
+    :param cached: See pre_order.
+    """
+    return iter(_cached_order(root, "post", _post_order)) if cached else _post_order(root)
+
+
+def level_order(root: Node, cached: bool = False) -> Iterator[Node]:
+    """
+    Iterates through each node reachable from the root node level by level, starting with the root.
+
+    :param root: The node to start at.
+    :param cached: See pre_order.
+    """
+    return iter(_cached_order(root, "level", _level_order)) if cached else _level_order(root)
+
+
+def _cached_order(root: Node, name: str, walk: Callable[[Node], Iterator[Node]]) -> List[Node]:
+    """
+    Returns an order of the nodes of a tree, reusing the one stored on the root if the tree has not been changed since.
+    Views without instance attributes, e.g. CompactNodes, are walked every time.
+    """
+    attributes = getattr(root, "__dict__", None)
+    if attributes is None:
+        return list(walk(root))
+
+    # The root of the whole tree and its version identify the state the orders were recorded in.
+    tree_root = root._root()
+    state = (tree_root, tree_root._structure_version)
+    cache: Tuple[Tuple[Node, int], Dict[str, List[Node]]] = attributes.get("_traversal_cache")
+    if cache is None or cache[0] != state:
+        cache = (state, dict())
+        root._traversal_cache = cache
+
+    order = cache[1].get(name)
+    if order is None:
+        order = cache[1][name] = list(walk(root))
+    return order
+
+
+def _pre_order(root: Node) -> Iterator[Node]:
     dfs_stack = [root]
     while dfs_stack:
         curr = dfs_stack.pop()
@@ -20,6 +71,45 @@ def pre_order(root: Node):
         yield curr
 
 
+def _post_order(root: Node) -> Iterator[Node]:
+    dfs_stack = [(root, False)]
+    while dfs_stack:
+        curr, leaving = dfs_stack.pop()
+        if leaving:
+            yield curr
+        else:
+            dfs_stack.append((curr, True))
+            dfs_stack.extend((child, False) for child in reversed(curr.children))
+
+
+def _level_order(root: Node) -> Iterator[Node]:
+    queue = deque([root])
+    while queue:
+        curr = queue.popleft()
+        queue.extend(curr.children)
+        yield curr
+
+
+def same_structure(a: Node, b: Node) -> bool:
+    """
+    Compares two trees by node type, number, title, content and the number of children. Ids and parents are ignored.
+
+    :param a: The root of the first tree.
+    :param b: The root of the second tree.
+    :return: True if both trees have the same structure.
+    """
+
+    for x, y in zip_longest(pre_order(a), pre_order(b)):
+        if x is None or y is None:
+            return False
+
+        if x.__class__ != y.__class__ or x.number != y.number or x.title != y.title or x.content != y.content or \
+                len(x.children) != len(y.children):
+            return False
+
+    return True
+
+
 def traverse_doc_by_node(doc: Doc) -> Generator[Tuple[Node, Span], None, None]:
     """
     Iterates a doc object by the nodes.
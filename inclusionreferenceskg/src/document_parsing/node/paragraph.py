@@ -22,5 +22,9 @@ class Paragraph(Node):
         paragraph = Paragraph(number=number)
         return True, paragraph
 
+    @classmethod
+    def block_pattern(cls) -> typing.Optional[re.Pattern]:
+        return Paragraph._pattern
+
     def finalize(self):
         pass
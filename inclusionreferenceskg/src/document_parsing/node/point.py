@@ -22,5 +22,9 @@ class Point(Node):
         point = Point(number=number, content=line)
         return True, point
 
+    @classmethod
+    def block_pattern(cls) -> typing.Optional[re.Pattern]:
+        return Point._pattern
+
     def finalize(self):
         pass
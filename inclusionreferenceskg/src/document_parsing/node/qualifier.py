@@ -0,0 +1,39 @@
+from typing import Hashable, List, NamedTuple, Optional, Sequence, Tuple, Type, Union
+
+from document_parsing.node.node import Node
+
+
+class QualifierElement(NamedTuple):
+    """
+    Immutable counterpart of a pattern node. It holds everything Node._pattern_match looks at.
+    """
+    type: Type[Node]
+    number: Hashable = None
+    title: Hashable = None
+
+    @staticmethod
+    def of(node: Optional[Node]) -> Optional["QualifierElement"]:
+        return None if node is None else QualifierElement(node.__class__, node.number, node.title)
+
+    def to_node(self) -> Node:
+        return self.type(number=self.number, title=self.title)
+
+
+# A reference qualifier as a hashable value, e.g. ((Document, None, "GDPR"), (Article, 6, None), (Paragraph, 1, None)).
+Qualifier = Tuple[Optional[QualifierElement], ...]
+
+
+def qualifier_key(pattern: Union[Sequence[Optional[Node]], Qualifier]) -> Qualifier:
+    """
+    :param pattern: A pattern as passed to Node.resolve_loose, e.g. a reference qualifier, or a qualifier.
+    :return: The qualifier equivalent to the pattern. Equal qualifiers resolve to the same nodes.
+    """
+    return tuple(e if e is None or isinstance(e, QualifierElement) else QualifierElement.of(e) for e in pattern)
+
+
+def qualifier_pattern(qualifier: Qualifier) -> List[Optional[Node]]:
+    """
+    :param qualifier: A qualifier.
+    :return: A pattern of new nodes that can be passed to Node.resolve_loose.
+    """
+    return [None if e is None else e.to_node() for e in qualifier]
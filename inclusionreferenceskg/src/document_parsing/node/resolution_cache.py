@@ -0,0 +1,90 @@
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Tuple, Union
+
+from document_parsing.node.lazy_root import LazyRoot
+from document_parsing.node.node import Node
+from document_parsing.node.node_index import NodeIndex
+from document_parsing.node.qualifier import Qualifier, QualifierElement, qualifier_key, qualifier_pattern
+
+
+@dataclass
+class ResolutionStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    invalidations: int = 0
+
+
+class ResolutionCache:
+    """
+    Resolves reference qualifiers against a tree and remembers the results of the most recently used qualifiers.
+
+    Documents cite the same provisions over and over again. Qualifiers are keyed by qualifier_key, so equal qualifiers
+    built from different pattern nodes share an entry. Misses are resolved with a NodeIndex, except for a LazyRoot, as
+    indexing it would parse every document. Once the tree changes, all entries and the index are dropped.
+
+    Changes are only noticed if they are made with Node.add_child or followed by Node.touch. After changing children,
+    numbers or titles directly, e.g. with node.children.append, the cache serves the old matches. A cache is therefore
+    kept for one run over an unchanged tree, e.g. one pipeline run of create_graph, and not shared beyond it.
+    """
+
+    def __init__(self, root: Node, max_size: int = 4096):
+        """
+        :param root: The root of the tree, e.g. the reference base.
+        :param max_size: The maximal number of qualifiers whose results are kept.
+        """
+        self.root = root
+        self.max_size = max_size
+        self.stats = ResolutionStats()
+        self.structure_version = root.structure_version
+        self._index = self._create_index()
+        self._entries: "OrderedDict[Tuple[Qualifier, Optional[int]], Tuple[Node, ...]]" = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def resolve(self, pattern: Union[Sequence[Optional[Node]], Qualifier], limit: Optional[int] = None) -> List[Node]:
+        """
+        Returns the same nodes as root.resolve_loose(pattern, limit=limit).
+
+        :param pattern: A pattern of nodes or a qualifier.
+        :param limit: If given, the search stops after this many matches.
+        :return: A list of potential matches in pre order.
+        """
+        if self.root.structure_version != self.structure_version:
+            self.invalidate()
+
+        qualifier = qualifier_key(pattern)
+        key = (qualifier, limit)
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self.stats.hits += 1
+            return list(entry)
+
+        self.stats.misses += 1
+        if any(isinstance(e, QualifierElement) for e in pattern):
+            pattern = qualifier_pattern(qualifier)
+        matches = (self._index or self.root).resolve_loose(list(pattern), limit=limit)
+        if self._index is None:
+            # Documents loaded by the resolution resolve as before, so the entries stay valid.
+            self.structure_version = self.root.structure_version
+        self._entries[key] = tuple(matches)
+        if len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.stats.evictions += 1
+
+        return matches
+
+    def invalidate(self):
+        """
+        Drops all entries and re-indexes the tree.
+        """
+        self._entries.clear()
+        self.structure_version = self.root.structure_version
+        self._index = self._create_index()
+        self.stats.invalidations += 1
+
+    def _create_index(self) -> Optional[NodeIndex]:
+        return None if isinstance(self.root, LazyRoot) else NodeIndex(self.root)
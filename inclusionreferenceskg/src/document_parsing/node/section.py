@@ -22,6 +22,10 @@ class Section(Node):
         section = Section(number=number)
         return True, section
 
+    @classmethod
+    def block_pattern(cls) -> Optional[re.Pattern]:
+        return Section._pattern
+
     def finalize(self):
         self.title = self.content.strip()
         self.content = ""
@@ -16,9 +16,7 @@ class Subparagraph(Node):
         return False, None
 
     def finalize(self):
-        for i, sibling in enumerate(self.parent.children, 1):
-            if self.id == sibling.id:
-                self.number = i
-                break
-        else:
+        try:
+            self.number = self.parent.children.index(self) + 1
+        except ValueError:
             logging.warning(f"Could not find self in children of parent. For subparagraph {self.immutable_view()}.")
@@ -22,6 +22,10 @@ class Title(Node):
         paragraph = Title(number=number)
         return True, paragraph
 
+    @classmethod
+    def block_pattern(cls) -> typing.Optional[re.Pattern]:
+        return Title._pattern
+
     def finalize(self):
         if self.content.strip():
             split_content = [l.strip() for l in self.content.split("\n") if l.strip()]
@@ -0,0 +1,147 @@
+import importlib
+import json
+import mmap
+import struct
+import sys
+import uuid
+from array import array
+from typing import Dict, List, Tuple, Union
+
+from document_parsing.node.compact_tree import CompactTree
+from document_parsing.node.node import Node
+
+MAGIC = b"IRKGTREE"
+# Bump whenever the layout written by save_tree changes.
+FORMAT_VERSION = 1
+
+# (version, length of the metadata)
+_HEADER = struct.Struct("<II")
+_ALIGNMENT = 8
+
+
+def save_tree(root: Union[Node, CompactTree], path: str, keep_ids: bool = True):
+    """
+    Writes a tree, e.g. a Document or the Root of a corpus, to a file that load_tree maps into memory.
+
+    The file holds the arrays of a CompactTree: a node table (type code, number, parent, first child and next sibling
+    per node in pre order), the concatenated contents with their offsets and the ids. The node types and the titles are
+    kept in a JSON string table after the header. Sections are aligned, so that they can be used in place.
+
+    :param root: The root of the tree or a CompactTree of it.
+    :param path: The file to write.
+    :param keep_ids: If True, the ids of the nodes are stored. Otherwise, loaded nodes get ids derived from their
+                     position. Ignored if a CompactTree is given.
+    """
+    tree = root if isinstance(root, CompactTree) else CompactTree(root, keep_ids=keep_ids)
+
+    sections: List[Tuple[str, str, bytes]] = [
+        ("type_codes", "B", tree.type_codes.tobytes()),
+        ("parents", "i", tree.parents.tobytes()),
+        ("first_children", "i", tree.first_children.tobytes()),
+        ("next_siblings", "i", tree.next_siblings.tobytes()),
+        ("content_offsets", "q", tree.content_offsets.tobytes()),
+        ("content", "B", bytes(tree.content)),
+    ]
+
+    metadata = {
+        "byteorder": sys.byteorder,
+        "types": [f"{t.__module__}:{t.__qualname__}" for t in tree.types],
+        "titles": sorted(tree.titles.items()),
+        "none_contents": sorted(tree.none_contents),
+        "numbers": None,
+        "ids": None,
+    }
+    if isinstance(tree.numbers, array):
+        sections.append(("numbers", "q", tree.numbers.tobytes()))
+    else:
+        metadata["numbers"] = tree.numbers
+    if isinstance(tree.ids, (bytes, memoryview)):
+        sections.append(("ids", "B", bytes(tree.ids)))
+        metadata["ids"] = "uuid"
+    elif tree.ids is not None:
+        metadata["ids"] = tree.ids
+
+    # The offsets of the sections depend on the length of the metadata, which lists them. The sections are therefore
+    # placed relative to the aligned end of the metadata.
+    offset = 0
+    layout = []
+    for name, typecode, data in sections:
+        layout.append((name, typecode, offset, len(data)))
+        offset = _aligned(offset + len(data))
+    metadata["sections"] = layout
+
+    try:
+        encoded = json.dumps(metadata, ensure_ascii=False).encode("utf-8")
+    except TypeError as e:
+        raise ValueError(f"The tree cannot be saved: {e}") from e
+
+    with open(path, "wb") as f:
+        f.write(MAGIC)
+        f.write(_HEADER.pack(FORMAT_VERSION, len(encoded)))
+        f.write(encoded)
+        f.write(bytes(_aligned(f.tell()) - f.tell()))
+        for name, typecode, data in sections:
+            f.write(data)
+            f.write(bytes(_aligned(len(data)) - len(data)))
+
+
+def load_tree(path: str) -> CompactTree:
+    """
+    Maps a file written by save_tree into memory.
+
+    The arrays of the returned tree are views of the file, so loading does not depend on the size of the tree. Nodes
+    are accessed as CompactNode views, which may be turned into Node objects with CompactNode.to_node.
+
+    :param path: The file to read.
+    :return: The tree.
+    """
+    with open(path, "rb") as f:
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    view = memoryview(buffer)
+    if view[:len(MAGIC)] != MAGIC:
+        raise ValueError(f"{path} is not a tree file.")
+    version, metadata_length = _HEADER.unpack_from(view, len(MAGIC))
+    if version != FORMAT_VERSION:
+        raise ValueError(f"Unsupported tree file format {version}.")
+
+    metadata_start = len(MAGIC) + _HEADER.size
+    metadata = json.loads(str(view[metadata_start:metadata_start + metadata_length], "utf-8"))
+    sections_start = _aligned(metadata_start + metadata_length)
+
+    arrays: Dict[str, Union[memoryview, array]] = dict()
+    for name, typecode, offset, length in metadata["sections"]:
+        data = view[sections_start + offset:sections_start + offset + length]
+        if metadata["byteorder"] != sys.byteorder and typecode != "B":
+            # Copied, as the file has to be read in the other byte order.
+            arrays[name] = array(typecode, data.tobytes())
+            arrays[name].byteswap()
+        else:
+            arrays[name] = data.cast(typecode)
+
+    types = []
+    for name in metadata["types"]:
+        module, qualname = name.split(":")
+        types.append(getattr(importlib.import_module(module), qualname))
+
+    # The tree is assembled from the stored arrays instead of being built from nodes.
+    tree = CompactTree.__new__(CompactTree)
+    tree.types = types
+    tree.type_codes = arrays["type_codes"]
+    tree.parents = arrays["parents"]
+    tree.first_children = arrays["first_children"]
+    tree.next_siblings = arrays["next_siblings"]
+    tree.content_offsets = arrays["content_offsets"]
+    tree.content = arrays["content"]
+    tree.numbers = arrays["numbers"] if metadata["numbers"] is None else metadata["numbers"]
+    tree.titles = {index: title for index, title in metadata["titles"]}
+    tree.none_contents = frozenset(metadata["none_contents"])
+    tree.ids = arrays["ids"] if metadata["ids"] == "uuid" else metadata["ids"]
+    tree.id_prefix = str(uuid.uuid4()) + "/"
+    # Keeps the file mapped for as long as the tree is used.
+    tree.buffer = buffer
+    return tree
+
+
+def _aligned(offset: int) -> int:
+    return (offset + _ALIGNMENT - 1) // _ALIGNMENT * _ALIGNMENT
@@ -0,0 +1,152 @@
+from typing import Dict, List, Optional, Type, Union
+
+from document_parsing.node.node import Node
+
+
+class TreeIntervals:
+    """
+    Labels the nodes of a tree with intervals for answering ancestry queries without walking the tree.
+
+    Nodes are numbered in pre order. The subtree of the node at position p occupies the positions p to ends[p] - 1,
+    so whether a node is a descendant of another is decided by comparing two numbers, and the descendants of a node
+    are a slice of nodes. Per node, the position of its parent and its level in the tree are kept as well. The tree must
+    not be changed while the labels are in use, see Node.touch.
+
+    Subtrees that have not been loaded yet (see Node.loaded_children) are not loaded, unless load is set. Loading them
+    later marks the tree as changed.
+    """
+
+    def __init__(self, root: Node, load: bool = False):
+        """
+        :param root: The root of the tree to label.
+        :param load: Whether to load subtrees that are created on demand.
+        """
+        self.root = root
+        self.nodes: List[Node] = []
+        self.parents: List[int] = []
+        self.ends: List[int] = []
+        self.levels: List[int] = []
+        self._positions: Dict[Node, int] = dict()
+        # Per node depth d, the position of the nearest ancestor-or-self of every node whose depth is at most d.
+        self._ancestor_tables: Dict[int, List[int]] = dict()
+
+        dfs_stack = [(root, -1, False)]
+        while dfs_stack:
+            node, parent, leaving = dfs_stack.pop()
+            if leaving:
+                self.ends[self._positions[node]] = len(self.nodes)
+                continue
+
+            position = len(self.nodes)
+            self.nodes.append(node)
+            self.parents.append(parent)
+            self.ends.append(position + 1)
+            self.levels.append(0 if parent < 0 else self.levels[parent] + 1)
+            self._positions[node] = position
+
+            dfs_stack.append((node, parent, True))
+            children = node.children if load else node.loaded_children()
+            dfs_stack.extend((child, position, False) for child in reversed(children))
+
+        # Recorded after the walk, as loading subtrees marks the tree as changed.
+        self.structure_version = root.structure_version
+
+    @classmethod
+    def containing(cls, node: Node):
+        """
+        Labels the tree a node belongs to. The labels are not reused by later calls, so callers keep them for as long as
+        the tree is unchanged, e.g. for one run of a linker.
+
+        :param node: A node of a tree.
+        :return: The labels of the root of the tree the node belongs to.
+        """
+        root = node
+        while root.parent is not None:
+            root = root.parent
+        return cls(root)
+
+    def is_stale(self) -> bool:
+        """
+        :return: True if the tree has been changed since the labels were created.
+        """
+        return self.root.structure_version != self.structure_version
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def __contains__(self, node: Node):
+        return node in self._positions
+
+    def position(self, node: Node) -> int:
+        """
+        :param node: A node of the tree.
+        :return: The index of the node in pre order.
+        """
+        if node not in self:
+            raise KeyError(f"{node.immutable_view()} is not part of the tree.")
+        return self._positions[node]
+
+    def is_descendant(self, node: Node, ancestor: Node) -> bool:
+        """
+        :return: True if node is a proper descendant of ancestor.
+        """
+        a, n = self.position(ancestor), self.position(node)
+        return a < n < self.ends[a]
+
+    def is_ancestor(self, ancestor: Node, node: Node) -> bool:
+        """
+        :return: True if ancestor is a proper ancestor of node.
+        """
+        return self.is_descendant(node, ancestor)
+
+    def descendants_range(self, node: Node) -> range:
+        """
+        :param node: A node of the tree.
+        :return: The positions of the node and its descendants.
+        """
+        position = self.position(node)
+        return range(position, self.ends[position])
+
+    def descendants(self, node: Node) -> List[Node]:
+        """
+        :param node: A node of the tree.
+        :return: The node and its descendants in pre order.
+        """
+        position = self.position(node)
+        return self.nodes[position:self.ends[position]]
+
+    def ancestors(self, node: Node) -> List[Node]:
+        """
+        :param node: A node of the tree.
+        :return: The ancestors of the node, starting with its parent.
+        """
+        ancestors = []
+        position = self.parents[self.position(node)]
+        while position >= 0:
+            ancestors.append(self.nodes[position])
+            position = self.parents[position]
+        return ancestors
+
+    def ancestor_at_depth(self, node: Node, depth: Union[int, Type[Node]]) -> Optional[Node]:
+        """
+        Finds the node a node belongs to on a certain level of the document structure, e.g. the paragraph containing a
+        point with ancestor_at_depth(point, Paragraph).
+
+        :param node: A node of the tree.
+        :param depth: A node depth or a node type whose depth is used.
+        :return: The nearest ancestor-or-self of the node whose depth is at most the given one or None if there is none.
+        """
+        if not isinstance(depth, int):
+            depth = depth.depth
+
+        table = self._ancestor_tables.get(depth)
+        if table is None:
+            # Parents precede their children in pre order.
+            table = []
+            for position, node_ in enumerate(self.nodes):
+                parent = self.parents[position]
+                table.append(position if node_.depth <= depth else table[parent] if parent >= 0 else -1)
+            self._ancestor_tables[depth] = table
+
+        position = table[self.position(node)]
+        return self.nodes[position] if position >= 0 else None
@@ -0,0 +1,235 @@
+import hashlib
+import importlib
+import os
+import pickle
+import zlib
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple, Type
+
+from document_parsing.node.document import Document
+from document_parsing.node.node import Node
+
+# Bump whenever the encoding produced by ParseCache._encode changes.
+FORMAT_VERSION = 1
+
+# (type index, number of children, number, title, content) per node in pre order.
+_EncodedNode = Tuple[int, int, Optional[int], Optional[str], Optional[str]]
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    writes: int = 0
+    evictions: int = 0
+
+
+class ParseCache:
+    """
+    Persistent cache of parsed document trees.
+
+    Entries are addressed by the hash of the source text and the parser configuration (node patterns and
+    preprocessors), so changing either results in a miss instead of a stale tree. Trees are stored as a flat,
+    compressed list of nodes in pre order. Ids are not stored: Every loaded tree gets fresh ids, just like a freshly
+    parsed one. Once the cache grows beyond max_bytes, the least recently used entries are evicted.
+    """
+
+    suffix = ".tree"
+
+    def __init__(self, directory: str = "./output/cache/documents", max_bytes: Optional[int] = 256 * 1024 * 1024):
+        """
+        :param directory: The directory in which the entries are stored. It is created if necessary.
+        :param max_bytes: The maximal size of all entries together. None disables eviction.
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.stats = CacheStats()
+
+    @staticmethod
+    def key(text: str, node_patterns: Iterable[Type[Node]], preprocessors: Iterable[type]) -> str:
+        """
+        Computes the key of a document.
+
+        :param text: The source text of the document.
+        :param node_patterns: The node patterns of the parser.
+        :param preprocessors: The preprocessors of the parser.
+        :return: The key.
+        """
+        h = hashlib.sha256()
+        h.update(f"v{FORMAT_VERSION}\n".encode("utf-8"))
+        for node_pattern in node_patterns:
+            h.update(ParseCache._qualified_name(node_pattern).encode("utf-8"))
+            pattern = node_pattern.block_pattern()
+            if pattern is not None:
+                h.update(f"/{pattern.pattern}/{pattern.flags}".encode("utf-8"))
+            h.update(b"\n")
+        h.update(b"\0")
+        for preprocessor in preprocessors:
+            h.update(ParseCache._qualified_name(preprocessor).encode("utf-8") + b"\n")
+        h.update(b"\0")
+        h.update(text.encode("utf-8"))
+
+        return h.hexdigest()
+
+    def get(self, key: str, title: Optional[str] = None) -> Optional[Document]:
+        """
+        Loads a document tree.
+
+        :param key: The key of the document.
+        :param title: The title given to the loaded document. If None, the stored title is kept.
+        :return: The document or None if it is not cached.
+        """
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            document = self._decode(data)
+        except (OSError, EOFError, zlib.error, pickle.UnpicklingError, ValueError, ImportError, AttributeError):
+            # Missing, partially written or outdated entries are treated as misses.
+            self.stats.misses += 1
+            return None
+
+        # Mark the entry as recently used for eviction.
+        os.utime(path)
+        self.stats.hits += 1
+        if title is not None:
+            document.title = title
+        return document
+
+    def put(self, key: str, document: Document):
+        """
+        Stores a document tree.
+
+        :param key: The key of the document.
+        :param document: The root of the tree.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(self._encode(document))
+        os.replace(tmp_path, path)
+        self.stats.writes += 1
+
+        self._evict()
+
+    def invalidate(self, key: str) -> bool:
+        """
+        Removes an entry.
+
+        :param key: The key of the document.
+        :return: True if an entry was removed.
+        """
+        try:
+            os.remove(self._path(key))
+            return True
+        except FileNotFoundError:
+            return False
+
+    def clear(self):
+        """
+        Removes all entries.
+        """
+        for path, _, _ in self._entries():
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def size(self) -> int:
+        """
+        :return: The size of all entries in bytes.
+        """
+        return sum(size for _, size, _ in self._entries())
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key + self.suffix)
+
+    def _entries(self) -> List[Tuple[str, int, int]]:
+        """
+        :return: (path, size, modification time) of all entries.
+        """
+        if not os.path.isdir(self.directory):
+            return []
+
+        entries = []
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if entry.is_file() and entry.name.endswith(self.suffix):
+                    stat = entry.stat()
+                    entries.append((entry.path, stat.st_size, stat.st_mtime_ns))
+
+        return entries
+
+    def _evict(self):
+        if self.max_bytes is None:
+            return
+
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+
+        # Oldest first
+        for path, size, _ in sorted(entries, key=lambda e: e[2]):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                continue
+            total -= size
+            self.stats.evictions += 1
+
+    @staticmethod
+    def _qualified_name(cls: type) -> str:
+        return f"{cls.__module__}:{cls.__qualname__}"
+
+    @staticmethod
+    def _encode(document: Document) -> bytes:
+        type_indices: Dict[type, int] = dict()
+        nodes: List[_EncodedNode] = []
+
+        # Pre order. node_traversal is not used as it would import spacy into the parser.
+        dfs_stack = [document]
+        while dfs_stack:
+            node = dfs_stack.pop()
+            dfs_stack.extend(node.children[::-1])
+            type_index = type_indices.setdefault(node.__class__, len(type_indices))
+            nodes.append((type_index, len(node.children), node.number, node.title, node.content))
+
+        types = [ParseCache._qualified_name(t) for t in type_indices]
+        return zlib.compress(pickle.dumps((FORMAT_VERSION, types, nodes), protocol=pickle.HIGHEST_PROTOCOL))
+
+    @staticmethod
+    def _decode(data: bytes) -> Document:
+        version, type_names, nodes = pickle.loads(zlib.decompress(data))
+        if version != FORMAT_VERSION:
+            raise ValueError(f"Unsupported cache format {version}.")
+
+        types = []
+        for name in type_names:
+            module, qualname = name.split(":")
+            types.append(getattr(importlib.import_module(module), qualname))
+
+        # Parents that still expect children together with the number of children missing.
+        stack: List[List] = []
+        root = None
+        for type_index, child_count, number, title, content in nodes:
+            node = types[type_index](number=number, title=title, content=content)
+            if stack:
+                parent = stack[-1]
+                node.parent = parent[0]
+                parent[0].children.append(node)
+                parent[1] -= 1
+                if parent[1] == 0:
+                    stack.pop()
+            else:
+                root = node
+
+            if child_count:
+                stack.append([node, child_count])
+
+        if not isinstance(root, Document):
+            raise ValueError("Cache entry does not contain a document.")
+
+        return root
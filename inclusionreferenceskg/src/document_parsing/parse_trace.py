@@ -0,0 +1,60 @@
+import hashlib
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple, Type
+
+from document_parsing.node.node import Node
+
+
+def block_digest(block: str) -> bytes:
+    return hashlib.blake2b(block.encode("utf-8"), digest_size=16).digest()
+
+
+@dataclass
+class TraceStep:
+    """
+    A node created from a block, together with the state it was created in.
+    """
+    node: Node
+    number: Optional[int]
+    title: Optional[str]
+    # None if the initial content was the block itself, which is not stored again.
+    content: Optional[str]
+
+
+@dataclass
+class BlockTrace:
+    """
+    How a block was added to the tree.
+    """
+    digest: bytes
+    # The type of the active node when the block was read. Whether a node pattern accepts a block may depend on it.
+    context: Type[Node]
+    # The nodes created from the block, in order. If no node pattern consumed the block, it was added as content to the
+    # last of these nodes or, if there are none, to the active node.
+    steps: Tuple[TraceStep, ...]
+
+
+@dataclass
+class ParseTrace:
+    """
+    Records how a document was parsed so that DocumentTreeParser.reparse can update it incrementally.
+    """
+    # Identifies the node patterns and preprocessors the document was parsed with.
+    configuration: str
+    blocks: List[BlockTrace] = field(default_factory=list)
+
+
+@dataclass
+class ReparseResult:
+    """
+    The outcome of DocumentTreeParser.reparse.
+    """
+    document: Node
+    # The topmost nodes that are new or whose number, title, content or children changed. Their subtrees need to be
+    # processed again.
+    changed: List[Node] = field(default_factory=list)
+    # The topmost nodes that are no longer part of the document.
+    removed: List[Node] = field(default_factory=list)
+    # The number of blocks that were classified again and that were replayed from the trace respectively.
+    classified_blocks: int = 0
+    replayed_blocks: int = 0
@@ -1,14 +1,48 @@
 import typing
 from abc import ABC, abstractmethod
 
+from document_parsing.preprocessing.preprocessing_pipeline import BarrierStage, PreprocessingPipeline, \
+    PreprocessingStage
+
 
 class BlockPreprocessor(ABC):
     """
     ABC for processing a list of text blocks which are subsequently parsed.
     Used mostly for filtering undesirable blocks.
+
+    Preprocessors are run by a PreprocessingPipeline, in which each preprocessor takes part through the stage returned
+    by stage. Preprocessors only implementing process still work but hold back all blocks until the end.
     """
 
     @staticmethod
     @abstractmethod
     def process(blocks: typing.List[str]) -> typing.List[str]:
         raise NotImplementedError()
+
+    @classmethod
+    def stage(cls, streaming: bool = False) -> PreprocessingStage:
+        """
+        Creates the stage of this preprocessor for a run of a PreprocessingPipeline. The default stage collects all
+        blocks and hands them to process.
+
+        Preprocessors that handle each block on its own should return a MapStage, which is fused with neighbouring map
+        stages. Others should use a stage holding back as few blocks as possible.
+
+        :param streaming: If True, the stage should keep memory usage independent of the number of blocks, even if its
+                          output may then differ from that of process.
+        :return: A new stage.
+        """
+        return BarrierStage(cls.process)
+
+    @classmethod
+    def process_stream(cls, blocks: typing.Iterable[str]) -> typing.Iterator[str]:
+        """
+        Processes blocks as they arrive using the streaming stage of this preprocessor.
+
+        Preprocessors may override this to stream in their own way, e.g. with a generator. A streaming
+        PreprocessingPipeline, as used by DocumentTreeParser.parse_stream, then calls the override instead of stage.
+
+        :param blocks: The incoming blocks.
+        :return: The processed blocks.
+        """
+        return PreprocessingPipeline([cls], streaming=True).run(blocks)
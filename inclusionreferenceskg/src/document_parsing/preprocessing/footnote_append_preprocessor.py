@@ -1,8 +1,11 @@
+import logging
 import re
 import typing
+from collections import deque
 
 from document_parsing.preprocessing.block_preprocessor import \
     BlockPreprocessor
+from document_parsing.preprocessing.preprocessing_pipeline import PreprocessingPipeline, PreprocessingStage
 
 
 class FootnoteAppendPreprocessor(BlockPreprocessor):
@@ -10,29 +13,81 @@ class FootnoteAppendPreprocessor(BlockPreprocessor):
     Class to resolve footnotes in a EU regulation text body.
 
     Detected footnotes are extracted and placed at the end of the block in which the reference to the footnote was made.
+    If several blocks refer to a footnote, the last one preceding the footnote is used.
+
+    When streaming, only the last stream_lookback blocks are searched for the reference to a footnote. A footnote whose
+    reference is further back stays in the text and a warning is logged. The bundled documents need at most 474 blocks.
     """
 
+    stream_lookback: typing.ClassVar[int] = 1024
+
+    footnote_start_pattern: typing.ClassVar[re.Pattern] = re.compile(r"\(([1-9][0-9]*)\)")
+    # A number in parentheses which is not part of a reference (paragraph), i.e. r"(?<!and|..,) \(([1-9][0-9]*)\)". The
+    # lookbehind is checked after the literal " (" so that the pattern can be searched for quickly.
+    footnote_reference_pattern: typing.ClassVar[re.Pattern] = re.compile(r" \((?<!and \(|.., \()([1-9][0-9]*)\)")
+
     @staticmethod
     def process(blocks: typing.List[str]):
+        return PreprocessingPipeline([FootnoteAppendPreprocessor]).process(blocks)
+
+    @classmethod
+    def stage(cls, streaming: bool = False) -> PreprocessingStage:
+        return FootnoteAppendStage(cls.stream_lookback if streaming else None)
+
+
+class FootnoteAppendStage(PreprocessingStage):
+    """
+    Moves the footnotes in a single forward scan. Blocks are held back for as long as footnotes may be appended to them.
+    """
+
+    def __init__(self, lookback: typing.Optional[int]):
+        """
+        :param lookback: The number of blocks that are held back for footnotes to be appended to. None keeps all blocks
+                         until the end.
+        """
+        self.lookback = lookback
+
+        # The blocks that have not been passed on yet. The block with the absolute index i is at window[i - emitted].
+        self.window: typing.Deque[str] = deque()
+        self.emitted = 0
+
+        # Maps a footnote number to the index of the last block referring to it.
+        self.last_reference: typing.Dict[str, int] = dict()
+
+    def push(self, block: str) -> typing.Iterable[str]:
+        window = self.window
+
+        match = FootnoteAppendPreprocessor.footnote_start_pattern.match(block)
+        target = self.last_reference.get(match.group(1), -1) if match else -1
+
+        if 0 <= target < self.emitted:
+            logging.warning(f"Footnote {match.group(0)} is more than {self.lookback} blocks after its reference and is "
+                            f"kept in the text.")
 
-        visited = []
+        if target >= self.emitted:
+            appended_at = len(window[target - self.emitted])
+            window[target - self.emitted] += " " + block
+            # The footnote may refer to other footnotes. The lookbehind still sees the text before appended_at.
+            self._index_references(target, window[target - self.emitted], appended_at)
+        else:
+            self._index_references(self.emitted + len(window), block)
+            window.append(block)
 
-        footnote_start_pattern = re.compile(r"\(([1-9][0-9]*)\)")
+        if self.lookback is None or len(window) <= self.lookback:
+            return ()
 
-        for block in blocks:
-            match = footnote_start_pattern.match(block)
-            if match:
-                # We look for a number in parentheses which is not part of a reference (paragraph):
-                footnote_reference_pattern = r"(?<!and|..,) \(" + match.group(1) + r"\)"
+        ready = []
+        while len(window) > self.lookback:
+            ready.append(window.popleft())
+            self.emitted += 1
+        return ready
 
-                # Look back over the visited blocks.
-                for i, visited_block in enumerate(visited):
-                    if re.search(footnote_reference_pattern, visited_block):
-                        visited[i] += " " + block
-                        break
-                else:
-                    visited.insert(0, block)
-            else:
-                visited.insert(0, block)
+    def flush(self) -> typing.Iterable[str]:
+        ready, self.window = list(self.window), deque()
+        self.emitted += len(ready)
+        return ready
 
-        return reversed(visited)
+    def _index_references(self, index: int, text: str, pos: int = 0):
+        last_reference = self.last_reference
+        for match in FootnoteAppendPreprocessor.footnote_reference_pattern.finditer(text, pos):
+            last_reference[match.group(1)] = max(last_reference.get(match.group(1), -1), index)
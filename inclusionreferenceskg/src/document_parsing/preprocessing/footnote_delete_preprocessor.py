@@ -1,8 +1,10 @@
+import logging
 import re
 import typing
 
 from document_parsing.preprocessing.block_preprocessor import \
     BlockPreprocessor
+from document_parsing.preprocessing.preprocessing_pipeline import PreprocessingPipeline, PreprocessingStage
 
 
 class FootnoteDeletePreprocessor(BlockPreprocessor):
@@ -10,29 +12,56 @@ class FootnoteDeletePreprocessor(BlockPreprocessor):
     Class to resolve footnotes in a EU regulation text body.
 
     Detected footnotes are deleted.
+
+    When streaming, only the last stream_lookback blocks are searched for the reference to a footnote. A footnote whose
+    reference is further back is kept and a warning is logged.
     """
 
+    stream_lookback: typing.ClassVar[int] = 1024
+
+    footnote_start_pattern: typing.ClassVar[re.Pattern] = re.compile(r"\(([1-9][0-9]*)\)")
+    # A number in parentheses which is not part of a reference (paragraph), i.e. r"(?<!and|..,) \(([1-9][0-9]*)\)". The
+    # lookbehind is checked after the literal " (" so that the pattern can be searched for quickly.
+    footnote_reference_pattern: typing.ClassVar[re.Pattern] = re.compile(r" \((?<!and \(|.., \()([1-9][0-9]*)\)")
+
     @staticmethod
     def process(blocks: typing.List[str]):
+        return PreprocessingPipeline([FootnoteDeletePreprocessor]).process(blocks)
+
+    @classmethod
+    def stage(cls, streaming: bool = False) -> PreprocessingStage:
+        return FootnoteDeleteStage(cls.stream_lookback if streaming else None)
+
+
+class FootnoteDeleteStage(PreprocessingStage):
+    """
+    Deletes the footnotes in a single forward scan. No blocks are held back.
+    """
 
-        visited = []
+    def __init__(self, lookback: typing.Optional[int]):
+        """
+        :param lookback: The number of preceding blocks in which a reference to a footnote is searched. None searches
+                         all preceding blocks.
+        """
+        self.lookback = lookback
 
-        footnote_start_pattern = re.compile(r"\(([1-9][0-9]*)\)")
+        # Maps a footnote number to the index of the last block referring to it.
+        self.last_reference: typing.Dict[str, int] = dict()
+        self.index = 0
 
-        for block in blocks:
-            match = footnote_start_pattern.match(block)
-            if match:
-                # We look for a number in parentheses which is not part of a reference (paragraph):
-                footnote_reference_pattern = r"(?<!and|..,) \(" + match.group(1) + r"\)"
+    def push(self, block: str) -> typing.Iterable[str]:
+        match = FootnoteDeletePreprocessor.footnote_start_pattern.match(block)
+        if match:
+            last = self.last_reference.get(match.group(1))
+            if last is not None and (self.lookback is None or self.index - last <= self.lookback):
+                # Only delete if we have found a reference to this footnote somewhere.
+                return ()
+            if last is not None:
+                logging.warning(f"Footnote {match.group(0)} is more than {self.lookback} blocks after its reference "
+                                f"and is kept.")
 
-                # Look back over the visited blocks.
-                for visited_block in visited:
-                    if re.search(footnote_reference_pattern, visited_block):
-                        # Only delete if we have found a reference to this footnote somewhere.
-                        break
-                else:
-                    visited.insert(0, block)
-            else:
-                visited.insert(0, block)
+        for reference in FootnoteDeletePreprocessor.footnote_reference_pattern.finditer(block):
+            self.last_reference[reference.group(1)] = self.index
+        self.index += 1
 
-        return reversed(visited)
+        return block,
@@ -3,6 +3,8 @@ import typing
 
 from document_parsing.preprocessing.block_preprocessor import \
     BlockPreprocessor
+from document_parsing.preprocessing.preprocessing_pipeline import MapStage, PreprocessingPipeline, \
+    PreprocessingStage
 
 
 class HeaderPreprocessor(BlockPreprocessor):
@@ -13,4 +15,12 @@ class HeaderPreprocessor(BlockPreprocessor):
 
     @staticmethod
     def process(blocks: typing.List[str]):
-        return [block for block in blocks if not HeaderPreprocessor.date_pattern.match(block)]
+        return PreprocessingPipeline([HeaderPreprocessor]).process(blocks)
+
+    @classmethod
+    def stage(cls, streaming: bool = False) -> PreprocessingStage:
+        return MapStage(HeaderPreprocessor._filter_block)
+
+    @staticmethod
+    def _filter_block(block: str) -> typing.Optional[str]:
+        return None if HeaderPreprocessor.date_pattern.match(block) else block
@@ -2,6 +2,8 @@ import re
 import typing
 
 from document_parsing.preprocessing.block_preprocessor import BlockPreprocessor
+from document_parsing.preprocessing.preprocessing_pipeline import MapStage, PreprocessingPipeline, \
+    PreprocessingStage
 from util.regex_util import RegexUtil
 
 
@@ -15,11 +17,18 @@ class InitialSpacePreprocessor(BlockPreprocessor):
     1. This paragraph
     """
 
+    numbering_pattern: typing.ClassVar[re.Pattern] = re.compile(fr"^(?:{RegexUtil.number}\.|{RegexUtil.paragraph})\S")
+
     @staticmethod
     def process(blocks: typing.List[str]) -> typing.List[str]:
-        def map_block(block):
-            if match := re.match(fr"^(?:{RegexUtil.number}\.|{RegexUtil.paragraph})\S", block):
-                return block[:match.end() - 1] + " " + block[match.end() - 1:]
-            return block
+        return PreprocessingPipeline([InitialSpacePreprocessor]).process(blocks)
+
+    @classmethod
+    def stage(cls, streaming: bool = False) -> PreprocessingStage:
+        return MapStage(InitialSpacePreprocessor._map_block)
 
-        return [map_block(block) for block in blocks]
+    @staticmethod
+    def _map_block(block: str) -> str:
+        if match := InitialSpacePreprocessor.numbering_pattern.match(block):
+            return block[:match.end() - 1] + " " + block[match.end() - 1:]
+        return block
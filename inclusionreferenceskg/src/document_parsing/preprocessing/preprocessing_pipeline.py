@@ -0,0 +1,152 @@
+import typing
+from abc import ABC, abstractmethod
+from typing import Callable, Iterable, Iterator, List, Optional, Sequence, Type
+
+if typing.TYPE_CHECKING:
+    from document_parsing.preprocessing.block_preprocessor import BlockPreprocessor
+
+
+class PreprocessingStage(ABC):
+    """
+    The part a preprocessor plays in a PreprocessingPipeline. Blocks are pushed into the stage one at a time and the
+    stage returns the blocks it passes on. Stages are stateful and used for a single run.
+    """
+
+    @abstractmethod
+    def push(self, block: str) -> Iterable[str]:
+        """
+        :param block: The next block.
+        :return: The blocks that are ready to be passed on, in order.
+        """
+        raise NotImplementedError()
+
+    def flush(self) -> Iterable[str]:
+        """
+        Called after the last block.
+
+        :return: The blocks that have been held back.
+        """
+        return ()
+
+
+class MapStage(PreprocessingStage):
+    """
+    Maps every block on its own. A function may drop a block by returning None. Consecutive map stages are fused into
+    one.
+    """
+
+    def __init__(self, *functions: Callable[[str], Optional[str]]):
+        self.functions = list(functions)
+
+    def push(self, block: str) -> Iterable[str]:
+        for function in self.functions:
+            block = function(block)
+            if block is None:
+                return ()
+
+        return block,
+
+    def fuse(self, other: "MapStage") -> "MapStage":
+        return MapStage(*self.functions, *other.functions)
+
+
+class BarrierStage(PreprocessingStage):
+    """
+    Collects all blocks and processes them at once, e.g. using BlockPreprocessor.process.
+    """
+
+    def __init__(self, process: Callable[[List[str]], Iterable[str]]):
+        self.process = process
+        self.blocks: List[str] = []
+
+    def push(self, block: str) -> Iterable[str]:
+        self.blocks.append(block)
+        return ()
+
+    def flush(self) -> Iterable[str]:
+        blocks, self.blocks = self.blocks, []
+        return self.process(blocks)
+
+
+class PreprocessingPipeline:
+    """
+    Applies a list of preprocessors in a single pass over the blocks.
+
+    Every preprocessor contributes a stage (see BlockPreprocessor.stage) and each block is passed through all stages
+    before the next block is read. Apart from what the stages hold back themselves, e.g. the window of the footnote
+    preprocessors, no list of all blocks is created. When streaming, preprocessors overriding
+    BlockPreprocessor.process_stream are run through it instead, between the stages of the others.
+    """
+
+    def __init__(self, preprocessors: Sequence[Type["BlockPreprocessor"]], streaming: bool = False):
+        """
+        :param preprocessors: The preprocessors in the order they are applied.
+        :param streaming: Passed on to BlockPreprocessor.stage. If True, stages hold back as few blocks as possible, at
+                          the expense of their output possibly differing from process.
+        """
+        self.preprocessors = list(preprocessors)
+        self.streaming = streaming
+
+    def stages(self) -> List[PreprocessingStage]:
+        """
+        :return: New stages for a run, with consecutive map stages fused.
+        """
+        stages: List[PreprocessingStage] = []
+        for preprocessor in self.preprocessors:
+            stage = preprocessor.stage(self.streaming)
+            if stages and isinstance(stage, MapStage) and isinstance(stages[-1], MapStage):
+                stages[-1] = stages[-1].fuse(stage)
+            else:
+                stages.append(stage)
+
+        return stages
+
+    def run(self, blocks: Iterable[str]) -> Iterator[str]:
+        """
+        :param blocks: The blocks to be processed.
+        :return: The processed blocks. They are produced while the blocks are consumed.
+        """
+        if self.streaming:
+            for i, preprocessor in enumerate(self.preprocessors):
+                if PreprocessingPipeline._overrides_process_stream(preprocessor):
+                    before = PreprocessingPipeline(self.preprocessors[:i], streaming=True).run(blocks)
+                    after = PreprocessingPipeline(self.preprocessors[i + 1:], streaming=True)
+                    return after.run(preprocessor.process_stream(before))
+
+        return self._run_stages(blocks)
+
+    def _run_stages(self, blocks: Iterable[str]) -> Iterator[str]:
+        stages = self.stages()
+
+        for block in blocks:
+            yield from PreprocessingPipeline._push(stages, 0, block)
+
+        for i, stage in enumerate(stages):
+            for block in stage.flush():
+                yield from PreprocessingPipeline._push(stages, i + 1, block)
+
+    def process(self, blocks: Iterable[str]) -> List[str]:
+        return list(self.run(blocks))
+
+    @staticmethod
+    def _overrides_process_stream(preprocessor: Type["BlockPreprocessor"]) -> bool:
+        # Imported here, as block_preprocessor imports this module.
+        from document_parsing.preprocessing.block_preprocessor import BlockPreprocessor
+
+        process_stream = getattr(preprocessor, "process_stream", None)
+        return process_stream is not None and \
+            getattr(process_stream, "__func__", None) is not BlockPreprocessor.process_stream.__func__
+
+    @staticmethod
+    def _push(stages: List[PreprocessingStage], start: int, block: str) -> Iterable[str]:
+        """
+        Passes a block through the stages beginning at start.
+        """
+        pending: Iterable[str] = (block,)
+        for i in range(start, len(stages)):
+            stage = stages[i]
+            pending = [out for b in pending for out in stage.push(b)]
+            if not pending:
+                break
+
+        return pending
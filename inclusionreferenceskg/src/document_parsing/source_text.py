@@ -0,0 +1,90 @@
+import mmap
+import tempfile
+from typing import List, NamedTuple, Optional
+
+from document_parsing.node.node import Node
+
+
+class SourceSpan(NamedTuple):
+    """
+    The content of a node as a range of a SourceText. Decoded whenever the content is read.
+    """
+    source: "SourceText"
+    start: int
+    end: int
+
+    def text(self) -> str:
+        return self.source.text(self.start, self.end)
+
+
+class SourceText:
+    """
+    Holds the content of the nodes of a tree in a memory-mapped file instead of one string per node.
+
+    store moves the content of every node into the file and leaves the node with a SourceSpan, from which Node.content
+    is decoded whenever it is read. The pages of the file are only resident while they are used, so a large corpus that
+    is mostly idle takes little memory. Setting the content of a node replaces its span as usual.
+
+    The nodes are stored in pre order, so the content of a subtree is a single range of the file.
+    """
+
+    def __init__(self, data: bytes = b"", path: Optional[str] = None):
+        """
+        :param data: The UTF-8 encoded text.
+        :param path: The file the text is written to and mapped from. If None, an anonymous temporary file is used.
+        """
+        self.path = path
+        with (open(path, "w+b") if path is not None else tempfile.TemporaryFile()) as f:
+            f.write(data)
+            f.flush()
+            # Empty files cannot be mapped.
+            self._buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if data else b""
+
+    @classmethod
+    def store(cls, root: Node, path: Optional[str] = None) -> "SourceText":
+        """
+        Moves the content of all nodes of a tree to a new SourceText.
+
+        :param root: The root of the tree.
+        :param path: See __init__.
+        :return: The SourceText the nodes refer to.
+        """
+        nodes: List[Node] = []
+        parts: List[bytes] = []
+        # Pre order. node_traversal is not used as it would import spacy into the parser.
+        dfs_stack = [root]
+        while dfs_stack:
+            node = dfs_stack.pop()
+            dfs_stack.extend(reversed(node.children))
+            # Nodes whose content is not an instance attribute, e.g. LazyDocument, keep it.
+            content = node.__dict__.get("content")
+            if isinstance(content, str) and content:
+                nodes.append(node)
+                parts.append(content.encode("utf-8"))
+
+        source = cls(b"".join(parts), path)
+        offset = 0
+        for node, part in zip(nodes, parts):
+            del node.content
+            node._source_span = SourceSpan(source, offset, offset + len(part))
+            offset += len(part)
+
+        return source
+
+    def __len__(self):
+        return len(self._buffer)
+
+    def text(self, start: int = 0, end: Optional[int] = None) -> str:
+        """
+        :param start: The first byte.
+        :param end: The end of the range, exclusive. Defaults to the end of the text.
+        :return: The decoded range of the text.
+        """
+        return self._buffer[start:end].decode("utf-8")
+
+    def __getstate__(self):
+        # Sent as bytes, e.g. to the workers of load_corpus, and mapped again on the other side.
+        return {"data": self._buffer[:], "path": None}
+
+    def __setstate__(self, state):
+        self.__init__(state["data"], state["path"])
@@ -1,6 +1,7 @@
 import csv
 
 from document_parsing.node.article import Article
+from document_parsing.parse_cache import ParseCache
 from evaluation.stat_accumulator import StatAccumulator
 from kg_creation.kg_renderer import create_graph
 from kg_creation.knowledge_graph import KnowledgeGraph
@@ -41,7 +42,7 @@ def evaluate(stat_accumulator: StatAccumulator, graph: KnowledgeGraph, expected_
 if __name__ == "__main__":
     stat_acc = StatAccumulator()
 
-    gdpr, document_root = gdpr_dependency_root()
+    gdpr, document_root = gdpr_dependency_root(cache=ParseCache())
     article29 = gdpr.resolve_loose([Article(number=29)])[0]
     article30 = gdpr.resolve_loose([Article(number=30)])[0]
     actual29 = create_graph(article29, article29, fast=False)
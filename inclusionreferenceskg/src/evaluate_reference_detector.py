@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import csv
 from difflib import Differ, SequenceMatcher
-from typing import Optional
+from typing import List, Optional, Sequence, Tuple
 
 from document_parsing.document_tree_parser import DocumentTreeParser
 from document_parsing.node.node_traversal import pre_order
@@ -13,10 +13,17 @@ from evaluation.stat_accumulator import StatAccumulator
 from reference_detection.gold_standard_reference_detector import GoldStandardReferenceDetector
 from reference_detection.reference_detector import ReferenceDetector
 from reference_detection.regex_reference_detector import RegexReferenceDetector
+from util.reference import Reference
+
+# (document name, document file name, reference file name) of the documents with gold standard references.
+DIRECTIVE_2002_58_EC = ("Directive 2002/58/EC", "directive_2002_58_EC.txt", "directive_2002_58_EC_references.csv")
+DIRECTIVE_2000_31_EC = ("Directive (EU) 2015/1535", "directive_2000_31_EC.txt", "directive_2000_31_EC_references.csv")
+GDPR = ("GDPR", "gdpr.txt", "gdpr_references.csv")
+EVALUATION_DOCUMENTS = [DIRECTIVE_2002_58_EC, DIRECTIVE_2000_31_EC, GDPR]
 
 
 def evaluate_detector(detector: ReferenceDetector, origin_text: str, expected_file: str,
-                      stat_accumulator: Optional[StatAccumulator] = None):
+                      stat_accumulator: Optional[StatAccumulator] = None, workers: Optional[int] = 1):
     """
     Prints a diff of the references detected by the detector and those that are expected.
 
@@ -24,9 +31,25 @@ def evaluate_detector(detector: ReferenceDetector, origin_text: str, expected_fi
     :param origin_text: The text to be searched for references.
     :param expected_file: The csv file containing the expected references.
     :param stat_accumulator: An object to accumulate stats over multiple evaluation runs.
+    :param workers: If not 1, the references are detected with ReferenceDetector.detect_parallel.
+    """
+
+    if workers == 1:
+        detected_references = detector.detect(origin_text)
+    else:
+        detected_references = detector.detect_parallel(origin_text, workers)
+    evaluate_detected(detected_references, expected_file, stat_accumulator)
+
+
+def evaluate_detected(detected_references: List[Reference], expected_file: str,
+                      stat_accumulator: Optional[StatAccumulator] = None):
     """
+    Prints a diff of detected references and those that are expected.
 
-    detected_references = detector.detect(origin_text)
+    :param detected_references: The references found by a detector.
+    :param expected_file: The csv file containing the expected references.
+    :param stat_accumulator: An object to accumulate stats over multiple evaluation runs.
+    """
 
     with open(expected_file, "r", encoding="utf-8") as ef:
         expected_references = [x[0] for x in csv.reader(ef, delimiter=";")][1:]
@@ -72,34 +95,53 @@ def evaluate_detector(detector: ReferenceDetector, origin_text: str, expected_fi
         stat_accumulator.false_positives += false_positives
 
 
+def _raw_text(document_name: str, document_file_name: str) -> str:
+    # Extract the raw text from the document (sans Titles)
+    parser = DocumentTreeParser(preprocessors=[HeaderPreprocessor, FootnoteDeletePreprocessor])
+    document = parser.parse_from_eu_doc_file(document_name, document_file_name)
+    return "\n".join(node.content for node in pre_order(document))
+
+
 def evaluate_regex_reference_detector_on(document_name: str, document_file_name: str, reference_file_name: str,
                                          stat_accumulator: Optional[StatAccumulator] = None):
     """
     Calls evaluate_detector with the parameters for the provided document and the RegexReferenceDetector.
     """
-    # Extract the raw text from the document (sans Titles)
-    parser = DocumentTreeParser(preprocessors=[HeaderPreprocessor, FootnoteDeletePreprocessor])
-    gdpr = parser.parse_from_eu_doc_file(document_name, document_file_name)
-    raw_text = "\n".join(node.content for node in pre_order(gdpr))
-
-    evaluate_detector(RegexReferenceDetector(), raw_text,
+    evaluate_detector(RegexReferenceDetector(), _raw_text(document_name, document_file_name),
                       f"./resources/evaluation_data/{reference_file_name}", stat_accumulator)
 
 
+def evaluate_regex_reference_detector_on_corpus(documents: Sequence[Tuple[str, str, str]],
+                                                stat_accumulator: Optional[StatAccumulator] = None,
+                                                workers: Optional[int] = None):
+    """
+    Evaluates the RegexReferenceDetector on several documents, detecting the references of all of them in a process
+    pool, see ReferenceDetector.detect_corpus.
+
+    :param documents: (document name, document file name, reference file name) triples, as for
+                      evaluate_regex_reference_detector_on.
+    :param stat_accumulator: An object to accumulate stats over the documents.
+    :param workers: The number of worker processes. None uses one per CPU.
+    """
+    raw_texts = [_raw_text(document_name, document_file_name) for document_name, document_file_name, _ in documents]
+    detected = RegexReferenceDetector().detect_corpus(raw_texts, workers)
+
+    for (_, _, reference_file_name), detected_references in zip(documents, detected):
+        evaluate_detected(detected_references, f"./resources/evaluation_data/{reference_file_name}", stat_accumulator)
+
+
 def evaluate_regex_reference_detector_on_directive_2002_58_ec(stat_accumulator: Optional[StatAccumulator] = None):
     """
        Calls evaluate_detector with the parameters for theDirective 2002/58/EC  and the RegexReferenceDetector.
        """
-    evaluate_regex_reference_detector_on("Directive 2002/58/EC ", "directive_2002_58_EC.txt",
-                                         "directive_2002_58_EC_references.csv", stat_accumulator)
+    evaluate_regex_reference_detector_on(*DIRECTIVE_2002_58_EC, stat_accumulator)
 
 
 def evaluate_regex_reference_detector_on_directive_2000_31_ec(stat_accumulator: Optional[StatAccumulator] = None):
     """
     Calls evaluate_detector with the parameters for the DIRECTIVE (EU) 2015/1535 and the RegexReferenceDetector.
     """
-    evaluate_regex_reference_detector_on("Directive (EU) 2015/1535", "directive_2000_31_EC.txt",
-                                         "directive_2000_31_EC_references.csv", stat_accumulator)
+    evaluate_regex_reference_detector_on(*DIRECTIVE_2000_31_EC, stat_accumulator)
 
 
 def evaluate_regex_reference_detector_on_gdpr(stat_accumulator: Optional[StatAccumulator] = None):
@@ -108,8 +150,7 @@ def evaluate_regex_reference_detector_on_gdpr(stat_accumulator: Optional[StatAcc
 
     Note: We evaluate against the GDPR without footnotes.
     """
-    evaluate_regex_reference_detector_on("GDPR", "gdpr.txt",
-                                         "gdpr_references.csv", stat_accumulator)
+    evaluate_regex_reference_detector_on(*GDPR, stat_accumulator)
 
 
 def evaluate_gold_standard_reference_detector_on_gdpr(stat_accumulator: Optional[StatAccumulator] = None):
@@ -131,9 +172,7 @@ def evaluate_gold_standard_reference_detector_on_gdpr(stat_accumulator: Optional
 
 if __name__ == "__main__":
     accumulator = StatAccumulator()
-    evaluate_regex_reference_detector_on_directive_2002_58_ec(accumulator)
-    evaluate_regex_reference_detector_on_directive_2000_31_ec(accumulator)
-    evaluate_regex_reference_detector_on_gdpr(accumulator)
+    evaluate_regex_reference_detector_on_corpus(EVALUATION_DOCUMENTS, accumulator)
     print("Total false positives:", accumulator.false_positives)
     print("Total false negatives:", accumulator.false_negatives)
     print("Total F1 score:", accumulator.f1())
@@ -4,7 +4,10 @@ from typing import Dict, Tuple
 
 from document_parsing.document_tree_parser import DocumentTreeParser
 from document_parsing.node.node import Node
+from document_parsing.node.resolution_cache import ResolutionCache
 from document_parsing.node.node_traversal import pre_order
+from document_parsing.node.tree_intervals import TreeIntervals
+from document_parsing.parse_cache import ParseCache
 from evaluation.stat_accumulator import StatAccumulator
 from reference_detection.gold_standard_reference_detector import GoldStandardReferenceDetector
 from reference_resolution.reference_resolver import ReferenceResolver
@@ -19,13 +22,15 @@ def main():
     parser = DocumentTreeParser()
     reference_detector = GoldStandardReferenceDetector("./resources/evaluation_data/gdpr_references.csv")
 
-    gdpr, document_root = gdpr_dependency_root(parser)
+    gdpr, document_root = gdpr_dependency_root(parser, cache=ParseCache())
+    resolution_cache = ResolutionCache(document_root)
 
     actual_references = []
+    intervals = TreeIntervals.containing(gdpr)
 
-    for node in pre_order(gdpr):
+    for node in pre_order(gdpr, cached=True):
         refs = reference_detector.detect(node.content)
-        actual_references.extend(resolver.resolve_single(node, refs))
+        actual_references.extend(resolver.resolve_single(node, refs, intervals))
 
     with open("./resources/evaluation_data/gdpr_resolved.json", encoding="utf-8") as f:
         expected_references = json.load(f)
@@ -49,7 +54,7 @@ def main():
 
         resolved = []
         for reference_qualifier in actual_reference.reference_qualifier:
-            resolved_single = document_root.resolve_loose(reference_qualifier)
+            resolved_single = resolution_cache.resolve(reference_qualifier)
             if len(resolved_single) == 0:
                 print(f"Could not resolve '{actual_reference.text_content}'. "
                       f"Qualifier: '{actual_reference.reference_qualifier}'.")
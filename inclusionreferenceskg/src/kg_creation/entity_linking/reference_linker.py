@@ -1,12 +1,11 @@
-from collections import defaultdict
+from bisect import bisect_left
 from functools import reduce
 
 from spacy.matcher import Matcher
 from spacy.tokens import Doc, Token
 
-from document_parsing.node.document import Document
 from document_parsing.node.node import Node
-from document_parsing.node.node_traversal import pre_order
+from document_parsing.node.tree_intervals import TreeIntervals
 from kg_creation.entity_linking.entity_linker import EntityLinker
 from kg_creation.knowledge_graph import KnowledgeGraph
 from kg_creation.sentence_analysing.phrase import PhraseObject
@@ -39,10 +38,23 @@ class ReferenceLinker(EntityLinker):
         ]])
 
     def link(self, graph: KnowledgeGraph) -> KnowledgeGraph:
-        node_id_to_kg_nodes = defaultdict(list)
-        for kg_node in graph.nodes.values():
-            if not isinstance(kg_node.item, Node):
-                node_id_to_kg_nodes[kg_node.item.token._.node.id].append(kg_node)
+        token_kg_nodes = [kg_node for kg_node in graph.nodes.values() if not isinstance(kg_node.item, Node)]
+        # Per tree, its labels and the kg nodes sorted by the position of their document node, so the kg nodes within
+        # a target are a slice. The labels are created once per call.
+        kg_nodes_by_tree = []
+
+        def kg_nodes_in(target: Node):
+            tree = next((t for t in kg_nodes_by_tree if target in t[0]), None)
+            if tree is None:
+                intervals = TreeIntervals.containing(target)
+                located = sorted(((intervals.position(kn.item.token._.node), kn) for kn in token_kg_nodes
+                                  if kn.item.token._.node in intervals), key=lambda x: x[0])
+                tree = (intervals, [x[0] for x in located], [x[1] for x in located])
+                kg_nodes_by_tree.append(tree)
+
+            intervals, positions, kg_nodes = tree
+            descendants = intervals.descendants_range(target)
+            return kg_nodes[bisect_left(positions, descendants.start):bisect_left(positions, descendants.stop)]
 
         for kg_node in graph.nodes.values():
             if not isinstance(kg_node.item, PhraseObject):
@@ -59,21 +71,11 @@ class ReferenceLinker(EntityLinker):
             _, start, end = matches[0]
 
             ref = span[end - 1]
-            target_ids = set()
-            for target in ref._.reference.targets:
-                for node in pre_order(target):
-                    target_ids.add(node.id)
-
-            kg_nodes_in_target = [kn for id_ in target_ids if id_ in node_id_to_kg_nodes for kn in
-                                  node_id_to_kg_nodes.get(id_)]
+            kg_nodes_in_target = [kn for target in ref._.reference.targets for kn in kg_nodes_in(target)]
 
             nodes_to_be_merged = {n.id for n in kg_nodes_in_target if n.id != kg_node.id and
                                   self._equals(n.item.token, kg_node.item.token)}
 
-            containing_document = kg_node.item.token._.node
-            while containing_document.depth > Document.depth:
-                containing_document = containing_document.parent
-
             reduce(graph.merge, nodes_to_be_merged, kg_node.id)
 
         return graph
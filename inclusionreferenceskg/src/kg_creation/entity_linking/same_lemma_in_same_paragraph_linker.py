@@ -4,6 +4,7 @@ from functools import reduce
 from spacy.tokens import Doc
 
 from document_parsing.node.paragraph import Paragraph
+from document_parsing.node.tree_intervals import TreeIntervals
 from kg_creation.entity_linking.entity_linker import EntityLinker
 from kg_creation.knowledge_graph import KnowledgeGraph
 from kg_creation.sentence_analysing.phrase import PhraseObject
@@ -23,6 +24,7 @@ class SameLemmaInSameParagraphLinker(EntityLinker):
         coref_chains = self.doc._.coref_chains if Doc.get_extension("coref_chains") else None
 
         group_by_paragraph = defaultdict(list)
+        intervals = None
         for kg_node in graph.nodes.values():
             if not isinstance(kg_node.item, PhraseObject):
                 continue
@@ -32,9 +34,9 @@ class SameLemmaInSameParagraphLinker(EntityLinker):
             if doc_node.depth < Paragraph.depth:
                 continue
 
-            para = doc_node
-            while doc_node is not None and para.depth > Paragraph.depth:
-                para = para.parent
+            if intervals is None or doc_node not in intervals:
+                intervals = TreeIntervals.containing(doc_node)
+            para = intervals.ancestor_at_depth(doc_node, Paragraph)
 
             group_by_paragraph[para.id].append(kg_node)
 
@@ -1,7 +1,8 @@
 import itertools
 import logging
 import uuid
-from typing import List, Tuple, Set, Callable
+from bisect import bisect_right
+from typing import List, Optional, Tuple, Set, Callable
 
 import coreferee
 import spacy
@@ -10,6 +11,7 @@ from spacy.tokens import Token, Doc
 
 from document_parsing.node.node import Node
 from document_parsing.node.node_traversal import pre_order
+from document_parsing.node.resolution_cache import ResolutionCache
 from kg_creation.attribute_extraction.attribute_extractor import AttributeExtractor
 from kg_creation.attribute_extraction.negation_extractor import NegationExtractor
 from kg_creation.attribute_extraction.preposition_extractor import PrepositionExtractor
@@ -24,6 +26,7 @@ from kg_creation.sentence_analysing.phrase import Phrase
 from kg_creation.sentence_analysing.phrase_extractor import PhraseExtractor
 from reference_detection.regex_reference_detector import RegexReferenceDetector
 from reference_resolution.reference_resolver import ReferenceResolver
+from util.id_scheme import IdScheme, assign_node_ids
 from util.spacy_components import REFERENCE_QUALIFIER_RESOLVER_COMPONENT
 
 
@@ -46,10 +49,10 @@ class KGRenderer:
         added_phrases = set()
 
         # add document structure:
-        for node in pre_order(root):
+        for node in pre_order(root, cached=True):
             graph.add_node(node.id, node)
 
-        for node in pre_order(root):
+        for node in pre_order(root, cached=True):
             for child in node.children:
                 graph.add_edge(node.id, child.id, label="contains")
 
@@ -148,29 +151,42 @@ def nlp_doc(reference_base: Node, analyzed: Node, nlp: Language) -> Doc:
         # The root from where to resolve references.
         Doc.set_extension("reference_base", default=None)
 
-    raw_text = ""
+    if not Doc.get_extension("resolution_cache"):
+        # Resolves references against the reference base during this run of the pipeline.
+        Doc.set_extension("resolution_cache", default=None)
+
+    # The text is joined once at the end. Each content is read only once, as it may be decoded from a SourceText.
+    parts: List[str] = []
     # We keep a list of node content end positions in the text from which we derive which node each token
     # originates from
     text_positions: List[Tuple[int, Node]] = []
 
-    for node in pre_order(analyzed):
-        raw_text += node.content
-        raw_text += "\n"
-        text_positions.append((len(raw_text), node))
+    end = 0
+    for node in pre_order(analyzed, cached=True):
+        content = node.content
+        parts.append(content)
+        parts.append("\n")
+        end += len(content) + 1
+        text_positions.append((end, node))
+    raw_text = "".join(parts)
 
     # We create an anonymous pipe to insert information about the structure into the doc right after creation.
     comp_name = "document_supplement_component_" + str(uuid.uuid4())
+    resolution_cache = ResolutionCache(reference_base)
 
-    @Language.component(comp_name, assigns=["doc._.reference_base", "doc._.document_structure", "token._.node"])
+    @Language.component(comp_name, assigns=["doc._.reference_base", "doc._.document_structure",
+                                            "doc._.resolution_cache", "token._.node"])
     def comp(d):
         d._.document_structure = analyzed
         d._.reference_base = reference_base
+        d._.resolution_cache = resolution_cache
 
+        ends = [pos for pos, _ in text_positions]
         for tok in d:
-            for pos, parent_node in text_positions:
-                if tok.idx < pos:
-                    tok._.node = parent_node
-                    break
+            # The first node whose content ends after the token starts.
+            i = bisect_right(ends, tok.idx)
+            if i < len(text_positions):
+                tok._.node = text_positions[i][1]
             else:
                 logging.warning(f"Could not assign a node to token '{tok}'. This is most likely caused by a bug.")
 
@@ -185,16 +201,26 @@ def create_graph(root: Node, analyzed: Node, fast: bool = False,
                  include_extensions: bool = False,
                  attribute_extractors: List[AttributeExtractor] = None,
                  entity_linker_supplier: Callable[[Doc], List[EntityLinker]] = None,
+                 id_scheme: IdScheme = None,
+                 detection_workers: Optional[int] = 1,
                  ) -> KnowledgeGraph:
     """
     Creates a knowledge graph from a parsed document.
 
+    References are resolved through a ResolutionCache of root that is created for this call, so changes to the tree
+    between calls are always seen.
+
     :param root: The document structure against which to resolve references.
     :param analyzed: The document structure from which to obtain the knowledge in the knowledge graph.
     :param fast: Determines if a faster spacy pipeline should be used.
     :param include_extensions: Determines if the 'of' and 'described_by' relationships should be added.
     :param attribute_extractors: A list of used attribute extractors. Defaults to negation and preposition extraction.
     :param entity_linker_supplier: A function for supplying entity linkers from a given Doc object.
+    :param id_scheme: The scheme for the ids of the nodes of the knowledge graph, e.g. a CounterIdScheme or a
+                      PathIdScheme. The ids of the nodes in root and analyzed are replaced. If None, the existing ids
+                      of the nodes and uuid4 ids for phrases are used.
+    :param detection_workers: The number of processes references are detected in, see
+                              ReferenceDetector.detect_parallel. Worthwhile for large documents or corpora.
     :return: The finished knowledge graph.
     """
 
@@ -220,7 +246,7 @@ def create_graph(root: Node, analyzed: Node, fast: bool = False,
     # Resolves anaphoric references
     nlp.add_pipe("coreferee", config={}, after="parser")
     # Detects references
-    nlp.add_pipe(RegexReferenceDetector.SPACY_COMPONENT_NAME, config={}, after="parser")
+    nlp.add_pipe(RegexReferenceDetector.SPACY_COMPONENT_NAME, config={"workers": detection_workers}, after="parser")
     # Creates reference qualifiers
     nlp.add_pipe(ReferenceResolver.SPACY_COMPONENT_NAME, config={},
                  after=RegexReferenceDetector.SPACY_COMPONENT_NAME)
@@ -228,12 +254,17 @@ def create_graph(root: Node, analyzed: Node, fast: bool = False,
     nlp.add_pipe(REFERENCE_QUALIFIER_RESOLVER_COMPONENT, config={},
                  after=ReferenceResolver.SPACY_COMPONENT_NAME)
 
+    if id_scheme is not None:
+        assign_node_ids(root, id_scheme)
+        if not _is_in_tree(analyzed, root):
+            assign_node_ids(analyzed, id_scheme)
+
     # Does some ugly setup of the Doc object and applies nlp
     doc = nlp_doc(root, analyzed, nlp)
 
     # Phrase Extraction
     phrases = []
-    phrase_extractor = PhraseExtractor()
+    phrase_extractor = PhraseExtractor(id_scheme)
     for sent in doc.sents:
         phrases.extend(phrase_extractor.extract_from_sentence(sent))
 
@@ -257,3 +288,11 @@ def create_graph(root: Node, analyzed: Node, fast: bool = False,
             entity_linker.link(proxy_kg)
 
     return graph
+
+
+def _is_in_tree(node: Node, root: Node) -> bool:
+    while node is not None:
+        if node is root:
+            return True
+        node = node.parent
+    return False
@@ -1,12 +1,13 @@
 from itertools import chain
-from typing import List, Iterable, Set, Tuple
+from typing import List, Iterable, Set, Tuple, Optional, Callable
 
-from spacy.tokens import Span, Doc
+from spacy.tokens import Span, Doc, Token
 
 from kg_creation.sentence_analysing.phrase import Predicate, Phrase, PhraseObject
 from kg_creation.sentence_analysing.util import get_main_verbs_of_sent, get_nominal_subjects_of_verbs, \
     get_objects_of_predicate_consider_preposition, is_acl_without_subj, CLAUSAL_SUBJ_DEPS, \
     CONDITIONAL_SUBORDINATE_CONJUNCTIONS
+from util.id_scheme import IdScheme
 
 
 def is_conditional(phrase: Phrase):
@@ -28,6 +29,13 @@ class PhraseExtractor:
     It is used to extract phrase constructs, i.e., agent-predicate-patient-constructs, from a spacy span.
     """
 
+    def __init__(self, id_scheme: Optional[IdScheme] = None):
+        """
+        :param id_scheme: The scheme used for the ids of the created phrases, predicates and phrase objects. If None,
+                          they keep their default uuid4 ids.
+        """
+        self.id_scheme = id_scheme
+
     def extract_from_sentence(self, sent: Span) -> List[Phrase]:
         """
         Extracts the phrases from a sentence.
@@ -38,7 +46,7 @@ class PhraseExtractor:
 
         main_verbs_of_sent = get_main_verbs_of_sent(sent)
 
-        phrases: List[Phrase] = [Phrase(predicate=[Predicate(token=verb) for verb in verb_group]) for verb_group in
+        phrases: List[Phrase] = [self._phrase([self._predicate(verb) for verb in verb_group]) for verb_group in
                                  main_verbs_of_sent]
 
         # Used to mark phrases for deletion from the top level
@@ -46,9 +54,10 @@ class PhraseExtractor:
         deletion_marks = set()
 
         for phrase in phrases:
-            phrase.agent_objects = [PhraseObject(tok) for tok in get_nominal_subjects_of_verbs(phrase.predicate)]
+            phrase.agent_objects = [self._phrase_object(tok) for tok in
+                                    get_nominal_subjects_of_verbs(phrase.predicate)]
             grammatical_object = get_objects_of_predicate_consider_preposition(phrase.predicate)
-            phrase.patient_objects = [PhraseObject(tok) for tok in grammatical_object]
+            phrase.patient_objects = [self._phrase_object(tok) for tok in grammatical_object]
 
             object_children = [child for obj in chain(phrase.agent_objects, phrase.patient_objects) for child in
                                obj.token.children]
@@ -74,6 +83,21 @@ class PhraseExtractor:
 
         return phrases
 
+    def _phrase(self, predicate: List[Predicate]) -> Phrase:
+        if self.id_scheme is None or not predicate:
+            return Phrase(predicate=predicate)
+        return Phrase(id=self.id_scheme.item_id(predicate[0].token, "phrase"), predicate=predicate)
+
+    def _predicate(self, token: Token) -> Predicate:
+        if self.id_scheme is None:
+            return Predicate(token=token)
+        return Predicate(token=token, id=self.id_scheme.item_id(token, "pred"))
+
+    def _phrase_object(self, token: Token) -> PhraseObject:
+        if self.id_scheme is None:
+            return PhraseObject(token=token)
+        return PhraseObject(token=token, id=self.id_scheme.item_id(token, "obj"))
+
     def _extract_possessors(self, phrase_objects: Iterable[PhraseObject]):
         """
         Extracts possessive constructs, for example 'of' and genitive cases.
@@ -85,8 +109,8 @@ class PhraseExtractor:
             while poss_stack:
                 curr = poss_stack.pop()
 
-                genitives = [PhraseObject(x) for x in curr.token.children if x.dep_ == "poss"]
-                ofs = [PhraseObject(y) for x in curr.token.children if x.text == "of" for y in x.children if
+                genitives = [self._phrase_object(x) for x in curr.token.children if x.dep_ == "poss"]
+                ofs = [self._phrase_object(y) for x in curr.token.children if x.text == "of" for y in x.children if
                        y.dep_ == "pobj"]
 
                 curr.possessors.extend(genitives)
@@ -119,8 +143,8 @@ class PhraseExtractor:
         Resolves anaphoric references if possible.
         """
         if Doc.get_extension("coref_chains"):
-            extend_phrase_objects_by_coref(phrase.agent_objects)
-            extend_phrase_objects_by_coref(phrase.patient_objects)
+            extend_phrase_objects_by_coref(phrase.agent_objects, self._phrase_object)
+            extend_phrase_objects_by_coref(phrase.patient_objects, self._phrase_object)
 
     def _resolve_relative_clauses(self, phrase_objects: Iterable[PhraseObject]):
         """
@@ -184,11 +208,15 @@ class PhraseExtractor:
         return phrase_as_patient, phrase_as_agent
 
 
-def extend_phrase_objects_by_coref(phrase_objects: List[PhraseObject]):
+def extend_phrase_objects_by_coref(phrase_objects: List[PhraseObject],
+                                   create_phrase_object: Callable[[Token], PhraseObject] = PhraseObject):
     """
     Modifies the passed list of phrase_objects so that tokens referring to other tokens (it, they, ...)
     are added.
 
+    :param phrase_objects: The phrase objects to be extended.
+    :param create_phrase_object: Creates the phrase objects of the added tokens.
+
     Warning: This function modifies both the passed in list and the PhraseObjects within.
     """
     new_pos = []
@@ -196,5 +224,5 @@ def extend_phrase_objects_by_coref(phrase_objects: List[PhraseObject]):
         if res := po.token.doc._.coref_chains.resolve(po.token):
             po.token = res[0]
             for r in res[1:]:
-                new_pos.append(PhraseObject(token=r))
+                new_pos.append(create_phrase_object(r))
     phrase_objects.extend(new_pos)
@@ -7,6 +7,7 @@ from document_parsing.node.article import Article
 from document_parsing.node.document import Document
 from document_parsing.node.paragraph import Paragraph
 from document_parsing.node.point import Point
+from document_parsing.parse_cache import ParseCache
 from kg_creation.kg_renderer import create_graph
 from util.parser_util import gdpr_dependency_root
 
@@ -43,8 +44,9 @@ if __name__ == "__main__":
     # gdpr = parser.parse_from_eu_doc_file(title="GDPR", file_name="gdpr.txt")
 
     # Instead we will use a utility function that provides us with the parsed GDPR, as well as a root node containing
-    # the GDPR and all the documents referenced within.
-    gdpr, document_root = gdpr_dependency_root()
+    # the GDPR and all the documents referenced within. The parsed documents are stored in a ParseCache in
+    # ./inclusionreferenceskg/output/cache, so that repeated runs do not parse them again.
+    gdpr, document_root = gdpr_dependency_root(cache=ParseCache())
 
     # We can select a specific document fragment by using Node.resolve_loose.
     # Note that the pattern attribute must be ordered by Node.depth in ascending order.
@@ -1,5 +1,7 @@
 import csv
-from typing import List
+import logging
+from bisect import bisect_left
+from typing import List, Optional
 
 from spacy import Language
 
@@ -11,9 +13,15 @@ class GoldStandardReferenceDetector(ReferenceDetector):
     """
     Implements a reference detector based on getting references from a csv file.
 
-    Note: This is a one-time use detector for the references in a file. Further,
-    all calls to detect must be done in order that the references occur in the document.
+    The first column of the file holds the references in the order they occur in the document. An optional second
+    column holds their start in the raw text of the document, i.e., the contents of its nodes in pre order joined by
+    newlines as in evaluate_reference_detector.
 
+    If detect is given the offset of the text in the raw text, the references are looked up by their start. Such
+    lookups may be repeated and done in any order.
+
+    Otherwise, the references are produced greedily. Note: This is a one-time use detector for the references in a
+    file. Further, all calls to detect must be done in order that the references occur in the document.
     This is not a fool proof implementation, as it does not consider the position of
     the gold standard reference put rather tries to greedily produce references.
     """
@@ -29,22 +37,58 @@ class GoldStandardReferenceDetector(ReferenceDetector):
         assert file_location.endswith(".csv"), f"{self.__class__} requires a CSV file to work with."
 
         with open(file_location, "r", encoding="utf-8") as ef:
-            self.expected_references = [x[0] for x in csv.reader(ef, delimiter=delimiter)][1:]
+            rows = list(csv.reader(ef, delimiter=delimiter))[1:]
+        self.expected_references = [x[0] for x in rows]
+        # The next reference of the greedy detection.
+        self._next = 0
+
+        # The positioned references sorted by their start. None if the file has no offsets.
+        self._positioned: Optional[List[Reference]] = None
+        self._starts: List[int] = []
+        if rows and all(len(x) > 1 and x[1] for x in rows):
+            self._positioned = sorted((Reference(start=int(x[1]), text_content=x[0]) for x in rows),
+                                      key=lambda r: r.start)
+            self._starts = [r.start for r in self._positioned]
+
+    def detect(self, text: str, offset: Optional[int] = None) -> List[Reference]:
+        """
+        :param text: The text, e.g. the raw text of the document or the content of one of its nodes.
+        :param offset: The start of the text in the raw text of the document. Requires the file to have offsets.
+        :return: The references in the text, with start relative to the text.
+        """
+        if offset is not None:
+            return self._detect_positioned(text, offset)
 
-    def detect(self, text: str) -> List[Reference]:
         def _gen():
-            text_inner = text
             total_offset = 0
 
-            while self.expected_references and (
-                ind := text_inner.find(self.expected_references[0], total_offset)) != -1:
-                expected_ref = self.expected_references.pop(0)
+            while self._next < len(self.expected_references) and (
+                    ind := text.find(self.expected_references[self._next], total_offset)) != -1:
+                expected_ref = self.expected_references[self._next]
+                self._next += 1
                 yield Reference(start=ind, text_content=expected_ref)
                 # We assume non-overlapping references
                 total_offset = len(expected_ref) + ind
 
         return list(_gen())
 
+    def _detect_positioned(self, text: str, offset: int) -> List[Reference]:
+        if self._positioned is None:
+            raise ValueError("The gold standard has no offsets.")
+
+        references = []
+        end = offset + len(text)
+        for reference in self._positioned[bisect_left(self._starts, offset):bisect_left(self._starts, end)]:
+            start = reference.start - offset
+            if start + len(reference.text_content) > len(text):
+                continue
+            if not text.startswith(reference.text_content, start):
+                logging.warning(f"The gold standard reference {reference} does not match the text.")
+                continue
+            references.append(Reference(start=start, text_content=reference.text_content))
+
+        return references
+
     @staticmethod
     @Language.factory(SPACY_COMPONENT_NAME,
                       default_config={"file_location": "./resources/evaluation_data/gdpr_references.csv"},
@@ -1,11 +1,40 @@
 import logging
+import re
 from abc import abstractmethod, ABC
-from typing import Dict, List, Type
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, replace
+from typing import Dict, List, Optional, Sequence, Tuple, Type
 
+import numpy
+from spacy.attrs import IDX, LENGTH
 from spacy.tokens import Span, Doc
 
 from util.reference import Reference
 
+# A blank line after a character that no reference contains, see RegexReferenceDetector.boundary. Other blank lines
+# may be spanned by the name of a treaty, e.g. "the Treaty on the\n\nFunctioning of the European Union".
+_block_boundary = re.compile(r"(?<=[^\w\s(),/])\n\n")
+
+
+def split_blocks(text: str, min_size: int) -> List[Tuple[int, str]]:
+    """
+    Cuts a text into chunks at block boundaries that no reference spans.
+
+    :param text: The text.
+    :param min_size: The minimal length of a chunk, except for the last one. Blocks are joined until it is reached.
+    :return: (offset in the text, chunk) pairs in the order of the text.
+    """
+    chunks = []
+    start = 0
+    for boundary in _block_boundary.finditer(text):
+        if boundary.end() - start >= min_size:
+            chunks.append((start, text[start:boundary.end()]))
+            start = boundary.end()
+
+    if start < len(text) or not chunks:
+        chunks.append((start, text[start:]))
+    return chunks
+
 
 class ReferenceDetector(ABC):
     """
@@ -18,28 +47,134 @@ class ReferenceDetector(ABC):
     def detect(self, text: str) -> List[Reference]:
         raise NotImplementedError()
 
+    def detect_corpus(self, texts: Sequence[str], workers: Optional[int] = None) -> List[List[Reference]]:
+        """
+        Detects the references in the texts of a corpus in a process pool.
+
+        The detector is copied to the workers, so detect must not depend on earlier calls.
+
+        :param texts: The texts, e.g. the raw texts of documents.
+        :param workers: The number of worker processes. None uses one per CPU. With 1 (or a single text) the texts
+                        are processed in the calling process.
+        :return: The references in each text, in the order of the texts.
+        """
+        if workers == 1 or len(texts) <= 1:
+            return [self.detect(text) for text in texts]
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(self.detect, texts))
+
+    def detect_parallel(self, text: str, workers: Optional[int] = None, chunk_size: int = 1 << 16) -> List[Reference]:
+        """
+        Detects the references in a large text by cutting it at block boundaries (see split_blocks) and processing
+        the chunks with detect_corpus.
+
+        :param text: The text.
+        :param workers: See detect_corpus.
+        :param chunk_size: The minimal length of a chunk.
+        :return: The references, with start relative to the whole text, in the order of the text.
+        """
+        chunks = split_blocks(text, chunk_size)
+        detected = self.detect_corpus([chunk for _, chunk in chunks], workers)
+        return [replace(reference, start=offset + reference.start)
+                for (offset, _), references in zip(chunks, detected) for reference in references]
+
     @staticmethod
-    def _spacy_pipe_component_base(reference_detector: "ReferenceDetector"):
+    def _spacy_pipe_component_base(reference_detector: "ReferenceDetector", workers: Optional[int] = 1,
+                                   alignment_mode: str = "strict"):
         """
         Utility for adapting a ReferenceDetector to a spacy pipeline component or a factory.
-        """
 
-        def reference_detector_component(doc: Doc):
-            def reference_to_span(reference: Reference):
-                s = doc.char_span(reference.start, reference.start + len(reference.text_content))
-                if not s:
-                    logging.warning(f"Could not create span for reference {reference}")
-                    return None
+        The counts of align_references over all processed docs are kept in the alignment_stats attribute of the
+        component.
 
-                return Span(doc, start=s.start, end=s.end, label="REFERENCE")
+        :param reference_detector: The detector.
+        :param workers: If not 1, the references are detected with detect_parallel.
+        :param alignment_mode: See align_references.
+        """
 
-            refs = [(ref, reference_to_span(ref)) for ref in reference_detector.detect(doc.text)]
-            refs = [x for x in refs if x[1]]
+        def detect(text: str) -> List[Reference]:
+            if workers == 1:
+                return reference_detector.detect(text)
+            return reference_detector.detect_parallel(text, workers)
+
+        def reference_detector_component(doc: Doc):
+            aligned, stats = align_references(doc, detect(doc.text), alignment_mode)
+            reference_detector_component.alignment_stats += stats
+            if stats.failed:
+                logging.warning(f"Could not create spans for {stats.failed} of {stats.total} references.")
 
             with doc.retokenize() as retokenizer:
-                for ref, span in refs:
-                    retokenizer.merge(span, attrs={"POS": "PROPN", "TAG": "REF", "_": {"reference": ref}})
+                for ref, start, end in aligned:
+                    retokenizer.merge(Span(doc, start=start, end=end, label="REFERENCE"),
+                                      attrs={"POS": "PROPN", "TAG": "REF", "_": {"reference": ref}})
 
             return doc
 
+        reference_detector_component.alignment_stats = AlignmentStats()
         return reference_detector_component
+
+
+@dataclass
+class AlignmentStats:
+    aligned: int = 0
+    # References aligned by expanding them to token boundaries. Included in aligned.
+    expanded: int = 0
+    failed: int = 0
+
+    @property
+    def total(self) -> int:
+        return self.aligned + self.failed
+
+    def __add__(self, other: "AlignmentStats") -> "AlignmentStats":
+        return AlignmentStats(self.aligned + other.aligned, self.expanded + other.expanded,
+                              self.failed + other.failed)
+
+
+def align_references(doc: Doc, references: Sequence[Reference], mode: str = "strict") \
+        -> Tuple[List[Tuple[Reference, int, int]], AlignmentStats]:
+    """
+    Finds the tokens of all references of a doc at once by binary searches over the offsets of the tokens.
+
+    :param doc: The doc the references were detected in.
+    :param references: The references.
+    :param mode: "strict" drops references that do not start and end at token boundaries, like Doc.char_span.
+                 "expand" extends them to the tokens they overlap instead. References that share a token with an
+                 earlier one are dropped either way, as tokens can only be merged once.
+    :return: (reference, first token, end token exclusive) triples in the order of the text, which may be merged
+             directly, and the counts of aligned and dropped references.
+    """
+    if mode not in ("strict", "expand"):
+        raise ValueError(f"Unknown alignment mode '{mode}'.")
+
+    references = sorted(references, key=lambda r: r.start)
+    offsets = doc.to_array([IDX, LENGTH]).astype(numpy.int64).reshape(-1, 2)
+    starts = offsets[:, 0]
+    ends = starts + offsets[:, 1]
+    reference_starts = numpy.array([r.start for r in references], dtype=numpy.int64)
+    reference_ends = reference_starts + numpy.array([len(r.text_content) for r in references], dtype=numpy.int64)
+
+    # The first token ending after the start and the last token starting before the end of each reference.
+    first_tokens = numpy.searchsorted(ends, reference_starts, side="right")
+    end_tokens = numpy.searchsorted(starts, reference_ends, side="left")
+    found = first_tokens < end_tokens
+    exact = numpy.zeros(len(references), dtype=bool)
+    exact[found] = (starts[first_tokens[found]] == reference_starts[found]) & \
+                   (ends[end_tokens[found] - 1] == reference_ends[found])
+
+    aligned = []
+    stats = AlignmentStats()
+    previous_end = 0
+    for reference, start, end, is_found, is_exact in zip(references, first_tokens.tolist(), end_tokens.tolist(),
+                                                         found.tolist(), exact.tolist()):
+        if not is_found or start < previous_end or (not is_exact and mode == "strict"):
+            logging.debug(f"Could not create span for reference {reference}")
+            stats.failed += 1
+            continue
+
+        aligned.append((reference, start, end))
+        previous_end = end
+        stats.aligned += 1
+        stats.expanded += not is_exact
+
+    return aligned, stats
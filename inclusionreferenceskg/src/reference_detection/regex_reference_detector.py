@@ -1,5 +1,5 @@
 import re
-from typing import List
+from typing import List, Optional
 
 from spacy import Language
 
@@ -58,17 +58,55 @@ class RegexReferenceDetector(ReferenceDetector):
 
     reference = fr"(?i)(?:{multi}|{single})(?:(?:\sof)?\s{single})*"
 
-    def __init__(self):
+    # Every reference starts with one of these words. Searched for in the text folded by RegexUtil.fold_case.
+    anchor = fr"(?={node_name}|{RegexUtil.ordinal}|point|those|this|that|the|commission|regulation|council|" \
+             fr"directive|decision)"
+    # A character no reference contains. As it is not a word character either, a reference ends before it no matter
+    # what follows.
+    boundary = r"[^\w\s(),/]"
+
+    def __init__(self, prefilter: bool = True):
+        """
+        :param prefilter: If True, the pattern is only matched at the anchors of references, up to the next boundary.
+                          Otherwise, it is searched for in the whole text. Both find the same references.
+        """
+        self.prefilter = prefilter
         self.pattern: re.Pattern = RegexReferenceDetector._build_pattern()
+        self.anchor_pattern: re.Pattern = re.compile(RegexReferenceDetector.anchor)
+        self.boundary_pattern: re.Pattern = re.compile(RegexReferenceDetector.boundary)
 
     @staticmethod
     def _build_pattern() -> re.Pattern:
         return re.compile(RegexReferenceDetector.reference, re.I)
 
     def detect(self, text) -> List[Reference]:
-        return [Reference(start=m.start(), text_content=m.group()) for m in self.pattern.finditer(text)]
+        if not self.prefilter:
+            return [Reference(start=m.start(), text_content=m.group()) for m in self.pattern.finditer(text)]
+
+        # Most of a text contains no reference. Instead of trying the whole pattern at every position, only the
+        # positions where a reference may start are tried, and the pattern only sees the window up to the next
+        # boundary, which a reference cannot extend beyond. The pattern neither looks behind nor at word boundaries,
+        # so the matches are the ones finditer finds in the whole text.
+        references = []
+        position = 0
+        window_end = -1
+        for anchor in self.anchor_pattern.finditer(RegexUtil.fold_case(text)):
+            start = anchor.start()
+            if start < position:
+                continue
+            if window_end < start:
+                boundary = self.boundary_pattern.search(text, start)
+                window_end = boundary.start() if boundary else len(text)
+
+            match = self.pattern.match(text, start, window_end)
+            if match:
+                references.append(Reference(start=start, text_content=match.group()))
+                position = match.end()
+
+        return references
 
     @staticmethod
-    @Language.component(SPACY_COMPONENT_NAME, retokenizes=True, assigns=["token._.reference"])
-    def as_spacy_pipe_component(doc):
-        return ReferenceDetector._spacy_pipe_component_base(RegexReferenceDetector())(doc)
+    @Language.factory(SPACY_COMPONENT_NAME, default_config={"workers": 1, "alignment_mode": "strict"},
+                      retokenizes=True, assigns=["token._.reference"])
+    def as_spacy_pipe_component(nlp, name, workers: Optional[int], alignment_mode: str):
+        return ReferenceDetector._spacy_pipe_component_base(RegexReferenceDetector(), workers, alignment_mode)
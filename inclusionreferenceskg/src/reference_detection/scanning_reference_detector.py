@@ -0,0 +1,422 @@
+import re
+from typing import Dict, List, Optional
+
+from spacy import Language
+
+from reference_detection.reference_detector import ReferenceDetector
+from util.reference import Reference
+from util.regex_util import RegexUtil
+
+_NODE_NAMES_ROMAN = ("chapter", "title", "section")
+_NODE_NAMES_DECIMAL = ("article", "paragraph", "subparagraph", "sentence", "indent")
+_NODE_NAMES = _NODE_NAMES_ROMAN + _NODE_NAMES_DECIMAL
+_ORDINALS = ("first", "second", "third", "fourth", "fifth", "sixth")
+_CONJUNCTIONS = ("and", "or")
+_DOCUMENT_NAMES = ("Regulation", "Treaty", "Directive", "Decision")
+
+# The words a reference may start with, lower case. None of them is a prefix of another, so at most one of them starts
+# at any position.
+_KEYWORDS = _NODE_NAMES + _ORDINALS + ("point", "those", "this", "that", "the", "commission", "regulation", "council",
+                                       "directive", "decision")
+_KEYWORD = re.compile("|".join(_KEYWORDS))
+# Finds every position at which a keyword starts, including overlapping ones.
+_KEYWORD_STARTS = re.compile(f"(?=(?:{'|'.join(_KEYWORDS)}))")
+
+
+class ScanningReferenceDetector(ReferenceDetector):
+    """
+    Reference detector that matches the grammar of the RegexReferenceDetector with a hand-written scanner instead of
+    a regular expression.
+
+    Every rule of the grammar is a function that returns the end of its match or -1. Alternatives are tried in the
+    order of the regular expression and the first one that matches is taken, which yields the same matches, as the
+    remainder of a reference is optional. Apart from the chains of words in a treaty's name, no character is looked at
+    more than a constant number of times. These chains are shared by all matches attempted in them, so the time is
+    linear in the length of the text, while the regular expression backtracks through the chain at every "the treaty".
+    """
+
+    SPACY_COMPONENT_NAME = "reference_detector_component_scanning"
+
+    def detect(self, text: str) -> List[Reference]:
+        scan = _Scan(text)
+        references = []
+
+        position = 0
+        for keyword in _KEYWORD_STARTS.finditer(scan.folded):
+            i = keyword.start()
+            if i < position:
+                continue
+            end = scan.reference(i)
+            if end > i:
+                references.append(Reference(start=i, text_content=text[i:end]))
+                position = end
+
+        return references
+
+    @staticmethod
+    @Language.component(SPACY_COMPONENT_NAME, retokenizes=True, assigns=["token._.reference"])
+    def as_spacy_pipe_component(doc):
+        return ReferenceDetector._spacy_pipe_component_base(ScanningReferenceDetector())(doc)
+
+
+class _Scan:
+    """
+    The rules of RegexReferenceDetector.reference applied to a single text. Comments quote the corresponding parts of
+    the regular expression.
+    """
+
+    def __init__(self, text: str):
+        self.text = text
+        self.n = len(text)
+        self.folded = RegexUtil.fold_case(text)
+        # The furthest capitalized word reachable in a chain of words, per position in the chain.
+        self._capitals: Dict[int, Optional[int]] = dict()
+
+    # Characters and words
+
+    def literal(self, i: int, word: str) -> int:
+        return i + len(word) if i >= 0 and self.folded.startswith(word, i) else -1
+
+    def literal_case(self, i: int, word: str) -> int:
+        return i + len(word) if i >= 0 and self.text.startswith(word, i) else -1
+
+    def any_literal(self, i: int, words) -> int:
+        for word in words:
+            end = self.literal(i, word)
+            if end >= 0:
+                return end
+        return -1
+
+    def keyword(self, i: int) -> Optional[str]:
+        match = _KEYWORD.match(self.folded, i) if i >= 0 else None
+        return match.group() if match else None
+
+    def keyword_in(self, i: int, keywords) -> int:
+        keyword = self.keyword(i)
+        return i + len(keyword) if keyword in keywords else -1
+
+    def space(self, i: int) -> int:
+        # \s
+        return i + 1 if 0 <= i < self.n and self.text[i].isspace() else -1
+
+    def word_end(self, i: int) -> int:
+        # \w*
+        text, n = self.text, self.n
+        while i < n and (text[i].isalnum() or text[i] == "_"):
+            i += 1
+        return i
+
+    def number(self, i: int) -> int:
+        # [1-9][0-9]*
+        text, n = self.text, self.n
+        if not (0 <= i < n and "1" <= text[i] <= "9"):
+            return -1
+        i += 1
+        while i < n and "0" <= text[i] <= "9":
+            i += 1
+        return i
+
+    def roman(self, i: int) -> int:
+        # (?-i:[IXV]+)
+        start = i
+        while 0 <= i < self.n and self.text[i] in "IXV":
+            i += 1
+        return i if i > start >= 0 else -1
+
+    def paragraph(self, i: int) -> int:
+        # \([1-9][0-9]*\)
+        if not (0 <= i < self.n and self.text[i] == "("):
+            return -1
+        end = self.number(i + 1)
+        return end + 1 if 0 <= end < self.n and self.text[end] == ")" else -1
+
+    def alpha(self, i: int) -> int:
+        # \((?:[a-z]|ii)\)
+        if not (0 <= i < self.n and self.text[i] == "("):
+            return -1
+        if i + 2 < self.n and "a" <= self.folded[i + 1] <= "z" and self.text[i + 2] == ")":
+            return i + 3
+        if self.folded.startswith("ii", i + 1) and i + 3 < self.n and self.text[i + 3] == ")":
+            return i + 4
+        return -1
+
+    def plural_space(self, i: int) -> int:
+        # s?\s
+        if 0 <= i < self.n and self.folded[i] == "s" and self.space(i + 1) >= 0:
+            return i + 2
+        return self.space(i)
+
+    def thereof(self, i: int) -> int:
+        # (?:\sthereof)?
+        end = self.literal(self.space(i), "thereof")
+        return end if end >= 0 else i
+
+    # Enumerations
+
+    def item_or_range(self, i: int, item) -> int:
+        # item(?:\sto\sitem)?
+        end = item(i)
+        if end < 0:
+            return -1
+        range_end = item(self.space(self.literal(self.space(end), "to")))
+        return range_end if range_end >= 0 else end
+
+    def items(self, i: int, item) -> int:
+        # item_or_range(?:,\sitem_or_range)*(?:\s(?:and|or)\sitem_or_range)*
+        end = self.item_or_range(i, item)
+        if end < 0:
+            return -1
+        while end < self.n and self.text[end] == ",":
+            next_end = self.item_or_range(self.space(end + 1), item)
+            if next_end < 0:
+                break
+            end = next_end
+        while True:
+            next_end = self.item_or_range(self.space(self.any_literal(self.space(end), _CONJUNCTIONS)), item)
+            if next_end < 0:
+                return end
+            end = next_end
+
+    # Documents
+
+    def document_numbering(self, i: int) -> int:
+        # (?:\s\(\w{2,7}\))?(?:\sNo)?\s[1-9][0-9]*(?:\/[1-9][0-9]*)?(?:\/\w{2,7})
+        end = i
+        parenthesis = self.space(i)
+        if 0 <= parenthesis < self.n and self.text[parenthesis] == "(":
+            word_end = self.word_end(parenthesis + 1)
+            if 2 <= word_end - parenthesis - 1 <= 7 and word_end < self.n and self.text[word_end] == ")":
+                end = word_end + 1
+
+        no = self.literal(self.space(end), "no")
+        if no >= 0:
+            end = no
+
+        number = self.number(self.space(end))
+        if number < 0:
+            return -1
+        if number < self.n and self.text[number] == "/":
+            # The optional year or number is only taken if the mandatory suffix follows.
+            suffix = self.slash_word(self.number(number + 1))
+            if suffix >= 0:
+                return suffix
+        return self.slash_word(number)
+
+    def slash_word(self, i: int) -> int:
+        # \/\w{2,7}
+        if not (0 <= i < self.n and self.text[i] == "/"):
+            return -1
+        length = self.word_end(i + 1) - i - 1
+        return i + 1 + min(length, 7) if length >= 2 else -1
+
+    def document_numberings(self, i: int) -> int:
+        # numbering(?:,numbering)*(?:\s(?:and|or)numbering)*
+        end = self.document_numbering(i)
+        if end < 0:
+            return -1
+        while end < self.n and self.text[end] == ",":
+            next_end = self.document_numbering(end + 1)
+            if next_end < 0:
+                break
+            end = next_end
+        while True:
+            next_end = self.document_numbering(self.any_literal(self.space(end), _CONJUNCTIONS))
+            if next_end < 0:
+                return end
+            end = next_end
+
+    def plural_numberings(self, i: int) -> int:
+        # s?numberings
+        if 0 <= i < self.n and self.folded[i] == "s":
+            end = self.document_numberings(i + 1)
+            if end >= 0:
+                return end
+        return self.document_numberings(i)
+
+    def regulation(self, i: int, keyword: str, after: int) -> int:
+        # (?:Commission\s)?Regulations?numberings
+        if keyword == "commission":
+            return self.plural_numberings(self.literal(self.space(after), "regulation"))
+        if keyword == "regulation":
+            return self.plural_numberings(after)
+        return -1
+
+    def directive(self, i: int, keyword: str, after: int) -> int:
+        # (?:(?:the\sordinal\s)?Council\s)?(?-i:Directive|Decision)s?numberings
+        if keyword == "the":
+            start = self.space(self.literal(self.space(self.keyword_in(self.space(after), _ORDINALS)), "council"))
+        elif keyword == "council":
+            start = self.space(after)
+        elif keyword in ("directive", "decision"):
+            start = i
+        else:
+            return -1
+
+        for name in ("Directive", "Decision"):
+            end = self.plural_numberings(self.literal_case(start, name))
+            if end >= 0:
+                return end
+        return -1
+
+    def treaty(self, i: int, keyword: str, after: int) -> int:
+        if keyword != "the":
+            return -1
+
+        # the\streaty\s(?:\w*\s)+(?-i:[A-Z]\w*)
+        chain = self.space(self.literal(self.space(after), "treaty"))
+        if chain >= 0:
+            first = self.chain_next(chain)
+            capital = self.furthest_capital(first) if first >= 0 else None
+            if capital is not None:
+                return self.word_end(capital)
+
+        # the\s(?-i:[A-Z]{2,})
+        start = self.space(after)
+        if start < 0:
+            return -1
+        end = start
+        while end < self.n and "A" <= self.text[end] <= "Z":
+            end += 1
+        return end if end - start >= 2 else -1
+
+    def chain_next(self, i: int) -> int:
+        # \w*\s
+        return self.space(self.word_end(i))
+
+    def furthest_capital(self, i: int) -> Optional[int]:
+        """
+        Returns the last position in the chain of words starting at i that starts with a capital letter. As the
+        repetition is greedy, this is where the regular expression ends up after backtracking.
+        """
+        chain = []
+        while i >= 0 and i not in self._capitals:
+            chain.append(i)
+            i = self.chain_next(i)
+        capital = self._capitals.get(i) if i >= 0 else None
+
+        for position in reversed(chain):
+            if capital is None and position < self.n and "A" <= self.text[position] <= "Z":
+                capital = position
+            self._capitals[position] = capital
+        return capital
+
+    def document(self, i: int, keyword: str, after: int) -> int:
+        # regulation|directive|treaty|(?:this\s|that\s)(?-i:Regulation|Treaty|Directive|Decision)
+        for rule in (self.regulation, self.directive, self.treaty):
+            end = rule(i, keyword, after)
+            if end >= 0:
+                return end
+
+        if keyword not in ("this", "that"):
+            return -1
+        start = self.space(after)
+        for name in _DOCUMENT_NAMES:
+            end = self.literal_case(start, name)
+            if end >= 0:
+                return end
+        return -1
+
+    # References
+
+    def single(self, i: int) -> int:
+        keyword = self.keyword(i)
+        if keyword is None:
+            return -1
+        after = i + len(keyword)
+
+        # article\s[1-9][0-9]*paragraph(?:\sthereof)?
+        if keyword == "article":
+            end = self.paragraph(self.number(self.space(after)))
+            if end >= 0:
+                return self.thereof(end)
+
+        # (?:this|that|the\sprevious)\snode_name
+        if keyword in ("this", "that"):
+            end = self.keyword_in(self.space(after), _NODE_NAMES)
+        elif keyword == "the":
+            end = self.keyword_in(self.space(self.literal(self.space(after), "previous")), _NODE_NAMES)
+        else:
+            end = -1
+        if end >= 0:
+            return end
+
+        # node_name\s[1-9][0-9]*(?:\sthereof)?
+        if keyword in _NODE_NAMES:
+            end = self.number(self.space(after))
+            if end >= 0:
+                return self.thereof(end)
+
+        # node_name_roman\sroman(?:\sthereof)?
+        if keyword in _NODE_NAMES_ROMAN:
+            end = self.roman(self.space(after))
+            if end >= 0:
+                return self.thereof(end)
+
+        # (?:the\s)?ordinal\snode_name(?:\sthereof)?
+        if keyword == "the":
+            end = self.keyword_in(self.space(self.keyword_in(self.space(after), _ORDINALS)), _NODE_NAMES)
+        elif keyword in _ORDINALS:
+            end = self.keyword_in(self.space(after), _NODE_NAMES)
+        if end >= 0:
+            return self.thereof(end)
+
+        end = self.document(i, keyword, after)
+        if end >= 0:
+            return end
+
+        # point\salpha
+        return self.alpha(self.space(after)) if keyword == "point" else -1
+
+    def multi(self, i: int) -> int:
+        keyword = self.keyword(i)
+        if keyword is None:
+            return -1
+        after = i + len(keyword)
+
+        # article\s[1-9][0-9]*paragraphs(?:\sthereof)?
+        if keyword == "article":
+            end = self.items(self.number(self.space(after)), self.paragraph)
+            if end >= 0:
+                return self.thereof(end)
+
+        if keyword in _NODE_NAMES_DECIMAL:
+            # node_name_decimal\s[1-9][0-9]*alphas(?:\sthereof)?
+            end = self.items(self.number(self.space(after)), self.alpha)
+            if end >= 0:
+                return self.thereof(end)
+
+            # node_name_decimals?\snumbers(?:\sthereof)?
+            end = self.items(self.plural_space(after), self.number)
+            if end >= 0:
+                return self.thereof(end)
+
+        # node_name_romans?\sromans(?:\sthereof)?
+        if keyword in _NODE_NAMES_ROMAN:
+            end = self.items(self.plural_space(after), self.roman)
+            if end >= 0:
+                return self.thereof(end)
+
+        # those\snode_names
+        if keyword == "those":
+            return self.literal(self.keyword_in(self.space(after), _NODE_NAMES), "s")
+
+        # points?\salphas
+        if keyword == "point":
+            return self.items(self.plural_space(after), self.alpha)
+        return -1
+
+    def reference(self, i: int) -> int:
+        # (?:multi|single)(?:(?:\sof)?\ssingle)*
+        end = self.multi(i)
+        if end < 0:
+            end = self.single(i)
+        if end < 0:
+            return -1
+
+        while True:
+            next_end = self.single(self.space(self.literal(self.space(end), "of")))
+            if next_end < 0:
+                next_end = self.single(self.space(end))
+            if next_end < 0:
+                return end
+            end = next_end
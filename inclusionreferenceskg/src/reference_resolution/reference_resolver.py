@@ -4,7 +4,7 @@ import itertools
 import logging
 import re
 from collections import defaultdict
-from typing import List, Type
+from typing import List, Optional, Type
 
 from spacy import Language
 from spacy.tokens import Token
@@ -17,6 +17,7 @@ from document_parsing.node.node_traversal import traverse_doc_by_node
 from document_parsing.node.paragraph import Paragraph
 from document_parsing.node.point import Point
 from document_parsing.node.title import Title
+from document_parsing.node.tree_intervals import TreeIntervals
 from reference_detection.regex_reference_detector import RegexReferenceDetector
 from util.reference import Reference
 from util.regex_util import RegexUtil
@@ -30,15 +31,19 @@ class ReferenceResolver:
 
     SPACY_COMPONENT_NAME = "reference_resolver"
 
-    def resolve_single(self, node: Node, references: List[Reference]):
+    def resolve_single(self, node: Node, references: List[Reference], intervals: Optional[TreeIntervals] = None):
         """
         Creates reference qualifiers for a list of references.
 
         :param node: The node from which the references originate from.
         :param references: The references in the node.
+        :param intervals: The labels of the tree of the node, shared by the calls for the nodes of one tree. Created if
+                          not given or not containing the node.
         """
 
         patterns = []
+        if references and (intervals is None or node not in intervals):
+            intervals = TreeIntervals.containing(node)
         for reference in references:
             if reference.reference_qualifier:
                 logging.warning("Overriding exiting reference qualifier for reference.")
@@ -93,15 +98,13 @@ class ReferenceResolver:
             for resolved in patterns_translated:
                 highest_specified_node = min(resolved, key=lambda x: x.depth)
 
-                c = node
-                while c is not None and c.depth >= highest_specified_node.depth:
-                    c = c.parent
+                c = intervals.ancestor_at_depth(node, highest_specified_node.depth - 1)
 
                 specifier = []
-                while c is not None:
-                    if not c.ignore_when_forming_full_qualifier:
-                        specifier.append(self._node_to_node_pattern(c))
-                    c = c.parent
+                if c is not None:
+                    for a in [c] + intervals.ancestors(c):
+                        if not a.ignore_when_forming_full_qualifier:
+                            specifier.append(self._node_to_node_pattern(a))
                 resolved.extend(specifier)
                 resolved.sort(key=lambda x: x.depth)
 
@@ -230,7 +233,7 @@ class ReferenceResolver:
     @staticmethod
     def _resolve_document(text) -> List[Node]:
         """
-        Resolves references to documents. Names are not normalized.
+        Resolves references to documents. Names are normalized when they are matched, see titles_match.
         """
 
         # We handle the case of multiple directives separately.
@@ -487,10 +490,13 @@ class ReferenceResolver:
             raise AttributeError("ReferenceResolver requires tokens to have the reference extension.")
 
         reference_resolver = ReferenceResolver()
+        intervals = None
 
         for node, span in traverse_doc_by_node(doc):
             refs = [tok._.reference for tok in span if tok._.reference]
             if refs:
-                reference_resolver.resolve_single(node, refs)
+                if intervals is None or node not in intervals:
+                    intervals = TreeIntervals.containing(node)
+                reference_resolver.resolve_single(node, refs, intervals)
 
         return doc
@@ -0,0 +1,146 @@
+import itertools
+import uuid
+from abc import ABC, abstractmethod
+from collections import defaultdict
+from typing import Dict, Hashable, List, Type
+
+from spacy.tokens import Doc, Token
+
+from document_parsing.node.article import Article
+from document_parsing.node.chapter import Chapter
+from document_parsing.node.document import Document
+from document_parsing.node.indent import Indent
+from document_parsing.node.node import Node
+from document_parsing.node.node_traversal import pre_order
+from document_parsing.node.paragraph import Paragraph
+from document_parsing.node.point import Point
+from document_parsing.node.root import Root
+from document_parsing.node.section import Section
+from document_parsing.node.subparagraph import Subparagraph
+from document_parsing.node.title import Title
+
+
+class IdScheme(ABC):
+    """
+    Creates the ids of document nodes and of the items (phrases, predicates and phrase objects) of a knowledge graph.
+    All ids created by an instance are distinct.
+    """
+
+    @abstractmethod
+    def node_id(self, node: Node) -> Hashable:
+        """
+        :param node: A node of a finished document tree.
+        :return: The id of the node.
+        """
+        raise NotImplementedError()
+
+    @abstractmethod
+    def item_id(self, token: Token, kind: str) -> Hashable:
+        """
+        :param token: The token the item is created from, e.g. the first predicate of a phrase.
+        :param kind: The kind of item, one of "phrase", "pred" and "obj".
+        :return: The id of the item.
+        """
+        raise NotImplementedError()
+
+
+class UuidIdScheme(IdScheme):
+    """
+    Random uuid4 strings. These are the ids nodes and items receive when they are created.
+    """
+
+    def node_id(self, node: Node) -> str:
+        return str(uuid.uuid4())
+
+    def item_id(self, token: Token, kind: str) -> str:
+        return str(uuid.uuid4())
+
+
+class CounterIdScheme(IdScheme):
+    """
+    Consecutive integers. They are the cheapest ids to create, hash and store. An instance should be used per knowledge
+    graph.
+    """
+
+    def __init__(self, start: int = 0):
+        self._counter = itertools.count(start)
+
+    def node_id(self, node: Node) -> int:
+        return next(self._counter)
+
+    def item_id(self, token: Token, kind: str) -> int:
+        return next(self._counter)
+
+
+class PathIdScheme(IdScheme):
+    """
+    Ids derived from the position in the document, which stay the same across runs as long as the documents and the
+    pipeline are unchanged.
+
+    Nodes are identified by the path from their document, e.g. "GDPR/Art30/Par1/Sub1/Pt5". As in full qualifiers,
+    chapters, titles and sections are left out of the paths of their descendants. Items are identified by the
+    document, the index of their token and their kind, e.g. "GDPR#obj123". Should an id repeat, e.g. because two phrase
+    objects are created for the same token, a counter is appended: "GDPR#obj123~2".
+    """
+
+    segment_names: Dict[Type[Node], str] = {
+        Chapter: "Chap",
+        Title: "Tit",
+        Section: "Sec",
+        Article: "Art",
+        Paragraph: "Par",
+        Subparagraph: "Sub",
+        Point: "Pt",
+        Indent: "Ind",
+    }
+
+    def __init__(self):
+        self._issued: Dict[str, int] = defaultdict(int)
+
+    def node_id(self, node: Node) -> str:
+        if isinstance(node, Root):
+            return self._unique("Root")
+
+        segments: List[str] = [self._segment(node)]
+        curr = node.parent
+        while curr is not None and not isinstance(curr, Root):
+            if not curr.ignore_when_forming_full_qualifier or node.ignore_when_forming_full_qualifier:
+                segments.append(self._segment(curr))
+            curr = curr.parent
+
+        return self._unique("/".join(reversed(segments)))
+
+    def item_id(self, token: Token, kind: str) -> str:
+        document = token.doc._.document_structure if Doc.has_extension("document_structure") else None
+        while document is not None and not isinstance(document, Document):
+            document = document.parent
+
+        prefix = self._document_segment(document) if document is not None else "doc"
+        return self._unique(f"{prefix}#{kind}{token.i}")
+
+    def _segment(self, node: Node) -> str:
+        if isinstance(node, Document):
+            return self._document_segment(node)
+
+        name = self.segment_names.get(node.__class__, node.__class__.__name__)
+        return name if node.number is None else f"{name}{node.number}"
+
+    @staticmethod
+    def _document_segment(document: Node) -> str:
+        return (document.title or "Doc").replace("/", "_")
+
+    def _unique(self, id_: str) -> str:
+        self._issued[id_] += 1
+        count = self._issued[id_]
+        return id_ if count == 1 else f"{id_}~{count}"
+
+
+def assign_node_ids(root: Node, id_scheme: IdScheme):
+    """
+    Replaces the ids of all nodes of a tree with ids of the given scheme.
+
+    :param root: The root of the tree.
+    :param id_scheme: The scheme to use.
+    """
+    for node in pre_order(root):
+        node.id = id_scheme.node_id(node)
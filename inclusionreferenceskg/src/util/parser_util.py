@@ -1,48 +1,144 @@
-from typing import Tuple
+import copy
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Sequence, Tuple
 
 from document_parsing.document_tree_parser import DocumentTreeParser
 from document_parsing.node.document import Document
+from document_parsing.node.lazy_root import LazyRoot
+from document_parsing.node.node_traversal import pre_order
 from document_parsing.node.root import Root
+from document_parsing.parse_cache import ParseCache
 
+# (title, file name in ./resources/eu_documents) of the GDPR and the documents it refers to. The GDPR comes first.
+GDPR_DEPENDENCY_MANIFEST: List[Tuple[str, str]] = [
+    ("GDPR", "gdpr.txt"),
+    ("TEU", "teu.txt"),
+    ("Directive 95/46/EC", "directive_95_46_ec.txt"),
+    ("Directive 2000/31/EC", "directive_2000_31_EC.txt"),
+    ("Directive (EU) 2015/1535", "directive_eu_2015_1535.txt"),
+    ("EN-ISO/IEC 17065/2012", "mock_en_iso_17065_2012.txt"),
+    ("Regulation (EC) No 45/2001", "regulation_ec_45_2001.txt"),
+    ("Regulation (EU) No 182/2011", "regulation_eu_182_2011.txt"),
+    ("Regulation (EC) No 765/2008", "regulation_ev_765_2008.txt"),
+    ("Directive 2002/58/EC", "directive_2002_58_EC.txt"),
+    ("Regulation (EC) No 1049/2001", "regulation_ec_1049_2001.txt"),
+    ("Regulation (EEC) No 339/93", "regulation_eec_339_93.txt"),
+]
 
-def gdpr_dependency_root(parser: DocumentTreeParser = None) -> Tuple[Document, Root]:
+
+def gdpr_dependency_root(parser: DocumentTreeParser = None, workers: Optional[int] = None,
+                         lazy: bool = False, cache: Optional[ParseCache] = None) -> Tuple[Document, Root]:
     """
     Utility function for reading and parsing documents.
 
     :param parser: The parser to be used. If None, a default DocumentTreeParser is created.
+    :param workers: The number of processes used for parsing. See load_corpus.
+    :param lazy: If True, a LazyRoot is returned whose documents are only parsed once they are reached.
+    :param cache: If given, documents are loaded from and stored in this cache, e.g. ParseCache(), so that repeated
+                  runs do not parse them again. Defaults to the cache of the parser.
     :return: A tuple of the document and the root node with the documents referred to in the GDPR.
     """
 
-    docs = []
-    parser = parser or DocumentTreeParser()
+    parser = _with_cache(parser, cache)
+    if lazy:
+        document_root = LazyRoot(GDPR_DEPENDENCY_MANIFEST, parser)
+    else:
+        document_root = load_corpus(GDPR_DEPENDENCY_MANIFEST, parser, workers)
+
+    return document_root.children[0], document_root
+
+
+def load_corpus(manifest: Sequence[Tuple[str, str]], parser: DocumentTreeParser = None,
+                workers: Optional[int] = None, directory: str = "./resources/eu_documents",
+                cache: Optional[ParseCache] = None) -> Root:
+    """
+    Parses a corpus of documents in a process pool and collects them under a Root.
+
+    :param manifest: (title, file name) pairs of the documents. The documents are children of the root in this order.
+    :param parser: The parser to be used. If None, a default DocumentTreeParser is created. If the parser has a cache,
+                   cached documents are not parsed again and newly parsed documents are added to it.
+    :param workers: The number of worker processes. None uses one per CPU. With 1 (or a single document) the
+                    documents are parsed in the calling process.
+    :param directory: The directory the file names are relative to.
+    :param cache: If given, used instead of the cache of the parser.
+    :return: The root node of the corpus.
+    """
+
+    parser = _with_cache(parser, cache)
+    cache = parser.cache
+    if cache is not None:
+        # Cache lookups and writes are done here, the workers only parse.
+        worker_parser = copy.copy(parser)
+        worker_parser.cache = None
+    else:
+        worker_parser = parser
+
+    docs: List[Optional[Document]] = [None] * len(manifest)
+    keys: List[Optional[str]] = [None] * len(manifest)
+    tasks = []
+    indices = []
+    for i, (title, file_name) in enumerate(manifest):
+        path = os.path.join(directory, file_name)
+        text = None
+        if cache is not None:
+            with open(path, encoding="utf-8") as f:
+                text = f.read()
+            keys[i] = parser.cache_key(text)
+            docs[i] = cache.get(keys[i], title)
+            if docs[i] is not None:
+                continue
+
+        tasks.append((worker_parser, title, path, text))
+        indices.append(i)
+
+    if workers == 1 or len(tasks) <= 1:
+        parsed = [_parse_corpus_entry(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            parsed = list(executor.map(_parse_corpus_entry, tasks))
 
-    gdpr = parser.parse_from_eu_doc_file("GDPR", "gdpr.txt")
-    docs.append(gdpr)
-    docs.append(parser.parse_from_eu_doc_file("TEU",
-                                              "teu.txt"))
-    docs.append(parser.parse_from_eu_doc_file("Directive 95/46/EC",
-                                              "directive_95_46_ec.txt"))
-    docs.append(parser.parse_from_eu_doc_file("Directive 2000/31/EC",
-                                              "directive_2000_31_EC.txt"))
-    docs.append(parser.parse_from_eu_doc_file("Directive (EU) 2015/1535",
-                                              "directive_eu_2015_1535.txt"))
-    docs.append(parser.parse_from_eu_doc_file("EN-ISO/IEC 17065/2012",
-                                              "mock_en_iso_17065_2012.txt"))
-    docs.append(parser.parse_from_eu_doc_file("Regulation (EC) No 45/2001",
-                                              "regulation_ec_45_2001.txt"))
-    docs.append(parser.parse_from_eu_doc_file("Regulation (EU) No 182/2011",
-                                              "regulation_eu_182_2011.txt"))
-    docs.append(parser.parse_from_eu_doc_file("Regulation (EC) No 765/2008",
-                                              "regulation_ev_765_2008.txt"))
-    docs.append(parser.parse_from_eu_doc_file("Directive 2002/58/EC",
-                                              "directive_2002_58_ec.txt"))
-    docs.append(parser.parse_from_eu_doc_file("Regulation (EC) No 1049/2001",
-                                              "regulation_ec_1049_2001.txt"))
-    docs.append(parser.parse_from_eu_doc_file("Regulation (EEC) No 339/93",
-                                              "regulation_eec_339_93.txt"))
+    for i, doc in zip(indices, parsed):
+        docs[i] = doc
 
     document_root = Root(children=docs)
-    for doc in document_root.children:
+    for doc in docs:
+        # Parents were removed before the documents were sent back from the workers.
+        for node in pre_order(doc):
+            for child in node.children:
+                child.parent = node
         doc.parent = document_root
 
-    return gdpr, document_root
+    if cache is not None:
+        for i, doc in zip(indices, parsed):
+            cache.put(keys[i], doc)
+
+    return document_root
+
+
+def _with_cache(parser: Optional[DocumentTreeParser], cache: Optional[ParseCache]) -> DocumentTreeParser:
+    """
+    Returns the parser, or a default one, using the given cache. The given parser is not changed.
+    """
+    parser = parser or DocumentTreeParser()
+    if cache is not None and parser.cache is not cache:
+        parser = copy.copy(parser)
+        parser.cache = cache
+    return parser
+
+
+def _parse_corpus_entry(task: Tuple[DocumentTreeParser, str, str, Optional[str]]) -> Document:
+    """
+    Parses a single document of a corpus. The parent pointers are removed so that the returned tree is cheap to pickle.
+    They must be restored by the caller.
+    """
+    parser, title, path, text = task
+    if text is None:
+        with open(path, encoding="utf-8") as f:
+            text = f.read()
+    doc = parser.parse_document(title, text)
+
+    for node in pre_order(doc):
+        node.parent = None
+
+    return doc
@@ -1,3 +1,8 @@
+# Under re.IGNORECASE, these characters match ASCII letters. They are folded before lower casing, which keeps the
+# length of the text ("İ".lower() has two characters).
+_SPECIAL_FOLDS = str.maketrans({"İ": "i", "ı": "i", "ſ": "s", "K": "k"})
+
+
 class RegexUtil:
     number = r"(?:[1-9][0-9]*)"
     alpha = r"(?:\((?:[a-z]|ii)\))"
@@ -8,3 +13,14 @@ class RegexUtil:
 
     # limited conjunctions, "as well as" is present in the GDPR
     conjunction = fr"(?:and|or)"
+
+    @staticmethod
+    def fold_case(text: str) -> str:
+        """
+        Lower cases a text without changing its length. A lower case literal matches the folded text at a position
+        whenever it matches the text there under re.IGNORECASE.
+        """
+        folded = text.translate(_SPECIAL_FOLDS).lower()
+        if len(folded) != len(text):
+            folded = "".join(c if len(c.lower()) != 1 else c.lower() for c in text.translate(_SPECIAL_FOLDS))
+        return folded
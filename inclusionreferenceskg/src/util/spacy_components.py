@@ -1,6 +1,9 @@
 import logging
 
 from spacy import Language
+from spacy.tokens import Doc
+
+from document_parsing.node.resolution_cache import ResolutionCache
 
 REFERENCE_QUALIFIER_RESOLVER_COMPONENT = "reference_qualifier_resolver_component"
 
@@ -8,11 +11,15 @@ REFERENCE_QUALIFIER_RESOLVER_COMPONENT = "reference_qualifier_resolver_component
 @Language.component(REFERENCE_QUALIFIER_RESOLVER_COMPONENT, requires=["token._.reference", "doc._.reference_base"])
 def reference_qualifier_resolver_component(doc):
     root = doc._.reference_base
+    # Shared by the docs of one pipeline run if set up by nlp_doc, otherwise created for this doc.
+    cache = doc._.resolution_cache if Doc.get_extension("resolution_cache") else None
+    if cache is None or cache.root is not root:
+        cache = ResolutionCache(root)
     for tok in doc:
         if tok._.reference:
             for qual in tok._.reference.reference_qualifier:
-                # We choose the first possible node
-                targets = root.resolve_loose(qual)
+                # We choose the first possible node. A second one is only looked for to warn about ambiguity.
+                targets = cache.resolve(qual, limit=2)
                 if len(targets) > 1:
                     logging.warning(f"Got more than one possible target for reference '{tok._.reference.text_content}'")
 
@@ -0,0 +1,31 @@
+import os
+
+import pytest
+
+from document_parsing.document_tree_parser import DocumentTreeParser
+from document_parsing.node.root import Root
+
+
+@pytest.fixture(scope="session")
+def eu_documents() -> str:
+    """
+    The directory of the bundled EU documents.
+    """
+    return os.path.join(os.path.dirname(__file__), "..", "resources", "eu_documents")
+
+
+@pytest.fixture(scope="session")
+def gdpr_text(eu_documents) -> str:
+    with open(os.path.join(eu_documents, "gdpr.txt"), encoding="utf-8") as f:
+        return f.read()
+
+
+@pytest.fixture(scope="session")
+def gdpr_root(gdpr_text) -> Root:
+    """
+    A root with the GDPR parsed by a default DocumentTreeParser. It is parsed once and shared, so tests must not change
+    it. Tests changing the tree parse gdpr_text themselves.
+    """
+    root = Root()
+    root.add_child(DocumentTreeParser().parse_document("GDPR", gdpr_text))
+    return root
@@ -0,0 +1,45 @@
+from document_parsing.node.article import Article
+from document_parsing.node.compact_tree import CompactTree
+from document_parsing.node.document import Document
+from document_parsing.node.node_traversal import pre_order, same_structure
+from document_parsing.node.paragraph import Paragraph
+from document_parsing.node.point import Point
+
+
+def test_compact_tree_mirrors_object_tree(gdpr_root):
+    root = gdpr_root
+
+    for keep_ids in (True, False):
+        compact = CompactTree(root, keep_ids=keep_ids)
+
+        assert len(compact) == sum(1 for _ in pre_order(root))
+        assert same_structure(compact.root, root)
+        assert compact.root.parent is None
+
+        for node in pre_order(compact.root):
+            for child in node.children:
+                assert child.parent == node
+                assert child.depth == child.__class__.depth
+
+    compact = CompactTree(root)
+    assert [n.immutable_view() for n in pre_order(compact.root)] == [n.immutable_view() for n in pre_order(root)]
+    assert len({n.id for n in pre_order(CompactTree(root, keep_ids=False).root)}) == len(compact)
+
+
+def test_compact_tree_resolve_loose(gdpr_root):
+    root = gdpr_root
+    compact = CompactTree(root)
+
+    patterns = [
+        [Article(number=30)],
+        [Document(title="gdpr"), Article(number=30), Paragraph(number=1), Point(number=5)],
+        [Paragraph(number=2), Point(number=1)],
+        [Article(number=1000)],
+    ]
+
+    for pattern in patterns:
+        expected = [n.id for n in root.resolve_loose(pattern)]
+        actual = compact.root.resolve_loose(pattern)
+
+        assert [n.id for n in actual] == expected
+        assert all(isinstance(n, pattern[-1].__class__) for n in actual)
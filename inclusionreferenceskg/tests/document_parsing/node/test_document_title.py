@@ -0,0 +1,44 @@
+from document_parsing.node.article import Article
+from document_parsing.node.document import Document
+from document_parsing.node.document_title import DocumentKey, DocumentTitleIndex, document_key, titles_match
+from document_parsing.node.node_index import NodeIndex
+from document_parsing.node.root import Root
+
+TITLES = ["GDPR", "TEU", "Directive 95/46/EC", "Directive (EU) 2015/1535", "Regulation (EC) No 45/2001",
+          "Regulation (EEC) No 339/93", "EN-ISO/IEC 17065/2012"]
+
+
+def test_document_key():
+    assert document_key("Directive 95/46/EC") == DocumentKey("directive", 1995, 46, "EC")
+    assert document_key("Council Directive 95/46/EC of 24 October 1995") == DocumentKey("directive", 1995, 46, "EC")
+    assert document_key("Directive (EU) 2015/1535") == DocumentKey("directive", 2015, 1535, "EU")
+    assert document_key("Regulation (EC) No 45/2001") == DocumentKey("regulation", 2001, 45, "EC")
+    assert document_key("Regulation (EEC) No 339/93") == DocumentKey("regulation", 1993, 339, "EEC")
+    assert document_key("the Treaty on European Union") is None
+
+    assert titles_match("Regulation (EC) No. 45/2001", "Regulation (EC) No 45/2001")
+    assert titles_match("Directive 95/46", "Directive 95/46/EC")
+    assert not titles_match("Directive 95/46/EU", "Directive 95/46/EC")
+    assert not titles_match("Regulation 95/46/EC", "Directive 95/46/EC")
+
+
+def test_lookup_matches_titles_match():
+    documents = [Document(title=t) for t in TITLES]
+    index = DocumentTitleIndex(documents)
+
+    for title in TITLES + ["gdpr", "Directive", "the Treaty on European Union (TEU)", "Regulation (EC) No. 45/2001",
+                           "Directives 95/46/EC and 2002/58/EC", "EU", "17065", ""]:
+        assert index.lookup(title) == [d for d in documents if titles_match(title, d.title)], title
+
+
+def test_node_index_uses_canonical_titles():
+    root = Root()
+    for title in TITLES:
+        document = Document(title=title)
+        document.add_child(Article(number=1))
+        root.add_child(document)
+
+    matches = NodeIndex(root).resolve_loose([Document(title="Regulation (EC) No. 45/2001"), Article(number=1)])
+
+    assert [m.parent.title for m in matches] == ["Regulation (EC) No 45/2001"]
+    assert matches == root.resolve_loose([Document(title="Regulation (EC) No. 45/2001"), Article(number=1)])
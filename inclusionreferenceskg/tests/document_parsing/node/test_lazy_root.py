@@ -0,0 +1,61 @@
+import pytest
+
+from document_parsing.document_tree_parser import DocumentTreeParser
+from document_parsing.node.article import Article
+from document_parsing.node.document import Document
+from document_parsing.node.lazy_root import LazyRoot
+from document_parsing.node.node_index import NodeIndex
+from document_parsing.node.node_traversal import pre_order
+from document_parsing.node.paragraph import Paragraph
+from document_parsing.node.resolution_cache import ResolutionCache
+from document_parsing.node.tree_intervals import TreeIntervals
+from util.parser_util import load_corpus
+
+MANIFEST = [("GDPR", "gdpr.txt"), ("TEU", "teu.txt"), ("Directive 95/46/EC", "directive_95_46_ec.txt")]
+
+
+@pytest.fixture
+def root(eu_documents):
+    return LazyRoot(MANIFEST, DocumentTreeParser(), eu_documents)
+
+
+def test_only_referenced_documents_are_parsed(root, eu_documents):
+    assert [d.title for d in root.documents("95/46")] == ["Directive 95/46/EC"]
+    assert root.loaded_documents() == []
+
+    paragraph = root.resolve_first([Document(title="GDPR"), Article(number=5), Paragraph(number=1)])
+
+    assert paragraph.parent.title == "Principles relating to processing of personal data"
+    assert root.loaded_documents() == [root.children[0]]
+
+    eager = load_corpus(MANIFEST[:1], directory=eu_documents)
+    assert paragraph.content == eager.resolve_first([Article(number=5), Paragraph(number=1)]).content
+
+
+def test_traversals_load_every_document(root, eu_documents):
+    intervals = TreeIntervals(root)
+    assert len(intervals) == 1 + len(MANIFEST) and root.loaded_documents() == []
+
+    nodes = list(pre_order(root))
+
+    assert len(root.loaded_documents()) == len(MANIFEST)
+    assert TreeIntervals.containing(root.children[0]).nodes == nodes
+    assert len(nodes) == len(list(pre_order(load_corpus(MANIFEST, directory=eu_documents))))
+
+
+def test_resolution_cache_does_not_load_the_corpus(root):
+    cache = ResolutionCache(root)
+    pattern = [Document(title="TEU"), Article(number=4)]
+
+    first = cache.resolve(pattern)
+    assert cache.resolve(pattern) == first and len(first) == 1
+    assert (cache.stats.hits, cache.stats.invalidations) == (1, 0)
+    assert root.loaded_documents() == [root.children[1]]
+
+
+def test_node_index_of_lazy_root_is_not_stale(root):
+    index = NodeIndex.of(root)
+
+    assert len(root.loaded_documents()) == len(MANIFEST)
+    assert not index.is_stale()
+    assert NodeIndex.of(root) is index
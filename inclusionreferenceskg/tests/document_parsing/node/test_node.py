@@ -1,11 +1,11 @@
 from document_parsing.node.article import Article
 from document_parsing.node.chapter import Chapter
 from document_parsing.node.document import Document
+from document_parsing.node.node_traversal import pre_order, same_structure
 from document_parsing.node.paragraph import Paragraph
 from document_parsing.node.point import Point
 from document_parsing.node.subparagraph import Subparagraph
 
-
 def _test_structure():
     return Document(title="Test Regulation", children=[
         Chapter(number=2, title="Principles", children=[
@@ -109,3 +109,56 @@ def test_resolve_loose():
 
     query3 = [x for x in test_structure.resolve_loose([Article(number=5), Point(number=7)])]
     assert len(query3) == 0
+
+
+def test_resolve_iter_and_first():
+    test_structure = _test_structure()
+    pattern = [Article(number=-1)]
+
+    matches = test_structure.resolve_iter(pattern)
+    assert next(matches).number == 5
+    assert [x.number for x in matches] == [6]
+
+    assert test_structure.resolve_first(pattern) is test_structure.resolve_loose(pattern)[0]
+    assert test_structure.resolve_first([Article(number=5), Point(number=7)]) is None
+    assert test_structure.resolve_loose(pattern, limit=1) == test_structure.resolve_loose(pattern)[:1]
+    assert len(test_structure.resolve_loose([Point(number=-1)], limit=2)) == 2
+
+
+def test_nodes_compare_by_identity():
+    a, b = _test_structure(), _test_structure()
+
+    assert a != b and a == a
+    assert a.children[0] != b.children[0]
+    assert len({a, b, a.children[0], b.children[0]}) == 4
+    assert {a: 1}[a] == 1
+    assert a.children[0].children.index(a.children[0].children[0]) == 0
+
+
+class _Untouchable(list):
+    """
+    Children that fail the test when they are looked at.
+    """
+
+    def _fail(self, *args):
+        raise AssertionError("The children were accessed.")
+
+    __eq__ = __ne__ = __iter__ = __len__ = __getitem__ = _fail
+    __hash__ = None
+
+
+def test_comparing_trees_does_not_walk_them():
+    a, b = _test_structure(), _test_structure()
+
+    # The trees are equal in structure, but comparing them must neither recurse into the children nor follow the
+    # parents.
+    assert same_structure(a, b)
+    assert a != b
+    assert a.children[0].children[0] != b.children[0].children[0]
+
+    nodes = set(pre_order(a)) | set(pre_order(b))
+    assert len(nodes) == 2 * len(list(pre_order(a)))
+
+    a.children, b.children = _Untouchable(a.children), _Untouchable(b.children)
+    assert a != b and a == a
+    assert len({a, b}) == 2
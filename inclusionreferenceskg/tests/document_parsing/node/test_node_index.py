@@ -0,0 +1,105 @@
+import random
+
+import pytest
+
+from document_parsing.node.article import Article
+from document_parsing.node.document import Document
+from document_parsing.node.node_index import NodeIndex
+from document_parsing.node.node_traversal import pre_order
+from document_parsing.node.paragraph import Paragraph
+from document_parsing.node.point import Point
+from document_parsing.node.root import Root
+from document_parsing.node.subparagraph import Subparagraph
+from document_parsing.node.title import Title
+from util.parser_util import load_corpus
+
+MANIFEST = [
+    ("GDPR", "gdpr.txt"),
+    ("Directive 95/46/EC", "directive_95_46_ec.txt"),
+    ("Regulation (EC) No 45/2001", "regulation_ec_45_2001.txt"),
+]
+
+
+@pytest.fixture(scope="module")
+def root(eu_documents):
+    return load_corpus(MANIFEST, workers=1, directory=eu_documents)
+
+
+def _patterns(root, count, seed=0):
+    """
+    Patterns derived from the paths of random nodes, with elements left out or turned into wildcards.
+    """
+    rnd = random.Random(seed)
+    nodes = list(pre_order(root))
+    for _ in range(count):
+        path = []
+        node = rnd.choice(nodes)
+        while node is not None and not isinstance(node, Root):
+            path.append(node)
+            node = node.parent
+        path.reverse()
+
+        pattern = []
+        for i, node in enumerate(path):
+            if i < len(path) - 1 and rnd.random() < 0.4:
+                continue
+            number = -1 if rnd.random() < 0.2 else node.number
+            title = node.title if isinstance(node, Document) or rnd.random() < 0.1 else None
+            if isinstance(node, Document) and rnd.random() < 0.5:
+                title = node.title.split()[0]
+            pattern.append(node.__class__(number=number, title=title))
+        yield pattern
+
+
+def test_index_matches_resolve_loose(root):
+    index = NodeIndex(root)
+    assert len(index) == len(list(pre_order(root)))
+
+    for pattern in _patterns(root, 2000):
+        assert index.resolve_loose(pattern) == root.resolve_loose(pattern), pattern
+
+
+def test_index_matches_resolve_loose_for_references(root):
+    index = NodeIndex(root)
+    gdpr = root.children[0]
+    patterns = [
+        [Document(title="GDPR"), Article(number=30), Paragraph(number=1), Point(number=5)],
+        [Article(number=30), Paragraph(number=1)],
+        [Article(number=-1), Point(number=1)],
+        [Document(title="Directive 95/46/EC"), Article(number=2)],
+        [Document(title="directive"), Article(number=2)],
+        [Title(title="Data protection", number=-1)],
+        [Paragraph(number=1), Subparagraph(number=2)],
+        [Article(number=400)],
+    ]
+
+    for pattern in patterns:
+        assert index.resolve_loose(pattern) == root.resolve_loose(pattern), pattern
+        assert index.resolve_loose(pattern, gdpr) == gdpr.resolve_loose(pattern), pattern
+
+
+def test_ancestry(root):
+    index = NodeIndex(root)
+    point = root.resolve_loose([Document(title="GDPR"), Article(number=30), Paragraph(number=1), Point(number=5)])[0]
+
+    ancestors = index.ancestors(point)
+    assert ancestors[-1] is root and ancestors[0] is point.parent
+    assert all(index.is_ancestor(a, point) for a in ancestors)
+    assert not index.is_ancestor(point, point)
+    assert Article(number=30) not in index
+    with pytest.raises(KeyError):
+        index.position(Article(number=30))
+
+
+def test_of_reuses_index(root):
+    assert NodeIndex.of(root) is NodeIndex.of(root)
+    assert NodeIndex.of(root.children[0]) is not NodeIndex.of(root)
+
+
+def test_limit_and_first(root):
+    index = NodeIndex(root)
+    pattern = [Article(number=-1), Point(number=1)]
+
+    assert index.resolve_loose(pattern, limit=2) == root.resolve_loose(pattern)[:2]
+    assert index.resolve_first(pattern) is root.resolve_first(pattern)
+    assert index.resolve_first([Article(number=400)]) is None
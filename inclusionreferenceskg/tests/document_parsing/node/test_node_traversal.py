@@ -0,0 +1,55 @@
+from document_parsing.document_tree_parser import DocumentTreeParser
+from document_parsing.node.article import Article
+from document_parsing.node.compact_tree import CompactTree
+from document_parsing.node.node_traversal import level_order, post_order, pre_order
+
+TEXT = "Article 1\n\nSubject\n\n1. First.\n\n(a) point;\n\n2. Second.\n\nArticle 2\n\nScope\n\n1. Third."
+
+
+def _names(nodes):
+    return [f"{n.__class__.__name__}{n.number or ''}" for n in nodes]
+
+
+def test_orders():
+    document = DocumentTreeParser().parse_document("GDPR", TEXT)
+
+    assert _names(pre_order(document)) == ["Document", "Article1", "Paragraph1", "Subparagraph1", "Point1",
+                                           "Paragraph2", "Subparagraph1", "Article2", "Paragraph1", "Subparagraph1"]
+    assert _names(post_order(document)) == ["Point1", "Subparagraph1", "Paragraph1", "Subparagraph1", "Paragraph2",
+                                            "Article1", "Subparagraph1", "Paragraph1", "Article2", "Document"]
+    assert _names(level_order(document)) == ["Document", "Article1", "Article2", "Paragraph1", "Paragraph2",
+                                             "Paragraph1", "Subparagraph1", "Subparagraph1", "Subparagraph1", "Point1"]
+
+    compact = CompactTree(document).root
+    assert _names(pre_order(compact)) == _names(pre_order(document))
+    assert _names(level_order(compact.children[0])) == _names(level_order(document.children[0]))
+
+
+def test_cached_orders_follow_changes():
+    document = DocumentTreeParser().parse_document("GDPR", TEXT)
+    article = document.children[0]
+    before = list(pre_order(article, cached=True))
+    assert list(pre_order(article, cached=True)) == before
+    assert _names(level_order(document, cached=True)) == _names(level_order(document))
+
+    new = Article(number=3)
+    document.add_child(new)
+    assert list(pre_order(document, cached=True))[-1] is new
+    assert list(post_order(document, cached=True))[-2] is new
+
+    paragraph = article.children[0]
+    article.children.remove(paragraph)
+    article.touch()
+    assert paragraph not in list(pre_order(article, cached=True))
+
+
+def test_orders_see_direct_changes():
+    document = DocumentTreeParser().parse_document("GDPR", TEXT)
+    assert len(list(pre_order(document, cached=True))) == 10
+
+    new = Article(number=3)
+    document.children.append(new)
+
+    assert list(pre_order(document))[-1] is new
+    assert list(post_order(document))[-2] is new
+    assert list(level_order(document))[3] is new
@@ -0,0 +1,97 @@
+from document_parsing.document_tree_parser import DocumentTreeParser
+from document_parsing.node.article import Article
+from document_parsing.node.document import Document
+from document_parsing.node.node_index import NodeIndex
+from document_parsing.node.paragraph import Paragraph
+from document_parsing.node.qualifier import QualifierElement, qualifier_key, qualifier_pattern
+from document_parsing.node.resolution_cache import ResolutionCache
+from document_parsing.node.root import Root
+
+TEXT = "Article 1\n\nSubject\n\n1. First.\n\n2. Second.\n\nArticle 2\n\nScope\n\n1. Third."
+
+
+def _root():
+    root = Root()
+    root.add_child(DocumentTreeParser().parse_document("GDPR", TEXT))
+    return root
+
+
+def test_qualifier_key():
+    pattern = [Document(title="GDPR"), Article(number=1), None]
+    key = qualifier_key(pattern)
+
+    assert key == (QualifierElement(Document, None, "GDPR"), QualifierElement(Article, 1), None)
+    assert key == qualifier_key([Document(title="GDPR"), Article(number=1), None])
+    assert hash(key) == hash(qualifier_key(key))
+    assert qualifier_key(qualifier_pattern(key)) == key
+
+
+def test_equal_qualifiers_share_entries():
+    root = _root()
+    cache = ResolutionCache(root)
+
+    first = cache.resolve([Document(title="GDPR"), Article(number=1), Paragraph(number=2)])
+    second = cache.resolve([Document(title="GDPR"), Article(number=1), Paragraph(number=2)])
+    third = cache.resolve(qualifier_key([Document(title="GDPR"), Article(number=1), Paragraph(number=2)]))
+
+    assert first == second == third == root.resolve_loose([Article(number=1), Paragraph(number=2)])
+    assert first[0] is second[0]
+    assert (cache.stats.hits, cache.stats.misses) == (2, 1)
+
+    assert cache.resolve([Paragraph(number=-1)], limit=1) == root.resolve_loose([Paragraph(number=-1)])[:1]
+    assert cache.stats.misses == 2
+
+
+def test_least_recently_used_entries_are_evicted():
+    cache = ResolutionCache(_root(), max_size=2)
+
+    cache.resolve([Article(number=1)])
+    cache.resolve([Article(number=2)])
+    cache.resolve([Article(number=1)])
+    cache.resolve([Article(number=3)])
+
+    assert len(cache) == 2 and cache.stats.evictions == 1
+    cache.resolve([Article(number=1)])
+    assert cache.stats.hits == 2
+    cache.resolve([Article(number=2)])
+    assert cache.stats.misses == 4
+
+
+def test_cache_is_invalidated_when_the_tree_changes():
+    root = _root()
+    cache = ResolutionCache(root)
+    document = root.children[0]
+    assert cache.resolve([Article(number=3)]) == []
+
+    version = root.structure_version
+    article = Article(number=3, title="New")
+    document.add_child(article)
+    assert root.structure_version == document.structure_version == version + 1
+
+    assert cache.resolve([Article(number=3)]) == [article]
+    assert cache.stats.invalidations == 1
+
+    article.number = 4
+    article.touch()
+    assert cache.resolve([Article(number=3)]) == []
+    assert cache.resolve([Article(number=4)]) == [article]
+
+
+def test_structure_version_is_kept_per_tree():
+    a, b = _root(), _root()
+    a.children[0].add_child(Article(number=3))
+
+    assert a.structure_version == 2 and b.structure_version == 1
+    assert "_structure_version" not in repr(Article(number=3))
+
+
+def test_index_of_is_rebuilt_after_reparse():
+    parser = DocumentTreeParser(keep_trace=True)
+    document = parser.parse_document("GDPR", TEXT)
+    index = NodeIndex.of(document)
+
+    parser.reparse(document, TEXT + "\n\nArticle 3\n\nNew")
+
+    assert index.is_stale()
+    assert NodeIndex.of(document) is not index
+    assert [a.title for a in NodeIndex.of(document).resolve_loose([Article(number=3)])] == ["New"]
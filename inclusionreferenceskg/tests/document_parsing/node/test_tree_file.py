@@ -0,0 +1,63 @@
+import pytest
+
+from document_parsing.document_tree_parser import DocumentTreeParser
+from document_parsing.node.article import Article
+from document_parsing.node.document import Document
+from document_parsing.node.lazy_root import LazyRoot
+from document_parsing.node.node_traversal import pre_order, same_structure
+from document_parsing.node.paragraph import Paragraph
+from document_parsing.node.root import Root
+from document_parsing.node.tree_file import load_tree, save_tree
+
+def test_loaded_tree_equals_saved_tree(tmp_path, gdpr_root):
+    root = gdpr_root
+    path = str(tmp_path / "gdpr.tree")
+
+    for keep_ids in (True, False):
+        save_tree(root, path, keep_ids=keep_ids)
+        tree = load_tree(path)
+
+        assert len(tree) == sum(1 for _ in pre_order(root))
+        assert same_structure(tree.root, root)
+        assert ([n.id for n in pre_order(tree.root)] == [n.id for n in pre_order(root)]) == keep_ids
+
+    paragraph = tree.root.resolve_first([Article(number=5), Paragraph(number=2)])
+    assert paragraph.content == root.resolve_first([Article(number=5), Paragraph(number=2)]).content
+
+
+def test_to_node_creates_object_tree(tmp_path, gdpr_root):
+    root = gdpr_root
+    save_tree(root, str(tmp_path / "gdpr.tree"))
+
+    loaded = load_tree(str(tmp_path / "gdpr.tree")).root.to_node()
+
+    assert isinstance(loaded, Root) and loaded.parent is None
+    assert [(n.number, n.title, n.content) for n in pre_order(loaded)] == \
+           [(n.number, n.title, n.content) for n in pre_order(root)]
+    for node in pre_order(loaded):
+        for child in node.children:
+            assert child.parent is node
+
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / "other.tree"
+    path.write_bytes(b"Article 1")
+
+    with pytest.raises(ValueError):
+        load_tree(str(path))
+
+
+def test_lazy_root_round_trip(tmp_path, eu_documents):
+    root = LazyRoot([("GDPR", "gdpr.txt"), ("TEU", "teu.txt")], DocumentTreeParser(), eu_documents)
+    path = str(tmp_path / "lazy.tree")
+
+    save_tree(root, path)
+    tree = load_tree(path)
+
+    assert tree.root.__class__ is Root
+    assert {d.__class__ for d in tree.root.children} == {Document}
+    loaded = tree.root.to_node()
+    assert loaded.__class__ is Root and all(d.__class__ is Document for d in loaded.children)
+    assert [(n.number, n.title, n.content) for n in pre_order(loaded)] == \
+           [(n.number, n.title, n.content) for n in pre_order(root)]
+    assert tree.root.children[0].to_node().title == root.children[0].title
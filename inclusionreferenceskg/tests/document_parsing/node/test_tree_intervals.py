@@ -0,0 +1,57 @@
+from document_parsing.document_tree_parser import DocumentTreeParser
+from document_parsing.node.article import Article
+from document_parsing.node.document import Document
+from document_parsing.node.node_traversal import pre_order
+from document_parsing.node.paragraph import Paragraph
+from document_parsing.node.point import Point
+from document_parsing.node.root import Root
+from document_parsing.node.tree_intervals import TreeIntervals
+
+def test_descendants_match_pre_order(gdpr_root):
+    root = gdpr_root
+    intervals = TreeIntervals(root)
+
+    assert intervals.nodes == list(pre_order(root))
+    for node in intervals.nodes[::37]:
+        descendants = list(pre_order(node))
+        assert intervals.descendants(node) == descendants
+        assert len(intervals.descendants_range(node)) == len(descendants)
+        assert all(intervals.is_descendant(d, node) for d in descendants[1:])
+        assert not intervals.is_descendant(node, node)
+        assert intervals.levels[intervals.position(node)] == len(intervals.ancestors(node))
+
+
+def test_ancestor_at_depth(gdpr_root):
+    root = gdpr_root
+    intervals = TreeIntervals(root)
+    point = root.resolve_first([Article(number=30), Paragraph(number=1), Point(number=5)])
+
+    assert intervals.ancestor_at_depth(point, Paragraph) is point.parent.parent
+    assert intervals.ancestor_at_depth(point, Paragraph.depth) is point.parent.parent
+    assert intervals.ancestor_at_depth(point, Point) is point
+    assert intervals.ancestor_at_depth(point, Document) is root.children[0]
+    assert intervals.ancestor_at_depth(point, Root.depth - 1) is None
+
+    for node in intervals.nodes:
+        expected = node
+        while expected is not None and expected.depth > Article.depth:
+            expected = expected.parent
+        assert intervals.ancestor_at_depth(node, Article) is expected
+
+
+def test_containing_follows_changes(gdpr_text):
+    document = DocumentTreeParser().parse_document("GDPR", gdpr_text)
+    root = Root()
+    root.add_child(document)
+    intervals = TreeIntervals.containing(document.children[0])
+
+    assert intervals.root is root
+    assert TreeIntervals.containing(document) is not intervals
+
+    article = Article(number=100)
+    # Changed directly, without Node.add_child or Node.touch.
+    document.children.append(article)
+    article.parent = document
+    updated = TreeIntervals.containing(article)
+    assert article not in intervals
+    assert updated.descendants(document)[-1] is article
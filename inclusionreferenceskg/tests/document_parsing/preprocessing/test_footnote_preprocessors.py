@@ -0,0 +1,52 @@
+from document_parsing.preprocessing.footnote_append_preprocessor import FootnoteAppendPreprocessor
+from document_parsing.preprocessing.footnote_delete_preprocessor import FootnoteDeletePreprocessor
+
+BLOCKS = [
+    "Text referring to a footnote (1)",
+    "A paragraph reference in Article 5, (2) and in paragraph 1 and (2)",
+    "Another reference (1) to the first footnote",
+    "(1) OJ L 1. See (3)",
+    "(2) Not referenced",
+    "Text after the footnotes",
+    "(3) Referred to by the first footnote",
+    "(4) Not referenced either",
+]
+
+
+def test_footnote_append():
+    assert list(FootnoteAppendPreprocessor.process(BLOCKS)) == [
+        "Text referring to a footnote (1)",
+        "A paragraph reference in Article 5, (2) and in paragraph 1 and (2)",
+        "Another reference (1) to the first footnote (1) OJ L 1. See (3) (3) Referred to by the first footnote",
+        "(2) Not referenced",
+        "Text after the footnotes",
+        "(4) Not referenced either",
+    ]
+
+
+def test_footnote_delete():
+    assert list(FootnoteDeletePreprocessor.process(BLOCKS)) == [
+        "Text referring to a footnote (1)",
+        "A paragraph reference in Article 5, (2) and in paragraph 1 and (2)",
+        "Another reference (1) to the first footnote",
+        "(2) Not referenced",
+        "Text after the footnotes",
+        "(3) Referred to by the first footnote",
+        "(4) Not referenced either",
+    ]
+
+
+def test_footnote_lookback_when_streaming():
+    blocks = ["Reference (1)", "Filler", "Filler", "(1) Footnote"]
+
+    class ShortLookbackAppend(FootnoteAppendPreprocessor):
+        stream_lookback = 2
+
+    class ShortLookbackDelete(FootnoteDeletePreprocessor):
+        stream_lookback = 2
+
+    assert list(FootnoteAppendPreprocessor.process_stream(blocks)) == ["Reference (1) (1) Footnote", "Filler",
+                                                                       "Filler"]
+    assert list(ShortLookbackAppend.process_stream(blocks)) == blocks
+    assert list(FootnoteDeletePreprocessor.process_stream(blocks)) == blocks[:3]
+    assert list(ShortLookbackDelete.process_stream(blocks)) == blocks
@@ -0,0 +1,89 @@
+from document_parsing.preprocessing.block_preprocessor import BlockPreprocessor
+from document_parsing.preprocessing.footnote_append_preprocessor import FootnoteAppendPreprocessor
+from document_parsing.preprocessing.header_preprocessor import HeaderPreprocessor
+from document_parsing.preprocessing.initial_space_preprocessor import InitialSpacePreprocessor
+from document_parsing.preprocessing.preprocessing_pipeline import MapStage, PreprocessingPipeline, BarrierStage
+
+BLOCKS = [
+    "4.5.2016 EN Official Journal of the European Union L 119/1",
+    "1.Text with a footnote (1)",
+    "(a)point",
+    "(1) The footnote.",
+    "2. More text",
+]
+
+
+class ReversingPreprocessor(BlockPreprocessor):
+    """
+    A preprocessor only implementing process.
+    """
+
+    @staticmethod
+    def process(blocks):
+        return list(reversed(blocks))
+
+
+def test_pipeline_matches_sequential_application():
+    preprocessors = [HeaderPreprocessor, InitialSpacePreprocessor, ReversingPreprocessor, FootnoteAppendPreprocessor]
+
+    expected = BLOCKS
+    for preprocessor in preprocessors:
+        expected = list(preprocessor.process(expected))
+
+    assert PreprocessingPipeline(preprocessors).process(BLOCKS) == expected
+    assert expected == ["2. More text", "(1) The footnote.", "(a)point", "1. Text with a footnote (1)"]
+
+
+def test_map_stages_are_fused():
+    stages = PreprocessingPipeline([HeaderPreprocessor, InitialSpacePreprocessor, ReversingPreprocessor,
+                                    HeaderPreprocessor]).stages()
+
+    assert [type(s) for s in stages] == [MapStage, BarrierStage, MapStage]
+    assert len(stages[0].functions) == 2
+
+
+def test_pipeline_is_lazy():
+    consumed = []
+
+    def blocks():
+        for block in BLOCKS:
+            consumed.append(block)
+            yield block
+
+    output = PreprocessingPipeline([HeaderPreprocessor, InitialSpacePreprocessor]).run(blocks())
+
+    assert next(output) == "1. Text with a footnote (1)"
+    assert consumed == BLOCKS[:2]
+
+
+class NumberingPreprocessor(BlockPreprocessor):
+    """
+    A preprocessor streaming through process_stream.
+    """
+
+    @staticmethod
+    def process(blocks):
+        return [f"{i} {block}" for i, block in enumerate(blocks)]
+
+    @classmethod
+    def process_stream(cls, blocks):
+        for i, block in enumerate(blocks):
+            yield f"{i} {block}"
+
+
+def test_streaming_pipeline_uses_process_stream():
+    preprocessors = [HeaderPreprocessor, NumberingPreprocessor, InitialSpacePreprocessor]
+    consumed = []
+
+    def blocks():
+        for block in BLOCKS:
+            consumed.append(block)
+            yield block
+
+    output = PreprocessingPipeline(preprocessors, streaming=True).run(blocks())
+
+    assert next(output) == "0 1.Text with a footnote (1)"
+    assert consumed == BLOCKS[:2]
+    assert list(output) == ["1 (a)point", "2 (1) The footnote.", "3 2. More text"]
+    assert PreprocessingPipeline(preprocessors).process(BLOCKS) == \
+           ["0 1.Text with a footnote (1)", "1 (a)point", "2 (1) The footnote.", "3 2. More text"]
@@ -0,0 +1,46 @@
+from document_parsing.block_classifier import CompiledBlockClassifier, SequentialBlockClassifier
+from document_parsing.document_tree_parser import DocumentTreeParser
+from document_parsing.node.article import Article
+from document_parsing.node.document import Document
+from document_parsing.node.node_traversal import same_structure
+from document_parsing.node.paragraph import Paragraph
+from document_parsing.node.point import Point
+from document_parsing.node.subparagraph import Subparagraph
+
+def test_compiled_classifier_agrees_with_sequential(gdpr_text):
+    node_patterns = DocumentTreeParser().node_patterns
+    sequential = SequentialBlockClassifier(node_patterns)
+    compiled = CompiledBlockClassifier(node_patterns)
+
+    blocks = DocumentTreeParser._blockize(gdpr_text) + ["", "­", "ſection 1", "- an indent", "(ii) a point",
+                                                            "CHAPTER IV", "Title III", "12.No space"]
+
+    for parent in [Document(), Article(number=1), Paragraph(number=1), Subparagraph(number=1), Point(number=1)]:
+        for block in blocks:
+            for start in range(len(node_patterns) + 1):
+                expected_index, expected_node = sequential.classify(block, parent, start)
+                actual_index, actual_node = compiled.classify(block, parent, start)
+
+                assert actual_index == expected_index, f"Differing node pattern for '{block[:30]}'"
+                if expected_node is not None:
+                    assert actual_node.__class__ == expected_node.__class__
+                    assert actual_node.number == expected_node.number
+                    assert actual_node.content == expected_node.content
+
+
+def test_parse_document_with_compiled_classifier(gdpr_text):
+    expected = DocumentTreeParser(block_classifier=SequentialBlockClassifier).parse_document("GDPR", gdpr_text)
+    actual = DocumentTreeParser(block_classifier=CompiledBlockClassifier).parse_document("GDPR", gdpr_text)
+
+    assert same_structure(actual, expected)
+
+
+def test_classifier_follows_node_pattern_changes():
+    parser = DocumentTreeParser()
+    parser.parse_document("Test", "Article 1\n\nTitle")
+
+    parser.node_patterns = [Article, Subparagraph]
+    document = parser.parse_document("Test", "Article 1\n\nTitle\n\n1. Not a paragraph")
+
+    assert len(document.children) == 1
+    assert document.children[0].content == "1. Not a paragraph"
@@ -1,12 +1,17 @@
+import io
+import os
+
 from document_parsing.document_tree_parser import DocumentTreeParser
 from document_parsing.node.article import Article
 from document_parsing.node.chapter import Chapter
 from document_parsing.node.document import Document
 from document_parsing.node.indent import Indent
+from document_parsing.node.node_traversal import same_structure
 from document_parsing.node.paragraph import Paragraph
 from document_parsing.node.point import Point
 from document_parsing.node.section import Section
 from document_parsing.node.subparagraph import Subparagraph
+from document_parsing.preprocessing.footnote_append_preprocessor import FootnoteAppendPreprocessor
 
 
 def test_parse_regulation():
@@ -178,3 +183,56 @@ or organisational measures (‘integrity and confidentiality’).
 
         actual_stack.extend(a.children)
         expected_stack.extend(e.children)
+
+
+def test_blockize_stream_matches_blockize():
+    text = "\n\nArticle 1\n\n\n1.Text\nover lines\n\n\n\n(a) point­\n \n\nend\n"
+
+    for chunk_size in range(1, len(text) + 1):
+        assert list(DocumentTreeParser._blockize_stream(io.StringIO(text), chunk_size)) == \
+               DocumentTreeParser._blockize(text), f"Chunk size {chunk_size}"
+
+
+def test_parse_stream_matches_parse_document(gdpr_root, eu_documents):
+    parser = DocumentTreeParser()
+    expected = gdpr_root.children[0]
+
+    for chunk_size in (13, 4096):
+        with open(os.path.join(eu_documents, "gdpr.txt"), encoding="utf-8") as f:
+            actual = parser.parse_stream("GDPR", f, chunk_size)
+        assert same_structure(actual, expected)
+
+
+def test_parse_stream_matches_parse_document_on_bundled_documents(eu_documents):
+    parser = DocumentTreeParser()
+
+    for file_name in sorted(os.listdir(eu_documents)):
+        if not file_name.endswith(".txt"):
+            continue
+        with open(os.path.join(eu_documents, file_name), encoding="utf-8") as f:
+            expected = parser.parse_document(file_name, f.read())
+        with open(os.path.join(eu_documents, file_name), encoding="utf-8") as f:
+            actual = parser.parse_stream(file_name, f)
+        assert same_structure(actual, expected), file_name
+
+
+def test_parse_stream_warns_about_distant_footnotes(caplog, monkeypatch):
+    monkeypatch.setattr(FootnoteAppendPreprocessor, "stream_lookback", 2)
+    text = "\n\n".join(["Intro", "See the note (1).", "Filler.", "More filler.", "Even more.", "(1) The note."])
+
+    document = DocumentTreeParser().parse_stream("Doc", io.StringIO(text))
+
+    assert "The note." not in document.content
+    assert "Footnote (1)" in caplog.text
+
+
+def test_raw_blocks_are_joined_into_content():
+    raw = [f"Raw block {i}." for i in range(100)]
+    text = "\n\n".join(["Intro", "Article 1", "Subject"] + raw)
+
+    document = DocumentTreeParser().parse_document("Doc", text)
+
+    assert document.content == "\n\nIntro"
+    article = document.children[0]
+    assert article.title == "Subject"
+    assert article.content == "\n".join(raw)
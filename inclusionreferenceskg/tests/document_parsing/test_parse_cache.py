@@ -0,0 +1,61 @@
+import os
+
+from document_parsing.document_tree_parser import DocumentTreeParser
+from document_parsing.node.article import Article
+from document_parsing.node.node_traversal import pre_order, same_structure
+from document_parsing.node.paragraph import Paragraph
+from document_parsing.parse_cache import ParseCache
+
+def test_cached_document_equals_parsed_document(tmp_path, gdpr_text):
+    text = gdpr_text
+    cache = ParseCache(directory=str(tmp_path))
+    parser = DocumentTreeParser(cache=cache)
+
+    parsed = parser.parse_document("GDPR", text)
+    loaded = parser.parse_document("Regulation (EU) 2016/679", text)
+
+    assert (cache.stats.hits, cache.stats.misses, cache.stats.writes) == (1, 1, 1)
+    assert loaded.title == "Regulation (EU) 2016/679"
+    # Without a title, the stored one is kept.
+    assert cache.get(parser.cache_key(text)).title == "GDPR"
+    loaded.title = parsed.title
+    assert same_structure(loaded, parsed)
+
+    for node in pre_order(loaded):
+        for child in node.children:
+            assert child.parent is node
+    assert not {n.id for n in pre_order(loaded)} & {n.id for n in pre_order(parsed)}
+
+
+def test_cache_key_depends_on_configuration():
+    text = "Article 1\n\n1. Text"
+
+    assert DocumentTreeParser().cache_key(text) == DocumentTreeParser().cache_key(text)
+    assert DocumentTreeParser().cache_key(text) != DocumentTreeParser().cache_key(text + " ")
+    assert DocumentTreeParser().cache_key(text) != \
+           DocumentTreeParser(node_patterns=[Article, Paragraph]).cache_key(text)
+    assert DocumentTreeParser().cache_key(text) != DocumentTreeParser(preprocessors=[]).cache_key(text)
+
+
+def test_invalidation_and_eviction(tmp_path):
+    cache = ParseCache(directory=str(tmp_path))
+    parser = DocumentTreeParser(cache=cache)
+    texts = [f"Article {i}\n\n1. Some text of article {i}." for i in range(1, 4)]
+
+    for text in texts:
+        parser.parse_document("Test", text)
+    assert cache.invalidate(parser.cache_key(texts[0]))
+    assert not cache.invalidate(parser.cache_key(texts[0]))
+
+    cache.clear()
+    assert cache.size() == 0
+
+    parser.parse_document("Test", texts[0])
+    # Make the first entry the least recently used one regardless of the file system's time resolution.
+    os.utime(os.path.join(str(tmp_path), parser.cache_key(texts[0]) + ParseCache.suffix), (0, 0))
+    cache.max_bytes = cache.size() * 3 // 2
+    parser.parse_document("Test", texts[1])
+
+    assert cache.stats.evictions == 1
+    assert cache.get(parser.cache_key(texts[0])) is None
+    assert cache.get(parser.cache_key(texts[1])) is not None
@@ -0,0 +1,100 @@
+from document_parsing.document_tree_parser import DocumentTreeParser
+from document_parsing.node.article import Article
+from document_parsing.node.node_traversal import pre_order, same_structure
+from document_parsing.node.paragraph import Paragraph
+from document_parsing.node.point import Point
+from document_parsing.node.subparagraph import Subparagraph
+
+def _article(document, number):
+    return next(n for n in pre_order(document) if isinstance(n, Article) and n.number == number)
+
+
+def test_reparse_amended_point(gdpr_text):
+    text = gdpr_text
+    amended = text.replace("processed lawfully, fairly and in a transparent manner", "processed lawfully and fairly")
+    parser = DocumentTreeParser(keep_trace=True)
+
+    document = parser.parse_document("GDPR", text)
+    ids = {id(n): n.id for n in pre_order(document)}
+    article_6 = _article(document, 6)
+    point = _article(document, 5).children[0].children[0].children[0]
+    assert isinstance(point, Point) and point.number == 1
+
+    result = parser.reparse(document, amended)
+
+    assert result.document is document
+    expected = DocumentTreeParser().parse_document("GDPR", amended)
+    assert same_structure(document, expected)
+
+    # Only the amended block was classified again.
+    assert result.classified_blocks == 1
+    assert result.replayed_blocks == len(document.parse_trace.blocks) - 1
+    assert len(result.changed) == 1 and isinstance(result.changed[0], Point)
+    assert result.changed[0].content.startswith("(a)  processed lawfully and fairly in relation")
+    assert result.removed == [point]
+
+    # Unchanged nodes keep their identity.
+    assert _article(document, 6) is article_6
+    for node in pre_order(document):
+        if node is not result.changed[0]:
+            assert ids[id(node)] == node.id
+        for child in node.children:
+            assert child.parent is node
+
+
+def test_reparse_inserted_paragraph_renumbers_subparagraphs():
+    text = "Article 1\n\nSubject\n\n1. First paragraph.\n\nSecond subparagraph.\n\n2. Second paragraph."
+    amended = "Article 1\n\nSubject\n\n1. First paragraph.\n\nInserted subparagraph.\n\nSecond subparagraph.\n\n" \
+              "2. Second paragraph."
+    parser = DocumentTreeParser(keep_trace=True)
+
+    document = parser.parse_document("Doc", text)
+    paragraph_1, paragraph_2 = document.children[0].children
+    second = paragraph_1.children[1]
+    assert isinstance(second, Subparagraph) and second.number == 2
+
+    result = parser.reparse(document, amended)
+
+    assert same_structure(document, DocumentTreeParser().parse_document("Doc", amended))
+    assert document.children[0].children == [paragraph_1, paragraph_2]
+    assert paragraph_1.children[2] is second and second.number == 3
+    assert result.changed == paragraph_1.children[1:]
+    assert result.removed == []
+
+
+def test_reparse_removed_article():
+    text = "Article 1\n\nFirst\n\nContent.\n\nArticle 2\n\nSecond\n\n1. Paragraph.\n\nArticle 3\n\nThird"
+    amended = "Article 1\n\nFirst\n\nContent.\n\nArticle 3\n\nThird"
+    parser = DocumentTreeParser(keep_trace=True)
+
+    document = parser.parse_document("Doc", text)
+    article_1, article_2, article_3 = document.children
+
+    result = parser.reparse(document, amended)
+
+    assert document.children == [article_1, article_3]
+    # Removing a child is no change of the document itself.
+    assert result.changed == []
+    assert result.removed == [article_2]
+
+
+def test_reparse_without_trace_parses_again():
+    text = "Article 1\n\nSubject\n\n1. Paragraph."
+    amended = text + "\n\n2. Another paragraph."
+    parser = DocumentTreeParser()
+
+    document = parser.parse_document("Doc", text)
+    assert document.parse_trace is None
+    article = document.children[0]
+
+    result = parser.reparse(document, amended)
+
+    assert result.document is document
+    assert result.replayed_blocks == 0
+    assert same_structure(document, DocumentTreeParser().parse_document("Doc", amended))
+    assert document.children[0] is not article
+    assert result.changed == document.children
+    assert result.removed == [article]
+    assert isinstance(document.children[0].children[1], Paragraph)
+    # Subsequent updates can be incremental.
+    assert document.parse_trace is not None
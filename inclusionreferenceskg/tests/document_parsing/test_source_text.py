@@ -0,0 +1,32 @@
+import os
+import pickle
+
+from document_parsing.document_tree_parser import DocumentTreeParser
+from document_parsing.node.article import Article
+from document_parsing.node.node_traversal import pre_order, same_structure
+from document_parsing.node.paragraph import Paragraph
+from document_parsing.source_text import SourceText
+
+def test_stored_content_equals_parsed_content(tmp_path, gdpr_text, gdpr_root):
+    parsed = gdpr_root.children[0]
+    stored = DocumentTreeParser().parse_document("GDPR", gdpr_text)
+
+    source = SourceText.store(stored, str(tmp_path / "gdpr.bin"))
+
+    assert os.path.getsize(tmp_path / "gdpr.bin") == len(source) > 0
+    assert all("content" not in n.__dict__ for n in pre_order(stored) if n.content)
+    assert same_structure(stored, parsed)
+    assert [n.content for n in pre_order(stored)] == [n.content for n in pre_order(parsed)]
+
+
+def test_setting_content_replaces_the_span():
+    document = DocumentTreeParser(store_content=True).parse_document("GDPR", "Article 1\n\nSubject\n\n1. First.")
+    subparagraph = document.resolve_first([Article(number=1), Paragraph(number=1)]).children[0]
+    assert subparagraph.content == "1. First."
+
+    subparagraph.content = "1. Amended."
+    assert subparagraph.content == "1. Amended."
+
+    copy = pickle.loads(pickle.dumps(document))
+    assert same_structure(copy, document)
+    assert [n.content for n in pre_order(copy)] == [n.content for n in pre_order(document)]
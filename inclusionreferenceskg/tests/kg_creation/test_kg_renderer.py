@@ -1,6 +1,7 @@
 import spacy.util
 from spacy.tokens import Token, Doc
 
+from document_parsing.node import node_traversal
 from document_parsing.node.document import Document
 from document_parsing.node.root import Root
 from kg_creation.kg_renderer import KGRenderer
@@ -158,3 +159,16 @@ def test_kg_renderer_recursion():
     assert set(graph.nodes[predicates[0].id].adj.keys()) == {predicates[1].id}
     assert set(graph.nodes[predicates[1].id].adj.keys()) == {predicates[2].id}
     assert set(graph.nodes[predicates[2].id].adj.keys()) == {predicates[0].id}
+
+
+def test_kg_renderer_walks_the_tree_once(monkeypatch):
+    walks = []
+    walk = node_traversal._pre_order
+    monkeypatch.setattr(node_traversal, "_pre_order", lambda root: walks.append(root) or walk(root))
+
+    root = Root()
+    root.add_child(Document(title="GDPR"))
+    graph = KGRenderer().render(root=root, phrases=[])
+
+    assert walks == [root]
+    assert set(graph.nodes.keys()) == {root.id, root.children[0].id}
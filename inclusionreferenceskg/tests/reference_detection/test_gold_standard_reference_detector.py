@@ -0,0 +1,55 @@
+import os
+
+import pytest
+
+from document_parsing.document_tree_parser import DocumentTreeParser
+from document_parsing.node.node_traversal import pre_order
+from document_parsing.preprocessing.footnote_delete_preprocessor import FootnoteDeletePreprocessor
+from document_parsing.preprocessing.header_preprocessor import HeaderPreprocessor
+from reference_detection.gold_standard_reference_detector import GoldStandardReferenceDetector
+
+GDPR_REFERENCES_FILE = os.path.join(os.path.dirname(__file__), "..", "..", "resources", "evaluation_data",
+                                    "gdpr_references.csv")
+
+
+def _key(references):
+    return [(r.start, r.text_content) for r in references]
+
+
+def test_detect_positioned(gdpr_text):
+    # Parsed as in evaluate_reference_detector.
+    parser = DocumentTreeParser(preprocessors=[HeaderPreprocessor, FootnoteDeletePreprocessor])
+    nodes = list(pre_order(parser.parse_document("GDPR", gdpr_text)))
+    raw_text = "\n".join(node.content for node in nodes)
+    detector = GoldStandardReferenceDetector(GDPR_REFERENCES_FILE)
+
+    expected = _key(GoldStandardReferenceDetector(GDPR_REFERENCES_FILE).detect(raw_text))
+
+    assert len(expected) == len(detector.expected_references)
+    assert _key(detector.detect(raw_text, 0)) == expected
+    # Reusable
+    assert _key(detector.detect(raw_text, 0)) == expected
+
+    offsets = []
+    offset = 0
+    for node in nodes:
+        offsets.append(offset)
+        offset += len(node.content) + 1
+
+    per_node = []
+    for node, offset in reversed(list(zip(nodes, offsets))):
+        per_node.extend((offset + r.start, r.text_content) for r in detector.detect(node.content, offset))
+    assert sorted(per_node) == expected
+
+    start, end = expected[10][0], expected[20][0]
+    assert _key(detector.detect(raw_text[start:end], start)) == [(s - start, t) for s, t in expected[10:20]]
+
+
+def test_detect_positioned_without_offsets(tmp_path):
+    file = tmp_path / "references.csv"
+    file.write_text("Reference\nArticle 1\n", encoding="utf-8")
+    detector = GoldStandardReferenceDetector(str(file))
+
+    assert _key(detector.detect("See Article 1.")) == [(4, "Article 1")]
+    with pytest.raises(ValueError):
+        detector.detect("See Article 1.", 0)
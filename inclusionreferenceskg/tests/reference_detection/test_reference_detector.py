@@ -0,0 +1,77 @@
+import pytest
+import spacy
+from spacy.tokens import Token
+
+from reference_detection.reference_detector import align_references, split_blocks
+from reference_detection.regex_reference_detector import RegexReferenceDetector
+from util.reference import Reference
+
+def test_split_blocks():
+    text = "See Article 1.\n\nthe Treaty on the\n\nFunctioning of the European Union;\n\nArticle 2"
+
+    chunks = split_blocks(text, 0)
+
+    assert "".join(chunk for _, chunk in chunks) == text
+    assert [chunk for _, chunk in chunks] == ["See Article 1.\n\n",
+                                              "the Treaty on the\n\nFunctioning of the European Union;\n\n",
+                                              "Article 2"]
+    assert all(text[offset:offset + len(chunk)] == chunk for offset, chunk in chunks)
+    assert len(split_blocks(text, len(text))) == 1
+    assert split_blocks("", 10) == [(0, "")]
+
+
+def test_detect_parallel(gdpr_text):
+    text = gdpr_text
+    detector = RegexReferenceDetector()
+
+    expected = [(r.start, r.text_content) for r in detector.detect(text)]
+
+    assert [(r.start, r.text_content) for r in detector.detect_parallel(text, workers=2, chunk_size=20000)] == expected
+    assert [(r.start, r.text_content) for r in detector.detect_parallel(text, workers=1, chunk_size=1)] == expected
+
+
+def test_detect_corpus():
+    detector = RegexReferenceDetector()
+    texts = ["Article 1 of this Regulation", "no reference", "points (a) and (b)"]
+
+    detected = detector.detect_corpus(texts, workers=2)
+
+    assert [[r.text_content for r in references] for references in detected] == \
+           [["Article 1 of this Regulation"], [], ["points (a) and (b)"]]
+
+
+def test_align_references():
+    nlp = spacy.blank("en")
+    doc = nlp("See Article 5(1) and xArticle 6 of this Regulation.")
+    references = [Reference(start=4, text_content="Article 5(1)"),
+                  Reference(start=22, text_content="Article 6 of this Regulation"),
+                  Reference(start=35, text_content="this")]
+
+    aligned, stats = align_references(doc, references)
+
+    assert [(r.text_content, doc[start:end].text) for r, start, end in aligned] == \
+           [("Article 5(1)", "Article 5(1)"), ("this", "this")]
+    assert (stats.aligned, stats.expanded, stats.failed) == (2, 0, 1)
+
+    aligned, stats = align_references(doc, references, "expand")
+
+    assert [(r.text_content, doc[start:end].text) for r, start, end in aligned] == \
+           [("Article 5(1)", "Article 5(1)"), ("Article 6 of this Regulation", "xArticle 6 of this Regulation")]
+    # "this" shares a token with the expanded reference before it.
+    assert (stats.aligned, stats.expanded, stats.failed) == (2, 1, 1)
+
+    with pytest.raises(ValueError):
+        align_references(doc, references, "contract")
+
+
+def test_spacy_pipe_component_alignment_stats():
+    if not Token.has_extension("reference"):
+        Token.set_extension("reference", default=None)
+    nlp = spacy.blank("en")
+    nlp.add_pipe(RegexReferenceDetector.SPACY_COMPONENT_NAME, config={"alignment_mode": "expand"})
+
+    doc = nlp("See xArticle 6 of this Regulation.")
+
+    assert [t.text for t in doc if t._.reference] == ["xArticle 6 of this Regulation"]
+    stats = nlp.get_pipe(RegexReferenceDetector.SPACY_COMPONENT_NAME).alignment_stats
+    assert (stats.aligned, stats.expanded, stats.failed) == (1, 1, 0)
@@ -0,0 +1,16 @@
+from reference_detection.regex_reference_detector import RegexReferenceDetector
+from reference_detection.scanning_reference_detector import ScanningReferenceDetector
+
+
+def test_detect(detect_cases):
+    matcher = ScanningReferenceDetector()
+
+    for text, result in detect_cases:
+        assert [x.text_content for x in matcher.detect(text)] == result
+
+
+def test_same_as_regex(token_soup):
+    regex, scanning = RegexReferenceDetector(), ScanningReferenceDetector()
+    for text in token_soup:
+        assert [(r.start, r.text_content) for r in scanning.detect(text)] == \
+               [(r.start, r.text_content) for r in regex.detect(text)], text
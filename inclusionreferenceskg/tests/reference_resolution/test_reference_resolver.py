@@ -4,6 +4,7 @@ from document_parsing.node.document import Document
 from document_parsing.node.paragraph import Paragraph
 from document_parsing.node.point import Point
 from document_parsing.node.title import Title
+from document_parsing.node.tree_intervals import TreeIntervals
 from util.reference import Reference
 from reference_resolution.reference_resolver import ReferenceResolver
 
@@ -88,3 +89,18 @@ def test_multiple_treaties():
 
     actual_references = resolver.resolve_single(Article(number=1), test_references)
     _references_eq_qualifiers(actual_references, expected_qualifiers)
+
+
+def test_node_appended_after_labelling():
+    document = Document(title="GDPR")
+    article = Article(number=1)
+    document.add_child(article)
+    intervals = TreeIntervals.containing(article)
+
+    paragraph = Paragraph(number=1, parent=article)
+    article.children.append(paragraph)
+
+    resolver = ReferenceResolver()
+
+    actual_references = resolver.resolve_single(paragraph, [Reference(0, "Article 2")], intervals)
+    _references_eq_qualifiers(actual_references, [[Document(title="GDPR"), Article(number=2)]])
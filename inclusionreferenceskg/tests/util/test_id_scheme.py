@@ -0,0 +1,80 @@
+import spacy
+from spacy.tokens import Doc
+
+from document_parsing.document_tree_parser import DocumentTreeParser
+from document_parsing.node.node_traversal import pre_order
+from document_parsing.node.root import Root
+from util.id_scheme import CounterIdScheme, PathIdScheme, assign_node_ids
+
+TEXT = """CHAPTER I
+
+General provisions
+
+Article 1
+
+Subject-matter
+
+1. Text of the first paragraph:
+
+(a) the first point;
+
+(b) the second point.
+
+2. Text of the second paragraph.
+
+Article 2
+
+Scope
+
+Text of the second article."""
+
+
+def _root():
+    document = DocumentTreeParser().parse_document("Regulation (EU) 2016/679", TEXT)
+    root = Root(children=[document])
+    document.parent = root
+    return root
+
+
+def test_path_ids():
+    root = _root()
+    assign_node_ids(root, PathIdScheme())
+
+    assert [node.id for node in pre_order(root)] == [
+        "Root",
+        "Regulation (EU) 2016_679",
+        "Regulation (EU) 2016_679/Chap1",
+        "Regulation (EU) 2016_679/Art1",
+        "Regulation (EU) 2016_679/Art1/Par1",
+        "Regulation (EU) 2016_679/Art1/Par1/Sub1",
+        "Regulation (EU) 2016_679/Art1/Par1/Sub1/Pt1",
+        "Regulation (EU) 2016_679/Art1/Par1/Sub1/Pt2",
+        "Regulation (EU) 2016_679/Art1/Par2",
+        "Regulation (EU) 2016_679/Art1/Par2/Sub1",
+        "Regulation (EU) 2016_679/Art2",
+    ]
+
+    # Ids are the same for every parse.
+    other = _root()
+    assign_node_ids(other, PathIdScheme())
+    assert [node.id for node in pre_order(other)] == [node.id for node in pre_order(root)]
+
+
+def test_path_item_ids_are_unique():
+    doc = Doc(vocab=spacy.util.get_lang_class("en")().vocab, words=["a", "b"])
+    scheme = PathIdScheme()
+
+    assert [scheme.item_id(doc[1], "obj"), scheme.item_id(doc[1], "obj"), scheme.item_id(doc[1], "pred")] == \
+           ["doc#obj1", "doc#obj1~2", "doc#pred1"]
+
+
+def test_counter_ids():
+    root = _root()
+    scheme = CounterIdScheme()
+    assign_node_ids(root, scheme)
+
+    ids = [node.id for node in pre_order(root)]
+    assert ids == list(range(len(ids)))
+
+    doc = Doc(vocab=spacy.util.get_lang_class("en")().vocab, words=["a"])
+    assert scheme.item_id(doc[0], "obj") == len(ids)
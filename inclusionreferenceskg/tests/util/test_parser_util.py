@@ -0,0 +1,50 @@
+from document_parsing.document_tree_parser import DocumentTreeParser
+from document_parsing.node.node_traversal import pre_order, same_structure
+from document_parsing.node.root import Root
+from document_parsing.parse_cache import ParseCache
+from util.parser_util import load_corpus
+
+MANIFEST = [
+    ("GDPR", "gdpr.txt"),
+    ("Directive 95/46/EC", "directive_95_46_ec.txt"),
+    ("Regulation (EC) No 45/2001", "regulation_ec_45_2001.txt"),
+]
+
+
+def test_load_corpus_in_pool_matches_serial(eu_documents):
+    parser = DocumentTreeParser()
+    serial = load_corpus(MANIFEST, parser, workers=1, directory=eu_documents)
+    pooled = load_corpus(MANIFEST, parser, workers=2, directory=eu_documents)
+
+    assert isinstance(pooled, Root)
+    assert [doc.title for doc in pooled.children] == [title for title, _ in MANIFEST]
+    assert same_structure(pooled, serial)
+
+    for node in pre_order(pooled):
+        for child in node.children:
+            assert child.parent is node
+
+
+def test_load_corpus_uses_cache(tmp_path, eu_documents):
+    cache = ParseCache(directory=str(tmp_path))
+    parser = DocumentTreeParser(cache=cache)
+
+    first = load_corpus(MANIFEST, parser, workers=1, directory=eu_documents)
+    second = load_corpus(MANIFEST, parser, workers=2, directory=eu_documents)
+
+    assert cache.stats.writes == len(MANIFEST)
+    assert cache.stats.hits == len(MANIFEST)
+    assert same_structure(first, second)
+
+
+def test_load_corpus_with_given_cache(tmp_path, eu_documents):
+    cache = ParseCache(directory=str(tmp_path))
+    parser = DocumentTreeParser()
+
+    first = load_corpus(MANIFEST, parser, workers=1, directory=eu_documents, cache=cache)
+    second = load_corpus(MANIFEST, workers=1, directory=eu_documents, cache=cache)
+
+    assert parser.cache is None
+    assert cache.stats.writes == len(MANIFEST)
+    assert cache.stats.hits == len(MANIFEST)
+    assert same_structure(first, second)
@@ -0,0 +1,32 @@
+import spacy
+from spacy.tokens import Doc, Token
+
+from document_parsing.node.article import Article
+from document_parsing.node.document import Document
+from util.reference import Reference
+from util.spacy_components import reference_qualifier_resolver_component
+
+
+def _resolve(nlp, root, qualifier):
+    doc = nlp("Article 2")
+    doc._.reference_base = root
+    doc[0]._.reference = Reference(start=0, text_content="Article 2", reference_qualifier=[qualifier])
+    return reference_qualifier_resolver_component(doc)[0]._.reference.targets
+
+
+def test_resolver_component_sees_direct_changes():
+    if not Doc.get_extension("reference_base"):
+        Doc.set_extension("reference_base", default=None)
+    if Token.get_extension("reference") is None:
+        Token.set_extension("reference", default=None)
+
+    nlp = spacy.blank("en")
+    root = Document(title="GDPR")
+    root.add_child(Article(number=1))
+
+    assert _resolve(nlp, root, [Article(number=2)]) == []
+
+    article = Article(number=2, parent=root)
+    # Changed directly, without Node.add_child or Node.touch.
+    root.children.append(article)
+    assert _resolve(nlp, root, [Article(number=2)]) == [article]